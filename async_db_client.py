@@ -0,0 +1,116 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from .db_client import DatabaseClient
+
+class AsyncDatabaseClient:
+    """
+    An asyncio counterpart of DatabaseClient.
+
+    The blocking drivers run on a bounded thread pool, so coroutines awaiting the database never stall the event loop.
+    SQL connections are pooled, and the executor is sized to the pool, so any number of concurrent coroutines share a
+    handful of connections: excess calls wait in the executor queue instead of opening new connections.
+
+    Open streams (AsyncDatabaseOperations.find_iter()) hold a pooled connection between batches, so their batches are
+    fetched on a separate stream_executor, and at most max_size SQL streams are open at a time. Calls waiting on the
+    executor for a connection therefore never keep the streams holding the connections from finishing.
+
+    Attributes:
+        sync_client (DatabaseClient): The blocking client that owns the connections and pools.
+        executor (ThreadPoolExecutor): Thread pool on which every blocking database call runs.
+        stream_executor (ThreadPoolExecutor): Thread pool on which the batches of open streams are fetched.
+    """
+    def __init__(self, mongo_uri, mysql_config, postgres_config, pool_config=None, max_workers=None, circuit_breaker=None,
+                 **options):
+        """
+        Initializes the AsyncDatabaseClient with connection parameters for MongoDB, MySQL, and PostgreSQL.
+
+        Args:
+            mongo_uri (str): MongoDB URI string used to connect to the database.
+            mysql_config (dict): Configuration settings (host, user, password, database) for MySQL.
+            postgres_config (dict): Configuration settings (host, user, password, dbname) for PostgreSQL.
+            pool_config (dict, optional): Keyword arguments for ConnectionPool. Pooled mode is always used.
+            max_workers (int, optional): Number of executor threads. Defaults to the pool max_size.
+            circuit_breaker (dict, optional): Keyword arguments for the per-database CircuitBreaker, see DatabaseClient.
+            **options: Further DatabaseClient options, such as mysql_replicas or mongo_read_preference.
+        """
+        pool_config = dict(pool_config or {})
+        pool_config.setdefault('max_size', 10)
+        self.sync_client = DatabaseClient(mongo_uri, mysql_config, postgres_config, pool_config=pool_config,
+                                          circuit_breaker=circuit_breaker, **options)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or pool_config['max_size'],
+                                           thread_name_prefix='AsyncDatabaseClient')
+        self.stream_executor = ThreadPoolExecutor(max_workers=pool_config['max_size'],
+                                                  thread_name_prefix='AsyncDatabaseClient-stream')
+        self.max_streams = pool_config['max_size']
+        self._stream_slots = None
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs a blocking callable on the client's executor and awaits its result.
+
+        Args:
+            func (callable): The blocking function to run.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            The value returned by func.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def run_stream(self, func, *args):
+        """
+        Runs a step of an open stream, such as fetching its next batch, on the stream executor.
+
+        Args:
+            func (callable): The blocking function to run.
+            *args: Positional arguments for func.
+
+        Returns:
+            The value returned by func.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.stream_executor, partial(func, *args))
+
+    def stream_slots(self):
+        """
+        Returns the semaphore bounding the number of open SQL streams to the pool size.
+
+        Returns:
+            asyncio.Semaphore: Acquired for as long as a stream holds its connection.
+        """
+        # Created on first use, so it belongs to the running event loop.
+        if self._stream_slots is None:
+            self._stream_slots = asyncio.Semaphore(self.max_streams)
+        return self._stream_slots
+
+    async def connect(self):
+        """
+        Connects to all databases without blocking the event loop.
+
+        Raises:
+            DatabaseConnectionError: If any connection fails.
+        """
+        await self.run(self.sync_client.connect)
+
+    async def get_database(self, db_name=None):
+        """
+        Retrieves the currently open databases and connection pools, see DatabaseClient.get_database().
+
+        Args:
+            db_name (str, optional): Specific database name for MongoDB.
+
+        Returns:
+            dict: The open databases keyed by database type ('mongo', 'mysql', 'postgres').
+        """
+        return await self.run(self.sync_client.get_database, db_name)
+
+    async def close(self):
+        """
+        Closes all connections and shuts the executor down once pending calls have finished.
+        """
+        await self.run(self.sync_client.close)
+        self.executor.shutdown(wait=False)
+        self.stream_executor.shutdown(wait=False)
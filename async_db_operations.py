@@ -0,0 +1,125 @@
+from itertools import islice
+from .db_operations import DatabaseOperations
+
+class AsyncDatabaseOperations:
+    """
+    An asyncio counterpart of DatabaseOperations with the same insert, find, update and delete surface.
+
+    Each operation is executed by a DatabaseOperations instance on the AsyncDatabaseClient executor, so the
+    event loop keeps running while the drivers wait on the network.
+
+    Attributes:
+        db_client (AsyncDatabaseClient): The async client whose executor and connections are used.
+        operations (DatabaseOperations): The blocking operations run on the executor.
+    """
+
+    def __init__(self, db_client, statement_cache_size=256, prepared_statements=False, result_cache=None, metrics=None,
+                 retry_policy=None, schema_cache=None):
+        """
+        Initializes the AsyncDatabaseOperations with an AsyncDatabaseClient.
+
+        Args:
+            db_client (AsyncDatabaseClient): The async database client used to execute operations.
+            statement_cache_size (int): Maximum number of generated SQL statements kept, see DatabaseOperations.
+            prepared_statements (bool): Run cached statements as prepared statements, see DatabaseOperations.
+            result_cache (ResultCache, optional): Cache find() results, see DatabaseOperations.
+            metrics (Metrics, optional): Metrics recorder. Defaults to the metrics of the client, if any.
+            retry_policy (RetryPolicy, optional): Retries idempotent operations, see DatabaseOperations.
+            schema_cache (SchemaCache, optional): Validates and quotes SQL names, see DatabaseOperations.
+        """
+        self.db_client = db_client
+        self.operations = DatabaseOperations(db_client.sync_client, statement_cache_size, prepared_statements,
+                                             result_cache, metrics, retry_policy, schema_cache)
+
+    async def insert(self, db_type, data, collection_table):
+        """
+        Inserts data into the specified database type and collection or table, see DatabaseOperations.insert().
+        """
+        return await self.db_client.run(self.operations.insert, db_type, data, collection_table)
+
+    async def insert_many(self, db_type, rows, collection_table, batch_size=1000):
+        """
+        Inserts many documents or rows in batches, see DatabaseOperations.insert_many().
+        """
+        return await self.db_client.run(self.operations.insert_many, db_type, rows, collection_table, batch_size)
+
+    async def find(self, db_type, query, collection_table):
+        """
+        Finds a document or a row matching the query, see DatabaseOperations.find().
+        """
+        return await self.db_client.run(self.operations.find, db_type, query, collection_table)
+
+    async def find_many(self, db_type, query, collection_table):
+        """
+        Finds every document or row matching the query, see DatabaseOperations.find_many().
+        """
+        return await self.db_client.run(self.operations.find_many, db_type, query, collection_table)
+
+    async def find_iter(self, db_type, query, collection_table, batch_size=1000, projection=None):
+        """
+        Asynchronously yields every document or row matching the query, see DatabaseOperations.find_iter().
+
+        Each batch is fetched on the stream executor, so at most one batch is held in memory and the loop is never
+        blocked. SQL streams wait for a free stream slot before they start, see AsyncDatabaseClient. Callers that stop
+        early should call aclose() on the generator to release the cursor, connection and slot.
+        """
+        slots = None if db_type == 'mongo' else self.db_client.stream_slots()
+        if slots is not None:
+            await slots.acquire()
+        try:
+            rows = self.operations.find_iter(db_type, query, collection_table, batch_size, projection)
+            try:
+                while True:
+                    batch = await self.db_client.run_stream(list, islice(rows, batch_size))
+                    if not batch:
+                        break
+                    for row in batch:
+                        yield row
+            finally:
+                await self.db_client.run_stream(rows.close)
+        finally:
+            if slots is not None:
+                slots.release()
+
+    async def find_columnar(self, db_type, query, collection_table, batch_size=1000, projection=None, format='numpy'):
+        """
+        Reads every document or row matching the query into columnar form, see DatabaseOperations.find_columnar().
+        """
+        return await self.db_client.run(self.operations.find_columnar, db_type, query, collection_table,
+                                        batch_size, projection, format)
+
+    async def update(self, db_type, query, new_values, collection_table):
+        """
+        Updates a document or a row matching the query, see DatabaseOperations.update().
+        """
+        return await self.db_client.run(self.operations.update, db_type, query, new_values, collection_table)
+
+    async def delete(self, db_type, query, collection_table):
+        """
+        Deletes a document or a row matching the query, see DatabaseOperations.delete().
+        """
+        return await self.db_client.run(self.operations.delete, db_type, query, collection_table)
+
+    async def update_many(self, db_type, query, new_values, collection_table):
+        """
+        Updates every document or row matching the query, see DatabaseOperations.update_many().
+        """
+        return await self.db_client.run(self.operations.update_many, db_type, query, new_values, collection_table)
+
+    async def delete_many(self, db_type, query, collection_table):
+        """
+        Deletes every document or row matching the query, see DatabaseOperations.delete_many().
+        """
+        return await self.db_client.run(self.operations.delete_many, db_type, query, collection_table)
+
+    async def upsert(self, db_type, query, new_values, collection_table):
+        """
+        Updates the document or row matching the query or inserts it, see DatabaseOperations.upsert().
+        """
+        return await self.db_client.run(self.operations.upsert, db_type, query, new_values, collection_table)
+
+    async def bulk_write(self, db_type, operations, collection_table):
+        """
+        Applies a mixed list of writes as a single batch, see DatabaseOperations.bulk_write().
+        """
+        return await self.db_client.run(self.operations.bulk_write, db_type, operations, collection_table)
@@ -0,0 +1,90 @@
+"""
+Compares the memory use and time of reading a large result as Python rows and in columnar form.
+
+The table lives in an in-memory SQLite database behind the MySQL code path, so no server is needed. Each path is timed
+in a plain run, then run again under tracemalloc for its peak memory. PyArrow buffers bypass Python's allocator, so the
+size of the result itself is reported separately as result_bytes (the array and table sizes for NumPy and Arrow).
+
+Run with: python -m src.benchmarks.columnar --rows 200000
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from ..db_operations import DatabaseOperations
+from .fakes import SqliteClient
+
+def _load(ops, rows, batch_size):
+    with ops.db_client.connection('mysql') as connection:
+        cursor = connection.cursor()
+        cursor.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, sensor INTEGER, value REAL, label TEXT)")
+        connection.commit()
+    data = ({'id': i, 'sensor': i % 100, 'value': i * 0.5, 'label': f'sensor-{i % 100}'} for i in range(rows))
+    ops.insert_many('mysql', data, 'readings', batch_size)
+
+def _result_bytes(result):
+    if isinstance(result, list):
+        # The list, each row tuple and each value object.
+        return sys.getsizeof(result) + sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in result)
+    if isinstance(result, dict):
+        return sum(column.nbytes for column in result.values())
+    return result.nbytes
+
+def _measure(read):
+    started = time.perf_counter()
+    result = read()
+    elapsed = time.perf_counter() - started
+    size = _result_bytes(result)
+    del result
+    tracemalloc.start()
+    try:
+        read()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'seconds': elapsed, 'peak_bytes': peak, 'result_bytes': size}
+
+def run(rows=100000, batch_size=5000):
+    """
+    Reads the same table as a list of tuples, as NumPy columns and as an Arrow table.
+
+    Args:
+        rows (int): Number of rows in the table.
+        batch_size (int): Rows fetched and converted per round-trip.
+
+    Returns:
+        dict: seconds, peak_bytes and result_bytes per read path. Formats whose library is missing are skipped.
+    """
+    client = SqliteClient()
+    try:
+        ops = DatabaseOperations(client)
+        _load(ops, rows, batch_size)
+        paths = {'rows': lambda: list(ops.find_iter('mysql', {}, 'readings', batch_size))}
+        for format in ('numpy', 'arrow'):
+            paths[format] = lambda format=format: ops.find_columnar('mysql', {}, 'readings', batch_size, format=format)
+        results = {}
+        for name, read in paths.items():
+            try:
+                results[name] = _measure(read)
+            except ImportError as e:
+                results[name] = {'skipped': str(e)}
+        return results
+    finally:
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    results = {'rows': args.rows, 'batch_size': args.batch_size, 'paths': run(args.rows, args.batch_size)}
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
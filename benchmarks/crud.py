@@ -0,0 +1,204 @@
+"""
+Benchmarks the CRUD hot paths of DatabaseOperations and writes the results as JSON.
+
+Modes:
+    fake    In-process fake drivers for all three databases, with --latency seconds per round-trip.
+    sqlite  An in-memory SQLite database behind the MySQL code path, and a dict-backed fake MongoDB.
+    real    Live servers described by a JSON --config file with the keys mongo_uri, mysql and postgres.
+
+Run with: python -m src.benchmarks.crud --mode sqlite --output results.json
+Compare two runs with: python -m src.benchmarks.crud --compare baseline.json --output results.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from ..db_client import DatabaseClient
+from ..db_operations import DatabaseOperations
+from .fakes import FakeDriverClient, SqliteClient
+
+def percentile(samples, q):
+    """
+    Returns the q-th quantile (0 <= q <= 1) of a list of samples, using the nearest-rank method.
+    """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def measure(call, iterations, rows_per_call=1):
+    """
+    Calls call(i) for i in range(iterations) and summarizes the latencies.
+
+    Returns:
+        dict: iterations, ops_per_sec, rows_per_sec, p50_ms, p99_ms and mean_ms.
+    """
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        call_started = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / elapsed,
+        'rows_per_sec': iterations * rows_per_call / elapsed,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': elapsed / iterations * 1000,
+    }
+
+def make_row(key, width, id_field='id'):
+    """
+    Builds a row with an integer key and width string columns.
+    """
+    row = {id_field: key}
+    for column in range(width):
+        row[f'c{column}'] = f'value-{key}-{column}'
+    return row
+
+def reset_table(client, db_type, table, width):
+    """
+    Creates the benchmark table (SQL) or empties the benchmark collection (MongoDB).
+    """
+    if db_type == 'mongo':
+        client.get_mongo_client()['your_database'][table].drop()
+        return
+    columns = ', '.join(f'c{column} VARCHAR(64)' for column in range(width))
+    with client.connection(db_type) as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, {columns})")
+        connection.commit()
+
+def bench_backend(client, db_type, widths, batch_sizes, iterations):
+    """
+    Runs every operation against one database for each row width and batch size.
+
+    Rows are built before timing starts, so only the library and driver are measured.
+
+    Returns:
+        list of dict: One result per (operation, width, batch_size).
+    """
+    ops = DatabaseOperations(client)
+    id_field = '_id' if db_type == 'mongo' else 'id'
+    results = []
+    for width in widths:
+        table = f"bench_w{width}"
+        reset_table(client, db_type, table, width)
+        rows = [make_row(i, width, id_field) for i in range(iterations)]
+        keys = [{id_field: i} for i in range(iterations)]
+        cases = [
+            ('insert', lambda i: ops.insert(db_type, rows[i], table)),
+            ('find', lambda i: ops.find(db_type, keys[i], table)),
+            ('update', lambda i: ops.update(db_type, keys[i], {'c0': 'updated'}, table)),
+            ('delete', lambda i: ops.delete(db_type, keys[i], table)),
+        ]
+        for operation, call in cases:
+            results.append({'backend': db_type, 'operation': operation, 'width': width, 'batch_size': None,
+                            **measure(call, iterations)})
+
+        for batch_size in batch_sizes:
+            reset_table(client, db_type, table, width)
+            calls = max(1, iterations // batch_size)
+            batches = [[make_row(i * batch_size + n, width, id_field) for n in range(batch_size)] for i in range(calls)]
+            results.append({'backend': db_type, 'operation': 'insert_many', 'width': width, 'batch_size': batch_size,
+                            **measure(lambda i: ops.insert_many(db_type, batches[i], table, batch_size), calls, batch_size)})
+    return results
+
+def make_client(mode, latency=0.0, config=None):
+    """
+    Builds the DatabaseClient for a benchmark mode and lists the databases it can benchmark.
+
+    Returns:
+        tuple: (client, list of database types)
+    """
+    if mode == 'fake':
+        return FakeDriverClient(latency=latency), ['mongo', 'mysql', 'postgres']
+    if mode == 'sqlite':
+        return SqliteClient(), ['mongo', 'mysql']
+    if mode == 'real':
+        client = DatabaseClient(config.get('mongo_uri'), config.get('mysql'), config.get('postgres'))
+        return client, client.configured_backends()
+    raise ValueError(f"Unknown benchmark mode: {mode}")
+
+def run(mode='fake', widths=(4, 16, 64), batch_sizes=(100, 1000), iterations=1000, latency=0.0, config=None):
+    """
+    Runs the whole suite.
+
+    Returns:
+        dict: 'meta' describing the run and 'results', a list of per-case measurements.
+    """
+    client, backends = make_client(mode, latency, config or {})
+    try:
+        results = []
+        for db_type in backends:
+            results.extend(bench_backend(client, db_type, widths, batch_sizes, iterations))
+    finally:
+        client.close()
+    meta = {'mode': mode, 'latency': latency, 'iterations': iterations, 'widths': list(widths),
+            'batch_sizes': list(batch_sizes), 'python': platform.python_version(), 'timestamp': time.time()}
+    return {'meta': meta, 'results': results}
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares two result documents case by case.
+
+    Args:
+        baseline (dict): Results of an earlier run.
+        current (dict): Results of this run.
+        threshold (float): Relative ops/sec drop reported as a regression.
+
+    Returns:
+        list of str: One line per regressed case.
+    """
+    def case(result):
+        return (result['backend'], result['operation'], result['width'], result['batch_size'])
+
+    previous = {case(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get(case(result))
+        if before is None:
+            continue
+        change = result['ops_per_sec'] / before['ops_per_sec'] - 1
+        if change < -threshold:
+            regressions.append(f"{'/'.join(str(part) for part in case(result))}: "
+                               f"{before['ops_per_sec']:.0f} -> {result['ops_per_sec']:.0f} ops/s ({change:+.1%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('fake', 'sqlite', 'real'), default='fake')
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--widths', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--latency', type=float, default=0.0, help="Injected round-trip latency in fake mode")
+    parser.add_argument('--config', help="JSON file with mongo_uri, mysql and postgres settings for real mode")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--compare', help="Earlier results to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Relative ops/sec drop counted as a regression")
+    args = parser.parse_args(argv)
+
+    config = None
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    report = run(args.mode, args.widths, args.batch_sizes, args.iterations, args.latency, config)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+In-process stand-ins for the database drivers, with injectable latency, used by the benchmarks.
+"""
+import sqlite3
+import time
+from itertools import count
+from ..db_client import DatabaseClient
+
+class FakeConnection:
+    """
+    A minimal DB-API connection whose statements take a fixed amount of time, like a network round-trip.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.closed = 0
+        self.unread_result = False
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        time.sleep(self.latency)
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return not self.closed
+
+    def is_closed(self):
+        return bool(self.closed)
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeCursor:
+    # Like mysql.connector cursors, the fakes expose no connection attribute, so code must commit on the connection.
+    def __init__(self, connection):
+        self._latency = connection.latency
+        self.description = ()
+
+    def execute(self, sql, params=None):
+        time.sleep(self._latency)
+
+    def executemany(self, sql, rows):
+        time.sleep(self._latency)
+
+    def fetchone(self):
+        return None
+
+    def fetchmany(self, size=None):
+        return []
+
+    def fetchall(self):
+        return []
+
+    def mogrify(self, template, args):
+        # Used by psycopg2's execute_values to render each row of a multi-row INSERT.
+        return repr(tuple(args)).encode()
+
+    def close(self):
+        pass
+
+
+class _InsertResult:
+    def __init__(self, inserted_id=None, inserted_ids=None):
+        self.inserted_id = inserted_id
+        self.inserted_ids = inserted_ids
+
+
+class _WriteResult:
+    def __init__(self, count):
+        self.matched_count = self.modified_count = self.deleted_count = count
+
+
+class FakeCollection:
+    """
+    A dict-backed MongoDB collection supporting equality queries, with a fixed latency per call.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.documents = {}
+        self._ids = count()
+
+    def _matches(self, document, query):
+        return all(document.get(key) == value for key, value in query.items())
+
+    def _first(self, query):
+        if '_id' in query:
+            document = self.documents.get(query['_id'])
+            return document if document is not None and self._matches(document, query) else None
+        return next((d for d in self.documents.values() if self._matches(d, query)), None)
+
+    def insert_one(self, document, session=None):
+        time.sleep(self.latency)
+        document.setdefault('_id', next(self._ids))
+        self.documents[document['_id']] = document
+        return _InsertResult(inserted_id=document['_id'])
+
+    def insert_many(self, documents, ordered=True, session=None):
+        time.sleep(self.latency)
+        ids = []
+        for document in documents:
+            document.setdefault('_id', next(self._ids))
+            self.documents[document['_id']] = document
+            ids.append(document['_id'])
+        return _InsertResult(inserted_ids=ids)
+
+    def find_one(self, query, session=None):
+        time.sleep(self.latency)
+        return self._first(query)
+
+    def find(self, query, projection=None, batch_size=0, session=None):
+        time.sleep(self.latency)
+        return _FakeMongoCursor([d for d in self.documents.values() if self._matches(d, query)])
+
+    def update_one(self, query, update, session=None):
+        time.sleep(self.latency)
+        document = self._first(query)
+        if document is not None:
+            document.update(update['$set'])
+        return _WriteResult(int(document is not None))
+
+    def drop(self):
+        self.documents.clear()
+
+    def delete_one(self, query, session=None):
+        time.sleep(self.latency)
+        document = self._first(query)
+        if document is not None:
+            del self.documents[document['_id']]
+        return _WriteResult(int(document is not None))
+
+
+class _FakeMongoCursor:
+    def __init__(self, documents):
+        self._documents = iter(documents)
+
+    def __iter__(self):
+        return self._documents
+
+    def __next__(self):
+        return next(self._documents)
+
+    def close(self):
+        pass
+
+
+class FakeMongoClient:
+    """
+    A MongoDB client stand-in whose databases hold FakeCollection objects.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self._databases = {}
+
+    def __getitem__(self, name):
+        return self._databases.setdefault(name, _FakeDatabase(self.latency))
+
+    def close(self):
+        pass
+
+
+class _FakeDatabase:
+    def __init__(self, latency):
+        self.latency = latency
+        self._collections = {}
+
+    def __getitem__(self, name):
+        return self._collections.setdefault(name, FakeCollection(self.latency))
+
+
+class SqliteConnection:
+    """
+    Wraps an in-memory sqlite3 connection so it accepts the %s placeholders the SQL code paths generate.
+    """
+
+    def __init__(self, connection=None):
+        self.connection = connection or sqlite3.connect(':memory:', check_same_thread=False)
+        self.closed = 0
+        self.unread_result = False
+
+    def cursor(self, *args, **kwargs):
+        return _SqliteCursor(self)
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def is_connected(self):
+        return not self.closed
+
+    def is_closed(self):
+        return bool(self.closed)
+
+    def close(self):
+        self.closed = 1
+        self.connection.close()
+
+
+class _SqliteCursor:
+    def __init__(self, connection):
+        self._cursor = connection.connection.cursor()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(sql.replace('%s', '?'), tuple(params))
+
+    def executemany(self, sql, rows):
+        self._cursor.executemany(sql.replace('%s', '?'), rows)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class FakeDriverClient(DatabaseClient):
+    """
+    A DatabaseClient whose drivers are replaced by fakes that sleep for a configurable time when connecting.
+
+    Args:
+        connect_delays (dict): Seconds each database takes to connect, keyed by database type.
+        failing (iterable of str): Databases whose connection attempt raises after the delay.
+        latency (float): Seconds every SQL statement and commit takes.
+        **kwargs: Forwarded to DatabaseClient (pool_config, connect_timeout, ...).
+    """
+
+    def __init__(self, connect_delays=None, failing=(), latency=0.0, **kwargs):
+        super().__init__("mongodb://fake", {}, {}, **kwargs)
+        self.connect_delays = connect_delays or {}
+        self.failing = set(failing)
+        self.latency = latency
+
+    def _fake_connect(self, db_type):
+        time.sleep(self.connect_delays.get(db_type, 0.0))
+        if db_type in self.failing:
+            raise OSError(f"{db_type} is unreachable")
+
+    def _open_mongo(self):
+        self._fake_connect('mongo')
+        return FakeMongoClient(self.latency)
+
+    def _open_mysql(self):
+        self._fake_connect('mysql')
+        return FakeConnection(self.latency)
+
+    def _open_postgres(self):
+        self._fake_connect('postgres')
+        return FakeConnection(self.latency)
+
+
+class SqliteClient(DatabaseClient):
+    """
+    A DatabaseClient whose 'mysql' database is a shared in-memory SQLite database, for benchmarks without servers.
+    MongoDB uses FakeMongoClient and PostgreSQL is not configured, since SQLite cannot stand in for execute_values.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__("mongodb://fake", {}, None, **kwargs)
+        self._sqlite = sqlite3.connect(':memory:', check_same_thread=False)
+
+    def _open_mongo(self):
+        return FakeMongoClient()
+
+    def _open_mysql(self):
+        return SqliteConnection(self._sqlite)
@@ -0,0 +1,69 @@
+"""
+Measures DatabaseClient startup latency with fake drivers that take a fixed time to connect.
+
+Run with: python -m src.benchmarks.startup
+"""
+import argparse
+import json
+import time
+from .fakes import FakeDriverClient
+
+DEFAULT_DELAYS = {'mongo': 0.05, 'mysql': 0.1, 'postgres': 0.2}
+
+def _time(setup):
+    started = time.perf_counter()
+    setup()
+    return time.perf_counter() - started
+
+def _first_use(client, db_type):
+    with client.connection(db_type):
+        pass
+
+def _ignore_errors(func):
+    try:
+        func()
+    except Exception:
+        pass
+
+def run(delays=DEFAULT_DELAYS, repeat=5):
+    """
+    Times sequential, parallel and lazy startup.
+
+    Args:
+        delays (dict): Connect delay in seconds per database type.
+        repeat (int): Number of runs per scenario; the best run is reported.
+
+    Returns:
+        dict: Best startup time in seconds per scenario.
+    """
+    scenarios = {
+        'sequential': lambda client: client.connect(parallel=False),
+        'parallel': lambda client: client.connect(),
+        'lazy_mysql_only': lambda client: _first_use(client, 'mysql'),
+        'parallel_with_postgres_down': lambda client: _ignore_errors(client.connect),
+    }
+    results = {}
+    for name, setup in scenarios.items():
+        timings = []
+        for _ in range(repeat):
+            failing = ('postgres',) if name == 'parallel_with_postgres_down' else ()
+            client = FakeDriverClient(connect_delays=delays, failing=failing)
+            timings.append(_time(lambda: setup(client)))
+            client.close()
+        results[name] = min(timings)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    results = {'delays': DEFAULT_DELAYS, 'startup_seconds': run(repeat=args.repeat)}
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+from bson import ObjectId
+
+# NumPy and PyArrow are optional: they are only needed for columnar reads, and only the requested one must be installed.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+FORMATS = ('numpy', 'arrow')
+
+class ColumnarBuilder:
+    """
+    Builds a columnar result incrementally from batches of rows or documents.
+
+    Each batch is converted into one array per column as soon as it arrives, so the full result never exists as
+    Python tuples or dicts; only the current batch does. Columns that first appear in a later MongoDB batch are
+    back-filled with nulls.
+
+    Attributes:
+        format (str): 'numpy' for a dict of numpy.ndarray per column, or 'arrow' for a pyarrow.Table.
+        rows (int): Number of rows added so far.
+    """
+
+    def __init__(self, format='numpy'):
+        """
+        Initializes the ColumnarBuilder.
+
+        Args:
+            format (str): 'numpy' or 'arrow'.
+
+        Raises:
+            ValueError: If the format is unknown.
+            ImportError: If the library the format needs is not installed.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown columnar format: {format}")
+        if format == 'numpy' and np is None:
+            raise ImportError("Columnar results in the 'numpy' format require numpy")
+        if format == 'arrow' and pa is None:
+            raise ImportError("Columnar results in the 'arrow' format require pyarrow")
+        self.format = format
+        self.rows = 0
+        self._chunks = {}
+        self._tables = []
+
+    def add_rows(self, columns, rows):
+        """
+        Adds a batch of SQL rows.
+
+        Args:
+            columns (tuple of str): Column names, in row order.
+            rows (list of tuple): The batch.
+        """
+        if rows:
+            self._add(dict(zip(columns, zip(*rows))), len(rows))
+
+    def add_documents(self, documents, fields=None):
+        """
+        Adds a batch of MongoDB documents.
+
+        Args:
+            documents (list of dict): The batch.
+            fields (list of str, optional): Fields to keep. Defaults to every field found in the batch.
+        """
+        if not documents:
+            return
+        if fields is None:
+            fields = dict.fromkeys(field for document in documents for field in document)
+        self._add({field: [document.get(field) for document in documents] for field in fields}, len(documents))
+
+    def _add(self, columns, size):
+        if self.format == 'arrow':
+            self._tables.append(pa.table({name: _arrow_array(values) for name, values in columns.items()}))
+        else:
+            for name in columns:
+                if name not in self._chunks:
+                    self._chunks[name] = [np.full(self.rows, None, dtype=object)] if self.rows else []
+            for name, chunks in self._chunks.items():
+                values = columns.get(name)
+                chunks.append(np.array(values) if values is not None else np.full(size, None, dtype=object))
+        self.rows += size
+
+    def finish(self):
+        """
+        Returns the columnar result.
+
+        Returns:
+            dict or pyarrow.Table: A dict of numpy.ndarray keyed by column for 'numpy', or a pyarrow.Table whose
+            record batches are the fetched batches for 'arrow'. An empty result has no columns.
+        """
+        if self.format == 'arrow':
+            if not self._tables:
+                return pa.table({})
+            # Missing columns become nulls and null or integer chunks are promoted to the type of the other batches.
+            return pa.concat_tables(self._tables, promote_options='permissive')
+        return {name: _concatenate(chunks) for name, chunks in self._chunks.items()}
+
+
+def _arrow_array(values):
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # MongoDB ObjectIds have no Arrow type, so they are stored as their hex strings.
+        return pa.array([str(value) if isinstance(value, ObjectId) else value for value in values])
+
+
+def _concatenate(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+    kinds = {chunk.dtype.kind for chunk in chunks}
+    if len(kinds) > 1 and not kinds <= set('iuf'):
+        # Batches inferred incompatible dtypes (e.g. numbers and strings); numpy would stringify the numbers.
+        chunks = [chunk.astype(object) for chunk in chunks]
+    return np.concatenate(chunks)
+
+
+def row_count(result):
+    """
+    Returns the number of rows of a columnar result.
+    """
+    if isinstance(result, dict):
+        return len(next(iter(result.values()))) if result else 0
+    return result.num_rows
@@ -1,7 +1,34 @@
 from pymongo import MongoClient
+import math
 import mysql.connector
 import psycopg2
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from contextlib import ExitStack, contextmanager, nullcontext
 from .exceptions import *
+from .logger import logger
+from .metrics import Observation
+from .pool import ConnectionPool
+from .replicas import ReplicaRouter
+from .resilience import CircuitBreaker, is_disconnect
+
+def _mysql_is_alive(connection):
+    # is_connected() pings the server, so a connection dropped while idle is detected before reuse.
+    return connection.is_connected()
+
+def _mysql_reset(connection):
+    # in_transaction reflects the server status flags, so connections without an open transaction skip the round-trip.
+    # psycopg2's rollback() already does nothing without one.
+    if getattr(connection, 'in_transaction', True):
+        connection.rollback()
+
+def _postgres_is_alive(connection):
+    return connection.closed == 0
+
+def _whole_seconds(timeout):
+    # The SQL drivers take whole seconds; rounding up never makes a timeout shorter than requested.
+    return max(1, math.ceil(timeout))
 
 class DatabaseClient:
 
@@ -9,6 +36,9 @@ class DatabaseClient:
     A multi-database client manager class that supports connections to MongoDB, MySQL, and PostgreSQL databases.
     It provides methods to connect to, retrieve, and close connections to these databases.
 
+    Each database is connected independently: connect() warms the selected databases in parallel, and any database
+    that was not warmed is connected on first use, so a slow or unreachable database never delays the others.
+
     Attributes:
         mongo_uri (str): URI used for connecting to MongoDB.
         mysql_config (dict): Configuration dictionary containing MySQL connection parameters.
@@ -16,36 +46,222 @@ class DatabaseClient:
         mongo_client (PymongoClient or None): Client object for MongoDB, initialized after successful connection.
         mysql_connection (Connection or None): Connection object for MySQL, initialized after successful connection.
         postgres_connection (Connection or None): Connection object for PostgreSQL, initialized after successful connection.
+        pool_config (dict or None): Options for ConnectionPool (min_size, max_size, timeout, max_lifetime). When set,
+            MySQL and PostgreSQL connections are pooled instead of shared.
+        mysql_pool (ConnectionPool or None): Pool of MySQL connections, initialized after successful connection in pooled mode.
+        postgres_pool (ConnectionPool or None): Pool of PostgreSQL connections, initialized after successful connection in pooled mode.
+        connect_timeout (float, dict or None): Connect timeout in seconds, either for every database or keyed by database type.
+        metrics (Metrics or None): Records connect and pool checkout latencies, and is shared with DatabaseOperations.
+        circuit_breakers (dict): CircuitBreaker per database type, used by DatabaseOperations; empty when disabled.
+        replica_routers (dict): ReplicaRouter per SQL database type that has read replicas.
+        mongo_read_preference (pymongo.read_preferences.ServerMode or None): Read preference of MongoDB reads.
+        close_hooks (list of callable): Functions called by close() before the connections are closed.
     """
-    def __init__(self, mongo_uri, mysql_config, postgres_config):
+    def __init__(self, mongo_uri, mysql_config, postgres_config, pool_config=None, connect_timeout=None, metrics=None,
+                 circuit_breaker=None, mysql_replicas=None, postgres_replicas=None, replica_strategy='round_robin',
+                 mongo_read_preference=None):
         """
         Initializes the DatabaseClient with connection parameters for MongoDB, MySQL, and PostgreSQL.
+        A database whose URI or config is None is not configured and is never connected.
 
         Args:
             mongo_uri (str): MongoDB URI string used to connect to the database.
             mysql_config (dict): Configuration settings (host, user, password, database) for MySQL.
             postgres_config (dict): Configuration settings (host, user, password, dbname) for PostgreSQL.
+            pool_config (dict, optional): Keyword arguments for ConnectionPool. Enables pooled mode for the SQL databases.
+            connect_timeout (float or dict, optional): Connect timeout in seconds, or a dict such as {'mysql': 2, 'mongo': 5}.
+                It is passed to the drivers and also bounds how long connect() waits for each database. The MySQL and
+                PostgreSQL drivers only take whole seconds, so fractional timeouts are rounded up for them.
+            metrics (Metrics, optional): Metrics recorder for connection events and, by default, for operations.
+            circuit_breaker (dict, optional): Keyword arguments for CircuitBreaker (failure_threshold, reset_timeout).
+                Enables one breaker per database, so operations on a database that is down fail fast.
+            mysql_replicas (list of dict, optional): Connection settings of MySQL read replicas.
+            postgres_replicas (list of dict, optional): Connection settings of PostgreSQL read replicas.
+            replica_strategy (str): How reads are spread over replicas, 'round_robin' or 'least_latency'.
+            mongo_read_preference (pymongo.read_preferences.ServerMode, optional): Read preference for MongoDB reads,
+                e.g. ReadPreference.SECONDARY_PREFERRED. Writes always go to the primary.
         """
         self.mongo_uri = mongo_uri
         self.mysql_config = mysql_config
         self.postgres_config = postgres_config
+        self.pool_config = pool_config
         self.mongo_client = None
         self.mysql_connection = None
         self.postgres_connection = None
+        self.mysql_pool = None
+        self.postgres_pool = None
+        self.connect_timeout = connect_timeout
+        self.metrics = metrics
+        self._connect_locks = {'mongo': threading.Lock(), 'mysql': threading.Lock(), 'postgres': threading.Lock()}
+        self.circuit_breakers = {}
+        if circuit_breaker is not None:
+            self.circuit_breakers = {db_type: CircuitBreaker(name=db_type, **circuit_breaker)
+                                     for db_type in ('mongo', 'mysql', 'postgres')}
+        # Each replica is a client of its own, so it is connected lazily and pooled like the primary.
+        self.replica_routers = {}
+        if mysql_replicas:
+            self.replica_routers['mysql'] = ReplicaRouter(
+                [DatabaseClient(None, config, None, pool_config, connect_timeout, metrics) for config in mysql_replicas],
+                replica_strategy)
+        if postgres_replicas:
+            self.replica_routers['postgres'] = ReplicaRouter(
+                [DatabaseClient(None, None, config, pool_config, connect_timeout, metrics) for config in postgres_replicas],
+                replica_strategy)
+        self.mongo_read_preference = mongo_read_preference
+        self.close_hooks = []
+
+    def configured_backends(self):
+        """
+        Lists the databases that have connection settings.
+
+        Returns:
+            list: The configured database types, in the order 'mongo', 'mysql', 'postgres'.
+        """
+        configs = {'mongo': self.mongo_uri, 'mysql': self.mysql_config, 'postgres': self.postgres_config}
+        return [db_type for db_type, config in configs.items() if config is not None]
+
+    def _timeout(self, db_type):
+        if isinstance(self.connect_timeout, dict):
+            return self.connect_timeout.get(db_type)
+        return self.connect_timeout
+
+    def _open_mongo(self):
+        timeout = self._timeout('mongo')
+        if timeout is None:
+            return MongoClient(self.mongo_uri)
+        timeout_ms = int(timeout * 1000)
+        return MongoClient(self.mongo_uri, connectTimeoutMS=timeout_ms, serverSelectionTimeoutMS=timeout_ms)
+
+    def _open_mysql(self):
+        config = dict(self.mysql_config)
+        if self._timeout('mysql') is not None:
+            config.setdefault('connection_timeout', _whole_seconds(self._timeout('mysql')))
+        return mysql.connector.connect(**config)
+
+    def _open_postgres(self):
+        config = dict(self.postgres_config)
+        if self._timeout('postgres') is not None:
+            config.setdefault('connect_timeout', _whole_seconds(self._timeout('postgres')))
+        return psycopg2.connect(**config)
+
+    def is_connected(self, db_type):
+        """
+        Checks whether a database has been connected, without connecting it.
 
-    def connect(self):
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+
+        Returns:
+            bool: True if the client, connection or pool for the database exists.
+        """
+        if db_type == 'mongo':
+            return self.mongo_client is not None
+        if db_type == 'mysql':
+            return self.mysql_pool is not None or self.mysql_connection is not None
+        if db_type == 'postgres':
+            return self.postgres_pool is not None or self.postgres_connection is not None
+        raise DatabaseConnectionError(f"Unsupported database type: {db_type}")
+
+    def _connect_backend(self, db_type):
+        """
+        Connects a single database unless it is already connected. Safe to call from several threads at once.
+
+        Raises:
+            DatabaseConnectionError: If the database is not configured or the connection fails.
+        """
+        if self.is_connected(db_type):
+            return
+        if db_type not in self.configured_backends():
+            raise DatabaseConnectionError(f"No connection settings were given for {db_type}")
+        with self._connect_locks[db_type]:
+            if self.is_connected(db_type):
+                return
+            timer = self.metrics.timer(db_type, 'connect') if self.metrics is not None else nullcontext()
+            try:
+                with timer:
+                    self._open_backend(db_type)
+            except DatabaseConnectionError:
+                raise
+            except Exception as e:
+                raise DatabaseConnectionError(f"Failed to connect to {db_type}: {e}") from e
+
+    def _open_backend(self, db_type):
+        if db_type == 'mongo':
+            self.mongo_client = self._open_mongo()
+        elif db_type == 'mysql':
+            if self.pool_config is not None:
+                self.mysql_pool = ConnectionPool(self._open_mysql, validate=_mysql_is_alive, discard_on=is_disconnect,
+                                                 reset=_mysql_reset, on_acquire=self._checkout_observer('mysql'),
+                                                 **self.pool_config)
+            else:
+                self.mysql_connection = self._open_mysql()
+        elif self.pool_config is not None:
+            self.postgres_pool = ConnectionPool(self._open_postgres, validate=_postgres_is_alive, discard_on=is_disconnect,
+                                                on_acquire=self._checkout_observer('postgres'), **self.pool_config)
+        else:
+            self.postgres_connection = self._open_postgres()
+
+    def _checkout_observer(self, db_type):
+        def observe(duration, error):
+            if self.metrics is not None:
+                self.metrics.record(Observation(db_type, 'checkout', '', duration, error=error))
+        return observe
+
+    def connect(self, backends=None, parallel=True):
         """
         Attempts to connect to all specified databases using the provided configuration settings.
 
+        The databases are connected concurrently and independently: one that fails or exceeds its connect timeout
+        does not prevent the others from connecting. Databases that are not warmed here are connected lazily the
+        first time they are used.
+
+        Args:
+            backends (list of str, optional): Databases to warm. Defaults to every configured database.
+            parallel (bool): Connect the databases concurrently rather than one after another.
+
         Raises:
             DatabaseConnectionError: Custom exception raised if any connection fails, with an error message indicating the failure.
+                The databases that connected successfully stay connected.
         """
-        try:
-            self.mongo_client = MongoClient(self.mongo_uri)
-            self.mysql_connection = mysql.connector.connect(**self.mysql_config)
-            self.postgres_connection = psycopg2.connect(**self.postgres_config)
-        except DatabaseConnectionError as e:
-            raise DatabaseConnectionError(f"Failed to connect to database: {e}")
+        backends = self.configured_backends() if backends is None else list(backends)
+        failures = {}
+        if parallel and len(backends) > 1:
+            executor = ThreadPoolExecutor(max_workers=len(backends), thread_name_prefix='DatabaseClient-connect')
+            started = time.monotonic()
+            futures = {db_type: executor.submit(self._connect_backend, db_type) for db_type in backends}
+            for db_type, future in futures.items():
+                timeout = self._timeout(db_type)
+                try:
+                    future.result(None if timeout is None else max(0, started + timeout - time.monotonic()))
+                except FuturesTimeoutError:
+                    failures[db_type] = f"timed out after {timeout} seconds"
+                except DatabaseConnectionError as e:
+                    failures[db_type] = e
+            # Do not wait for connections that timed out; they finish (or fail) in the background.
+            executor.shutdown(wait=False)
+        else:
+            for db_type in backends:
+                try:
+                    self._connect_backend(db_type)
+                except DatabaseConnectionError as e:
+                    failures[db_type] = e
+        if failures:
+            details = '; '.join(f"{db_type}: {error}" for db_type, error in failures.items())
+            raise DatabaseConnectionError(f"Failed to connect to database: {details}")
+
+    def get_mongo_client(self):
+        """
+        Returns the MongoDB client, connecting it first if needed.
+
+        Returns:
+            MongoClient: The MongoDB client.
+
+        Raises:
+            DatabaseConnectionError: If MongoDB is not configured or cannot be reached.
+        """
+        if self.mongo_client is None:
+            self._connect_backend('mongo')
+        return self.mongo_client
 
     def get_database(self, db_name=None):
 
@@ -57,6 +273,8 @@ class DatabaseClient:
 
         Returns:
             dict: A dictionary containing the open database connections, keyed by database type ('mongo', 'mysql', 'postgres').
+                In pooled mode the 'mysql' and 'postgres' entries are ConnectionPool objects; borrow connections from them
+                with pool.connection() rather than holding on to one.
 
         Raises:
             DatabaseConnectionError: If no database connections are currently open.
@@ -64,9 +282,13 @@ class DatabaseClient:
         databases = {}
         if self.mongo_client:
             databases['mongo'] = self.mongo_client[db_name] if db_name else self.mongo_client
-        if self.mysql_connection and not self.mysql_connection.is_closed():
+        if self.mysql_pool:
+            databases['mysql'] = self.mysql_pool
+        elif self.mysql_connection and not self.mysql_connection.is_closed():
             databases['mysql'] = self.mysql_connection
-        if self.postgres_connection:
+        if self.postgres_pool:
+            databases['postgres'] = self.postgres_pool
+        elif self.postgres_connection and _postgres_is_alive(self.postgres_connection):
             databases['postgres'] = self.postgres_connection
 
         if not databases:
@@ -74,13 +296,123 @@ class DatabaseClient:
         
         return databases
 
+    @contextmanager
+    def connection(self, db_type, timeout=None, read_only=False):
+        """
+        Borrows a SQL connection for the duration of a with block, connecting the database first if needed.
+
+        In pooled mode the connection is checked out of the pool and returned when the block exits; otherwise the
+        shared connection opened by connect() is yielded. A connection that fails with a connection error inside the
+        block is discarded, and the next call opens a new one.
+
+        With read_only=True and replicas configured, the connection comes from the replica chosen by the router; if
+        that replica cannot be reached, or every replica is known to be down, the primary is used instead. Only reads
+        may run on such a connection.
+
+        Args:
+            db_type (str): Type of SQL database ('mysql', 'postgres').
+            timeout (float, optional): Seconds to wait for a pooled connection. Defaults to the pool timeout.
+            read_only (bool): Allow the connection to come from a read replica.
+
+        Yields:
+            Connection: A DB-API connection for the requested database.
+
+        Raises:
+            DatabaseConnectionError: If the database is not connected.
+            PoolTimeoutError: If no pooled connection becomes available in time.
+        """
+        router = self.replica_routers.get(db_type) if read_only else None
+        if router is None:
+            with self._primary_connection(db_type, timeout) as conn:
+                yield conn
+            return
+        index = router.choose()
+        if index is None:
+            with self._primary_connection(db_type, timeout) as conn:
+                yield conn
+            return
+        with ExitStack() as stack:
+            # Only obtaining the connection is timed: how long the caller holds it says nothing about the replica.
+            started = time.perf_counter()
+            try:
+                conn = stack.enter_context(router.replicas[index].connection(db_type, timeout))
+            except DatabaseConnectionError:
+                router.record_failure(index)
+                index = None
+                conn = stack.enter_context(self._primary_connection(db_type, timeout))
+            else:
+                acquired = time.perf_counter() - started
+            try:
+                yield conn
+            except Exception as e:
+                if index is not None and is_disconnect(e):
+                    router.record_failure(index)
+                raise
+            if index is not None:
+                router.record(index, acquired)
+
+    @contextmanager
+    def _primary_connection(self, db_type, timeout=None):
+        if db_type not in ('mysql', 'postgres'):
+            raise DatabaseConnectionError(f"Unsupported SQL database type: {db_type}")
+        if not self.is_connected(db_type):
+            self._connect_backend(db_type)
+        pool = self.mysql_pool if db_type == 'mysql' else self.postgres_pool
+        if pool is not None:
+            with pool.connection(timeout) as conn:
+                yield conn
+            return
+        conn = self.mysql_connection if db_type == 'mysql' else self.postgres_connection
+        if conn is not None and db_type == 'postgres' and not _postgres_is_alive(conn):
+            # psycopg2 flags connections it saw break, so reconnect before handing out a dead one.
+            self._discard_connection(db_type, conn)
+            self._connect_backend(db_type)
+            conn = self.postgres_connection
+        if conn is None:
+            raise DatabaseConnectionError(f"No {db_type} connection is currently open.")
+        try:
+            yield conn
+        except Exception as e:
+            if is_disconnect(e):
+                self._discard_connection(db_type, conn)
+            raise
+
+    def _discard_connection(self, db_type, conn):
+        """
+        Drops a broken shared connection so the database is reconnected on next use. Does nothing if another
+        thread already replaced it.
+        """
+        with self._connect_locks[db_type]:
+            attribute = 'mysql_connection' if db_type == 'mysql' else 'postgres_connection'
+            if getattr(self, attribute) is not conn:
+                return
+            setattr(self, attribute, None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def add_close_hook(self, hook):
+        """
+        Registers a function that close() calls before closing the connections, e.g. to flush buffered writes.
+
+        Args:
+            hook (callable): Called without arguments. Hooks run in registration order, once per close().
+        """
+        self.close_hooks.append(hook)
 
     def close(self):
         """
         Closes all open database connections safely.
 
         This method checks each connection individually and closes it if it is open. This is crucial to free up resources and avoid potential leaks.
+        The close hooks run first, while the connections are still usable; a failing hook is logged and skipped.
         """
+        for hook in list(self.close_hooks):
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Close hook failed: {e}")
         if self.mongo_client:
             self.mongo_client.close()
         if self.mysql_connection:
@@ -89,4 +421,15 @@ class DatabaseClient:
                 self.mysql_connection.close()
         if self.postgres_connection:
             self.postgres_connection.close()
+        if self.mysql_pool:
+            self.mysql_pool.close()
+        if self.postgres_pool:
+            self.postgres_pool.close()
+        for router in self.replica_routers.values():
+            router.close()
+        self.mongo_client = None
+        self.mysql_connection = None
+        self.postgres_connection = None
+        self.mysql_pool = None
+        self.postgres_pool = None
 
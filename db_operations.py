@@ -1,6 +1,205 @@
+import functools
+import inspect
+import logging
+import threading
+import weakref
+from contextlib import closing, contextmanager
+from itertools import chain, count, islice
+from psycopg2.extras import execute_batch, execute_values
+from pymongo import DeleteMany, DeleteOne, InsertOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+from .columnar import ColumnarBuilder, row_count
 from .db_client import DatabaseClient
 from .exceptions import *
 from .logger import logger
+from .metrics import Metrics, payload_size
+from .query import Query
+from .resilience import is_transient
+from .statement_cache import PreparedRegistry, Statement, StatementCache
+from .transaction import Transaction
+from .write_behind import WriteBehindBuffer
+
+# Suffix for psycopg2 named cursors, which must be unique within a connection.
+_cursor_ids = count()
+
+# Times operations that are only logged, when no metrics are recorded.
+_UNRECORDED = Metrics(sinks=[])
+
+def _build_sql(operation, collection_table, columns, placeholder, db_type=None):
+    """
+    Renders the SQL for a CRUD operation.
+
+    Args:
+        operation (str): One of 'insert', 'find', 'update', 'delete' or 'upsert'.
+        collection_table (str): The table the statement targets.
+        columns (tuple): Column-name tuples: the inserted, queried or deleted columns, (set, where) for updates,
+            or (key, values) for upserts.
+        placeholder (callable): Returns the parameter marker for the n-th (1-based) parameter.
+        db_type (str, optional): 'mysql' or 'postgres', for the dialect specific upsert clause.
+
+    Returns:
+        str: The SQL statement.
+    """
+    params = count(1)
+
+    def assignments(names, separator):
+        return separator.join(f"{name}={placeholder(next(params))}" for name in names)
+
+    if operation == 'insert':
+        placeholders = ', '.join(placeholder(next(params)) for _ in columns[0])
+        return f"INSERT INTO {collection_table} ({', '.join(columns[0])}) VALUES ({placeholders})"
+    if operation == 'find':
+        # find() only returns the first match, so the server does not need to produce the rest.
+        where_clause = f" WHERE {assignments(columns[0], ' AND ')}" if columns[0] else ""
+        return f"SELECT * FROM {collection_table}{where_clause} LIMIT 1"
+    if operation == 'update':
+        set_clause = assignments(columns[0], ', ')
+        return f"UPDATE {collection_table} SET {set_clause} WHERE {assignments(columns[1], ' AND ')}"
+    if operation == 'delete':
+        return f"DELETE FROM {collection_table} WHERE {assignments(columns[0], ' AND ')}"
+    if operation == 'upsert':
+        keys, values = columns
+        placeholders = ', '.join(placeholder(next(params)) for _ in keys + values)
+        sql = f"INSERT INTO {collection_table} ({', '.join(keys + values)}) VALUES ({placeholders})"
+        if db_type == 'mysql':
+            # Assigning a key column to itself turns a conflict into a no-op when there is nothing to update.
+            updates = ', '.join(f"{name}=VALUES({name})" for name in values) or f"{keys[0]}={keys[0]}"
+            return f"{sql} ON DUPLICATE KEY UPDATE {updates}"
+        if not values:
+            return f"{sql} ON CONFLICT ({', '.join(keys)}) DO NOTHING"
+        updates = ', '.join(f"{name}=EXCLUDED.{name}" for name in values)
+        return f"{sql} ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+    raise ValueError(f"Unknown operation: {operation}")
+
+class _CallArguments:
+    """
+    Read-only view of the arguments of a call by parameter name, without binding the signature on every call.
+    """
+    __slots__ = ('_parameters', '_args', '_kwargs')
+
+    def __init__(self, parameters, args, kwargs):
+        self._parameters = parameters
+        self._args = args
+        self._kwargs = kwargs
+
+    def __getitem__(self, name):
+        index, default = self._parameters[name]
+        if index < len(self._args):
+            return self._args[index]
+        return self._kwargs.get(name, default)
+
+def _parameters(func):
+    # Position (after self) and default of each parameter of a method, looked up once when it is decorated.
+    parameters = list(inspect.signature(func).parameters.values())[1:]
+    return {parameter.name: (index, parameter.default) for index, parameter in enumerate(parameters)}
+
+def _instrumented(operation, measure=None):
+    """
+    Decorator recording the latency, size and outcome of a DatabaseOperations method in self.metrics, and logging
+    it as a structured DEBUG record when debug logging is enabled.
+
+    Args:
+        operation (str): Operation name used as the metric label.
+        measure (callable, optional): Called with the arguments (by name) and the result, returns (rows, bytes).
+            Generator methods instead count the rows they yield and are timed until exhausted or closed.
+    """
+    def decorator(func):
+        parameters = _parameters(func)
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                if self.metrics is None and not logger.isEnabledFor(logging.DEBUG):
+                    return func(self, *args, **kwargs)
+                arguments = _CallArguments(parameters, args, kwargs)
+                return _timed_rows(self._observe(arguments['db_type'], operation, arguments['collection_table']),
+                                   func(self, *args, **kwargs))
+            return wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if self.metrics is None and not logger.isEnabledFor(logging.DEBUG):
+                return func(self, *args, **kwargs)
+            arguments = _CallArguments(parameters, args, kwargs)
+            with self._observe(arguments['db_type'], operation, arguments['collection_table']) as observation:
+                result = func(self, *args, **kwargs)
+                if measure is not None:
+                    observation.rows, observation.bytes = measure(arguments, result)
+            return result
+        return wrapper
+    return decorator
+
+def _resilient(idempotent):
+    """
+    Decorator running a DatabaseOperations method through the circuit breaker of its database and, for idempotent
+    operations, retrying transient failures with self.retry_policy. Nothing is retried inside a transaction, since
+    the transaction's connection and earlier writes are lost with the failure.
+
+    Generator methods are never retried, since rows already yielded cannot be taken back; the breaker counts the
+    whole stream as one call.
+
+    Args:
+        idempotent (bool or tuple of str): Whether repeating the operation is safe, or the database types on which
+            it is.
+    """
+    def decorator(func):
+        parameters = _parameters(func)
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def stream(self, *args, **kwargs):
+                breaker = None
+                if self.db_client.circuit_breakers:
+                    breaker = self.db_client.circuit_breakers.get(_CallArguments(parameters, args, kwargs)['db_type'])
+                rows = func(self, *args, **kwargs)
+                yield from (rows if breaker is None else _guarded_rows(breaker, rows))
+            return stream
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if self.retry_policy is None and not self.db_client.circuit_breakers:
+                return func(self, *args, **kwargs)
+            db_type = _CallArguments(parameters, args, kwargs)['db_type']
+            call = functools.partial(func, self, *args, **kwargs)
+            breaker = self.db_client.circuit_breakers.get(db_type)
+            if breaker is not None:
+                call = functools.partial(breaker.call, call)
+            retry = idempotent if isinstance(idempotent, bool) else db_type in idempotent
+            if self.retry_policy is None or not retry or db_type in self._transactions():
+                return call()
+            return self.retry_policy.call(call)
+        return wrapper
+    return decorator
+
+def _timed_rows(timer, rows):
+    with timer as observation:
+        try:
+            for row in rows:
+                observation.rows += 1
+                yield row
+        except GeneratorExit:
+            pass
+        finally:
+            rows.close()
+
+def _guarded_rows(breaker, rows):
+    # As CircuitBreaker.call(), for a stream: closing it early still means the database answered.
+    breaker.before_call()
+    try:
+        yield from rows
+    except Exception as e:
+        if is_transient(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    except GeneratorExit:
+        breaker.record_success()
+        raise
+    except BaseException:
+        breaker.record_interrupted()
+        raise
+    breaker.record_success()
 
 class DatabaseOperations:
     """
@@ -10,17 +209,326 @@ class DatabaseOperations:
 
     Attributes:
         db_client (DatabaseClient): An instance of DatabaseClient which manages the connections to different databases.
+        statement_cache (StatementCache): LRU cache of the SQL generated for insert, find, update, delete and upsert.
+        prepared_statements (bool): Whether SQL runs as server-side prepared statements.
+        result_cache (ResultCache or None): Read-through cache for find() results, invalidated by writes.
+        metrics (Metrics or None): Records latency, row counts, bytes and errors of every operation.
+        retry_policy (RetryPolicy or None): Retries idempotent operations after transient failures.
     """
 
-    def __init__(self, db_client):
+    def __init__(self, db_client, statement_cache_size=256, prepared_statements=False, result_cache=None, metrics=None,
+                 retry_policy=None, schema_cache=None):
         """
         Initializes the DatabaseOperations with a DatabaseClient.
 
         Args:
             db_client (DatabaseClient): The database client used to execute operations across MongoDB, MySQL, and PostgreSQL.
+            statement_cache_size (int): Maximum number of generated SQL statements kept in the statement cache.
+            prepared_statements (bool): Run cached statements as prepared statements, using prepared cursors on MySQL
+                and PREPARE/EXECUTE on PostgreSQL, so the server parses each statement shape once per connection.
+            result_cache (ResultCache, optional): Cache find() results. insert, update and delete invalidate the
+                cached results of the table they write to.
+            metrics (Metrics, optional): Metrics recorder. Defaults to the metrics of db_client, if any.
+            retry_policy (RetryPolicy, optional): Retries idempotent operations (find, find_many, find_columnar,
+                update, update_many, upsert, delete_many, and delete on SQL) that fail with transient connection errors.
+                Inserts and bulk writes are never retried, as a lost acknowledgement would duplicate them.
+            schema_cache (SchemaCache, optional): Validates SQL table and column names against the cached schema
+                before anything is sent, quotes them, and orders columns as in the table so statements are shared.
         """
         self.db_client = db_client
+        self.statement_cache = StatementCache(statement_cache_size)
+        self.prepared_statements = prepared_statements
+        self._prepared_cursors = weakref.WeakKeyDictionary()
+        self._prepared_names = PreparedRegistry()
+        self.result_cache = result_cache
+        self.metrics = metrics if metrics is not None else getattr(db_client, 'metrics', None)
+        self.retry_policy = retry_policy
+        self.schema_cache = schema_cache
+        self._local = threading.local()
+        self._write_behind = {}
+        self._write_behind_lock = threading.Lock()
+
+    @contextmanager
+    def _observe(self, db_type, operation, collection_table):
+        """
+        Times a with block with Metrics.timer() of self.metrics, then logs the Observation as a structured DEBUG
+        record when debug logging is enabled.
+        """
+        metrics = self.metrics if self.metrics is not None else _UNRECORDED
+        try:
+            with metrics.timer(db_type, operation, collection_table) as observation:
+                yield observation
+        finally:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{operation} on {db_type} {collection_table} took {observation.duration * 1000:.3f} ms",
+                             extra={'operation': operation, 'db_type': db_type, 'table': collection_table,
+                                    'duration': observation.duration, 'rows': observation.rows, 'error': observation.error})
+
+    def _transactions(self):
+        """
+        Returns the transactions open in the calling thread, keyed by database type.
+        """
+        transactions = getattr(self._local, 'transactions', None)
+        if transactions is None:
+            transactions = self._local.transactions = {}
+        return transactions
+
+    @contextmanager
+    def transaction(self, db_type):
+        """
+        Groups the operations run on one database inside a with block into a single transaction.
+
+        Operations on db_type issued by the same thread inside the block share one connection (or MongoDB session)
+        and are committed together when the block exits, or rolled back if it raises. Nesting transaction() on the
+        same database creates a savepoint on SQL databases, so an inner failure only undoes the inner block. MongoDB
+        transactions require a replica set or sharded cluster and do not support savepoints.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+
+        Yields:
+            Transaction: The open transaction, which also exposes explicit savepoint control.
+
+        Raises:
+            TransactionError: If db_type is not supported.
+        """
+        active = self._transactions().get(db_type)
+        if active is not None:
+            if db_type == 'mongo':
+                yield active
+            else:
+                with active.savepoint():
+                    yield active
+            return
+        if db_type == 'mongo':
+            with self.db_client.get_mongo_client().start_session() as session:
+                session.start_transaction()
+                yield from self._run_transaction(Transaction(db_type, session=session))
+        elif db_type in ['mysql', 'postgres']:
+            with self.db_client.connection(db_type) as connection:
+                yield from self._run_transaction(Transaction(db_type, connection=connection))
+        else:
+            raise TransactionError(f"Transactions are not supported for database type: {db_type}")
+
+    def _run_transaction(self, transaction):
+        transactions = self._transactions()
+        transactions[transaction.db_type] = transaction
+        try:
+            yield transaction
+        except BaseException:
+            transaction.rollback()
+            raise
+        else:
+            transaction.commit()
+        finally:
+            del transactions[transaction.db_type]
+            # Results read inside the transaction may reflect uncommitted or rolled back writes.
+            for collection_table in transaction.tables:
+                self._invalidate(transaction.db_type, collection_table)
+
+    @contextmanager
+    def session(self):
+        """
+        Provides read-your-writes consistency for the calling thread inside a with block.
+
+        Once the block has written to a database, its later reads of that database go to the primary (and, for
+        MongoDB, ignore the configured read preference) instead of a replica that may not have applied the write yet.
+        Transactions always read from the primary. Nested sessions share the outer session.
+
+        Example:
+            with ops.session():
+                ops.insert('mysql', {'id': 1}, 'users')
+                ops.find('mysql', {'id': 1}, 'users')  # Served by the primary
+        """
+        if getattr(self._local, 'written', None) is not None:
+            yield
+            return
+        self._local.written = set()
+        try:
+            yield
+        finally:
+            self._local.written = None
+
+    def write_behind(self, db_type, collection_table, **options):
+        """
+        Returns the write-behind buffer of a table, creating it on first use.
+
+        Inserts through the buffer return as soon as the row is queued and are written in batches by a background
+        thread, so they are not acknowledged, not part of transaction() blocks and not visible to reads until flushed.
+        The buffers are flushed and closed by DatabaseClient.close().
+
+        Example:
+            metrics = ops.write_behind('postgres', 'metrics', batch_size=1000, flush_interval=0.5)
+            metrics.insert({'sensor': 7, 'value': 0.5})
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The collection or table written to.
+            **options: Keyword arguments for WriteBehindBuffer (max_size, batch_size, flush_interval, block,
+                put_timeout), used when the buffer is created.
+
+        Returns:
+            WriteBehindBuffer: The buffer of (db_type, collection_table).
+        """
+        with self._write_behind_lock:
+            buffer = self._write_behind.get((db_type, collection_table))
+            if buffer is None:
+                if self.close_write_behind not in self.db_client.close_hooks:
+                    self.db_client.add_close_hook(self.close_write_behind)
+                buffer = WriteBehindBuffer(self, db_type, collection_table, **options)
+                self._write_behind[(db_type, collection_table)] = buffer
+            return buffer
 
+    def close_write_behind(self):
+        """
+        Writes the rows queued in every write-behind buffer and stops their threads.
+        """
+        with self._write_behind_lock:
+            buffers = list(self._write_behind.values())
+            self._write_behind.clear()
+        for buffer in buffers:
+            buffer.close()
+
+    def _primary_reads(self, db_type):
+        """
+        Tells whether reads of db_type must go to the primary: inside a transaction, or after a write in a session.
+        """
+        return db_type in self._transactions() or db_type in (getattr(self._local, 'written', None) or ())
+
+    def _read_collection(self, collection_table):
+        """
+        Returns a MongoDB collection for reading, with the client's read preference unless reads must hit the primary.
+        """
+        collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+        preference = self.db_client.mongo_read_preference
+        if preference is not None and not self._primary_reads('mongo'):
+            collection = collection.with_options(read_preference=preference)
+        return collection
+
+    @contextmanager
+    def _connection(self, db_type, read_only=False):
+        """
+        Yields the connection of the calling thread's open transaction, or borrows one from the client. Reads pass
+        read_only=True so they may be served by a replica.
+        """
+        transaction = self._transactions().get(db_type)
+        if transaction is not None:
+            yield transaction.connection
+        else:
+            read_only = read_only and not self._primary_reads(db_type)
+            with self.db_client.connection(db_type, read_only=read_only) as connection:
+                yield connection
+
+    def _commit(self, db_type, connection):
+        """
+        Commits a write unless it belongs to an open transaction, which commits once at the end instead.
+        """
+        if db_type not in self._transactions():
+            connection.commit()
+
+    def _session(self, db_type):
+        """
+        Returns the keyword arguments that attach a MongoDB call to the calling thread's open transaction.
+        """
+        transaction = self._transactions().get(db_type)
+        return {'session': transaction.session} if transaction is not None else {}
+
+    def _invalidate(self, db_type, collection_table):
+        """
+        Drops cached find() results for a table after a write to it, and pins later reads of an open session() to the primary.
+        """
+        transaction = self._transactions().get(db_type)
+        if transaction is not None:
+            transaction.tables.add(collection_table)
+        written = getattr(self._local, 'written', None)
+        if written is not None:
+            written.add(db_type)
+        if self.result_cache is not None:
+            self.result_cache.invalidate(db_type, collection_table)
+
+    def _statement(self, db_type, operation, collection_table, *columns):
+        """
+        Returns the cached Statement for an operation of the given shape, generating it on first use.
+        """
+        def build():
+            table, names = collection_table, columns
+            if self.schema_cache is not None:
+                table = self._quote(db_type, collection_table)
+                names = tuple(tuple(self._quote(db_type, name) for name in group) for group in columns)
+            sql = _build_sql(operation, table, names, lambda n: '%s', db_type)
+            if db_type == 'postgres' and self.prepared_statements:
+                numbered_sql = _build_sql(operation, table, names, lambda n: f'${n}', db_type)
+                return Statement.for_postgres(sql, numbered_sql, sum(len(names) for names in columns))
+            return Statement(sql)
+        return self.statement_cache.get((db_type, operation, collection_table) + columns, build)
+
+    def _held_connection(self, db_type):
+        """
+        Returns the connection of the calling thread's open transaction on db_type, or None.
+        """
+        transaction = self._transactions().get(db_type)
+        return transaction.connection if transaction is not None else None
+
+    def _layout(self, db_type, collection_table, values):
+        """
+        Returns the columns of a dict of values and their parameters, in table order when a schema cache is used.
+
+        Raises:
+            SchemaValidationError: If the schema cache does not know the table or one of the columns.
+        """
+        if self.schema_cache is None:
+            return tuple(values), tuple(values.values())
+        columns = self.schema_cache.order(db_type, collection_table, values, self._held_connection(db_type))
+        return columns, tuple(values[column] for column in columns)
+
+    def _quote(self, db_type, name):
+        """
+        Quotes a table or column name when a schema cache is used, since only then is it known to exist.
+        """
+        return name if self.schema_cache is None else self.schema_cache.quote(db_type, name)
+
+    def _query_sql(self, db_type, query, collection_table):
+        """
+        Compiles a Query for a SQL database, validating and quoting its names when a schema cache is used.
+        """
+        if self.schema_cache is None:
+            return query.to_sql(collection_table)
+        self.schema_cache.validate(db_type, collection_table, query.fields(), self._held_connection(db_type))
+        return query.to_sql(collection_table, lambda name: self.schema_cache.quote(db_type, name))
+
+    def _execute(self, connection, db_type, statement, params):
+        """
+        Executes a cached Statement on connection and returns the cursor holding its result.
+        """
+        if not self.prepared_statements:
+            cursor = connection.cursor()
+            cursor.execute(statement.sql, params)
+            return cursor
+        if db_type == 'mysql':
+            # A prepared cursor only re-prepares when handed a different statement object, so keep one per statement.
+            cursors = self._prepared_cursors.setdefault(connection, {})
+            cursor = cursors.get(statement)
+            if cursor is None:
+                if len(cursors) >= self.statement_cache.maxsize:
+                    cursors.pop(next(iter(cursors))).close()
+                cursor = cursors[statement] = connection.cursor(prepared=True)
+            cursor.execute(statement.sql, params)
+            return cursor
+        cursor = connection.cursor()
+        prepared = self._prepared_names.names(connection)
+        if statement.name not in prepared:
+            # As with the MySQL cursors, each session holds at most as many statements as the cache.
+            if len(prepared) >= self.statement_cache.maxsize:
+                oldest = next(iter(prepared))
+                cursor.execute(f"DEALLOCATE {oldest}")
+                del prepared[oldest]
+            cursor.execute(statement.prepare_sql)
+            prepared[statement.name] = None
+        cursor.execute(statement.execute_sql, params)
+        return cursor
+
+    @_instrumented('insert', lambda args, result: (1, payload_size(args['data'])))
+    @_resilient(False)
     def insert(self, db_type, data, collection_table):
         """
         Inserts data into the specified database type and collection or table.
@@ -38,27 +546,123 @@ class DatabaseOperations:
         """
         try:
             if db_type == 'mongo':
-                collection = self.db_client.mongo_client['your_database'][collection_table]
-                result = collection.insert_one(data)
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                result = collection.insert_one(data, **self._session(db_type))
+                self._invalidate(db_type, collection_table)
                 return result.inserted_id
             elif db_type in ['mysql', 'postgres']:
-                cursor = self.db_client.mysql_connection.cursor() if db_type == 'mysql' else self.db_client.postgres_connection.cursor()
-                placeholders = ', '.join(['%s'] * len(data))
-                columns = ', '.join(data.keys())
-                sql = f"INSERT INTO {collection_table} ({columns}) VALUES ({placeholders})"
-                cursor.execute(sql, list(data.values()))
-                cursor.connection.commit()
+                columns, params = self._layout(db_type, collection_table, data)
+                statement = self._statement(db_type, 'insert', collection_table, columns)
+                with self._connection(db_type) as connection:
+                    cursor = self._execute(connection, db_type, statement, params)
+                    self._commit(db_type, connection)
+                self._invalidate(db_type, collection_table)
+        except InsertionError as e:
+            logger.error(f"Insert failed: {e}")
+            raise
+
+    @_instrumented('insert_many', lambda args, result: (sum(report['inserted'] for report in result),
+                                                        payload_size(args['rows']) if isinstance(args['rows'], list) else 0))
+    @_resilient(False)
+    def insert_many(self, db_type, rows, collection_table, batch_size=1000):
+        """
+        Inserts many documents or rows, sending them to the database in batches.
+
+        MySQL batches go through executemany, which the driver rewrites into a single multi-row INSERT, PostgreSQL
+        batches through psycopg2's execute_values and MongoDB batches through an unordered insert_many. Each SQL batch
+        is committed once, and a failed batch is rolled back without affecting the batches already written. Inside a
+        transaction() block nothing is committed per batch and a failing batch raises, so the whole transaction rolls back.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            rows (iterable of dict): Documents or rows to insert. SQL rows must all have the same keys.
+            collection_table (str): The name of the collection or table where data will be inserted.
+            batch_size (int): Maximum number of rows sent per round-trip.
+
+        Returns:
+            list of dict: One report per batch with the keys 'batch' (index), 'rows' (rows submitted),
+            'inserted' (rows written) and 'error' (None, or the error message if the batch failed).
+
+        Raises:
+            InsertionError: If batch_size is not positive or SQL rows do not share the same columns.
+        """
+        if batch_size < 1:
+            raise InsertionError(f"batch_size must be positive, got {batch_size}")
+        rows = iter(rows)
+        reports = []
+        in_transaction = db_type in self._transactions()
+        try:
+            if db_type == 'mongo':
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                for index, batch in enumerate(iter(lambda: list(islice(rows, batch_size)), [])):
+                    report = {'batch': index, 'rows': len(batch), 'inserted': 0, 'error': None}
+                    try:
+                        result = collection.insert_many(batch, ordered=False, **self._session(db_type))
+                        report['inserted'] = len(result.inserted_ids)
+                        self._invalidate(db_type, collection_table)
+                    except BulkWriteError as e:
+                        if in_transaction:
+                            raise
+                        # Unordered inserts keep going past failing documents, so part of the batch may be written.
+                        report['inserted'] = e.details.get('nInserted', 0)
+                        report['error'] = str(e)
+                        logger.error(f"Insert batch {index} into {collection_table} failed: {e}")
+                        self._invalidate(db_type, collection_table)
+                    reports.append(report)
+            elif db_type in ['mysql', 'postgres']:
+                batches = iter(lambda: list(islice(rows, batch_size)), [])
+                first = next(batches, None)
+                if first is None:
+                    return reports
+                # The columns are resolved before borrowing a connection, since a cold schema cache reads them first.
+                columns = self._layout(db_type, collection_table, first[0])[0]
+                column_set = set(columns)
+                column_list = ', '.join(self._quote(db_type, column) for column in columns)
+                table = self._quote(db_type, collection_table)
+                if db_type == 'mysql':
+                    placeholders = ', '.join(['%s'] * len(columns))
+                    sql = f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})"
+                else:
+                    sql = f"INSERT INTO {table} ({column_list}) VALUES %s"
+                with self._connection(db_type) as connection:
+                    for index, batch in enumerate(chain([first], batches)):
+                        if any(row.keys() != column_set for row in batch):
+                            raise InsertionError(f"All rows inserted into {collection_table} must have the columns {columns}")
+                        values = [tuple(row[column] for column in columns) for row in batch]
+                        report = {'batch': index, 'rows': len(batch), 'inserted': 0, 'error': None}
+                        cursor = connection.cursor()
+                        try:
+                            if db_type == 'mysql':
+                                cursor.executemany(sql, values)
+                            else:
+                                execute_values(cursor, sql, values, page_size=batch_size)
+                            self._commit(db_type, connection)
+                            report['inserted'] = len(batch)
+                            self._invalidate(db_type, collection_table)
+                        except Exception as e:
+                            if in_transaction:
+                                raise
+                            connection.rollback()
+                            report['error'] = str(e)
+                            logger.error(f"Insert batch {index} into {collection_table} failed: {e}")
+                        finally:
+                            cursor.close()
+                        reports.append(report)
         except InsertionError as e:
             logger.error(f"Insert failed: {e}")
             raise
+        return reports
 
+    @_instrumented('find', lambda args, result: (int(result is not None), payload_size(result)))
+    @_resilient(True)
     def find(self, db_type, query, collection_table):
         """
         Finds a document or a row from the specified collection or table based on the query.
 
         Args:
             db_type (str): Type of database ('mongo', 'mysql', 'postgres').
-            query (dict): Query to find the document or row.
+            query (dict or Query): Query to find the document or row. A Query also applies its projection and sort,
+                so the first row in sort order is returned.
             collection_table (str): The name of the collection or table to query.
 
         Returns:
@@ -67,20 +671,218 @@ class DatabaseOperations:
         Raises:
             DocumentNotFoundError: If no document matches the query.
         """
+        use_cache = self.result_cache is not None and db_type not in self._transactions()
+        if use_cache:
+            hit, result, generation = self.result_cache.lookup(db_type, collection_table, query)
+            if hit:
+                return result
+        result = None
+        try:
+            if isinstance(query, Query):
+                result = self._find_query(db_type, query, collection_table)
+            elif db_type == 'mongo':
+                collection = self._read_collection(collection_table)
+                result = collection.find_one(query, **self._session(db_type))
+            elif db_type in ['mysql', 'postgres']:
+                columns, params = self._layout(db_type, collection_table, query)
+                statement = self._statement(db_type, 'find', collection_table, columns)
+                with self._connection(db_type, read_only=True) as connection:
+                    cursor = self._execute(connection, db_type, statement, params)
+                    result = cursor.fetchone()
+        except DocumentNotFoundError as e:
+            logger.error(f"Find failed: {e}")
+            raise
+        if use_cache:
+            self.result_cache.store(db_type, collection_table, query, result, generation)
+        return result
+
+    def _find_query(self, db_type, query, collection_table):
+        """
+        Runs find() for a Query, fetching only its first result.
+        """
+        if db_type == 'mongo':
+            collection = self._read_collection(collection_table)
+            return collection.find_one(query.mongo_filter(), query.mongo_projection(),
+                                       **query.with_limit(1).mongo_options(), **self._session(db_type))
+        elif db_type in ['mysql', 'postgres']:
+            sql, params = self._query_sql(db_type, query.with_limit(1), collection_table)
+            with self._connection(db_type, read_only=True) as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(sql, params)
+                    return cursor.fetchone()
+                finally:
+                    cursor.close()
+
+    @_instrumented('find_many', lambda args, result: (len(result), payload_size(result)))
+    @_resilient(True)
+    def find_many(self, db_type, query, collection_table):
+        """
+        Finds every document or row matching the query, with projection, sort, limit and keyset pagination
+        applied by the database.
+
+        Use find_iter() instead when the result may not fit in memory.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            query (dict or Query): Query to match documents or rows. MongoDB takes a plain dict as a native filter.
+            collection_table (str): The name of the collection or table to query.
+
+        Returns:
+            list: The matching documents (dict) for MongoDB or rows (tuple) for SQL databases.
+
+        Raises:
+            DocumentNotFoundError: If the query fails.
+        """
+        try:
+            if db_type == 'mongo':
+                collection = self._read_collection(collection_table)
+                if isinstance(query, Query):
+                    cursor = collection.find(query.mongo_filter(), query.mongo_projection(), **query.mongo_options(),
+                                             **self._session(db_type))
+                else:
+                    # Plain filters go to pymongo unchanged, so native operators such as $or and $regex keep working.
+                    cursor = collection.find(query, **self._session(db_type))
+                try:
+                    return list(cursor)
+                finally:
+                    cursor.close()
+            elif db_type in ['mysql', 'postgres']:
+                sql, params = self._query_sql(db_type, Query.coerce(query), collection_table)
+                with self._connection(db_type, read_only=True) as connection:
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute(sql, params)
+                        return cursor.fetchall()
+                    finally:
+                        cursor.close()
+            return []
+        except DocumentNotFoundError as e:
+            logger.error(f"Find failed: {e}")
+            raise
+
+    @_instrumented('find_iter')
+    @_resilient(False)
+    def find_iter(self, db_type, query, collection_table, batch_size=1000, projection=None):
+        """
+        Lazily yields every document or row matching the query, keeping at most one batch in memory.
+
+        PostgreSQL rows are streamed through a named (server-side) cursor, MySQL rows through an unbuffered cursor and
+        MongoDB documents through a cursor with the given batch_size. The connection and cursor are held until the
+        generator is exhausted or closed, so callers that stop early should call close() on it (or use
+        contextlib.closing) to release them promptly.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            query (dict or Query): Query to match documents or rows. An empty query matches everything. A Query also
+                applies its sort and limit.
+            collection_table (str): The name of the collection or table to query.
+            batch_size (int): Number of documents or rows fetched per round-trip.
+            projection (list of str, optional): Fields or columns to return when query is a dict. Defaults to all of them.
+
+        Yields:
+            The matching documents (dict) for MongoDB or rows (tuple) for SQL databases.
+
+        Raises:
+            DocumentNotFoundError: If the query fails.
+        """
+        with closing(self._iter_batches(db_type, query, collection_table, batch_size, projection)) as batches:
+            for _, batch in batches:
+                yield from batch
+
+    @_instrumented('find_columnar', lambda args, result: (row_count(result), 0))
+    @_resilient(True)
+    def find_columnar(self, db_type, query, collection_table, batch_size=1000, projection=None, format='numpy'):
+        """
+        Reads every document or row matching the query into columnar form, one array per column.
+
+        Batches are fetched as in find_iter() and converted to arrays as they arrive, so memory holds the growing
+        arrays and a single batch of Python rows instead of one Python object per row and value. MongoDB documents
+        are flattened on their top-level fields; fields missing from a document become nulls.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            query (dict or Query): Query to match documents or rows.
+            collection_table (str): The name of the collection or table to query.
+            batch_size (int): Number of documents or rows fetched and converted at a time.
+            projection (list of str, optional): Fields or columns to return when query is a dict.
+            format (str): 'numpy' for a dict of numpy arrays keyed by column (requires numpy), or 'arrow' for a
+                pyarrow.Table (requires pyarrow).
+
+        Returns:
+            dict or pyarrow.Table: The columns of the result.
+
+        Raises:
+            ImportError: If the library needed for format is not installed.
+            DocumentNotFoundError: If the query fails.
+        """
+        builder = ColumnarBuilder(format)
+        # Plain dicts may be native Mongo filters, which Query would reject, so their fields come from projection.
+        fields = query.projection if isinstance(query, Query) else (tuple(projection) if projection else None)
+        for columns, batch in self._iter_batches(db_type, query, collection_table, batch_size, projection):
+            if columns is None:
+                builder.add_documents(batch, fields)
+            else:
+                builder.add_rows(columns, batch)
+        return builder.finish()
+
+    def _iter_batches(self, db_type, query, collection_table, batch_size, projection):
+        """
+        Yields (columns, batch) pairs for find_iter, where columns are the SQL column names (None for MongoDB) and
+        batch is a list of at most batch_size documents or rows.
+        """
+        if batch_size < 1:
+            raise DocumentNotFoundError(f"batch_size must be positive, got {batch_size}")
         try:
             if db_type == 'mongo':
-                collection = self.db_client.mongo_client['your_database'][collection_table]
-                return collection.find_one(query)
+                collection = self._read_collection(collection_table)
+                if isinstance(query, Query):
+                    cursor = collection.find(query.mongo_filter(), query.mongo_projection(), batch_size=batch_size,
+                                             **query.mongo_options(), **self._session(db_type))
+                else:
+                    cursor = collection.find(query, projection, batch_size=batch_size, **self._session(db_type))
+                try:
+                    for batch in iter(lambda: list(islice(cursor, batch_size)), []):
+                        yield None, batch
+                finally:
+                    cursor.close()
             elif db_type in ['mysql', 'postgres']:
-                cursor = self.db_client.mysql_connection.cursor() if db_type == 'mysql' else self.db_client.postgres_connection.cursor()
-                where_clause = ' AND '.join([f"{k}=%s" for k in query.keys()])
-                sql = f"SELECT * FROM {collection_table} WHERE {where_clause}"
-                cursor.execute(sql, tuple(query.values()))
-                return cursor.fetchone()
+                sql, params = self._query_sql(db_type, Query.coerce(query, projection), collection_table)
+                with self._connection(db_type, read_only=True) as connection:
+                    if db_type == 'mysql':
+                        cursor = connection.cursor(buffered=False)
+                    else:
+                        cursor = connection.cursor(name=f"find_iter_{next(_cursor_ids)}")
+                        cursor.itersize = batch_size
+                    closed_early = False
+                    try:
+                        cursor.execute(sql, params)
+                        batch = cursor.fetchmany(batch_size)
+                        # Named cursors only report their description once the first rows have been fetched.
+                        columns = tuple(column[0] for column in cursor.description or ())
+                        while batch:
+                            try:
+                                yield columns, batch
+                            except GeneratorExit:
+                                # Closing the iterator early is a normal exit, so the connection is kept.
+                                closed_early = True
+                                break
+                            batch = cursor.fetchmany(batch_size)
+                    finally:
+                        # An unbuffered MySQL cursor refuses to close while rows are still pending after an early exit.
+                        if db_type == 'mysql' and connection.unread_result:
+                            connection.consume_results()
+                        cursor.close()
+                    if closed_early and db_type not in self._transactions():
+                        # End the read transaction the server-side cursor ran in before the connection is reused.
+                        connection.rollback()
         except DocumentNotFoundError as e:
             logger.error(f"Find failed: {e}")
             raise
 
+    @_instrumented('update', lambda args, result: (getattr(result, 'modified_count', 0),
+                                                   payload_size(args['query']) + payload_size(args['new_values'])))
+    @_resilient(True)
     def update(self, db_type, query, new_values, collection_table):
         """
         Updates a document or a row in the specified collection or table based on the query.
@@ -99,19 +901,22 @@ class DatabaseOperations:
         """
         try:
             if db_type == 'mongo':
-                collection = self.db_client.mongo_client['your_database'][collection_table]
-                return collection.update_one(query, {'$set': new_values})
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                result = collection.update_one(query, {'$set': new_values}, **self._session(db_type))
+                self._invalidate(db_type, collection_table)
+                return result
             elif db_type in ['mysql', 'postgres']:
-                cursor = self.db_client.mysql_connection.cursor() if db_type == 'mysql' else self.db_client.postgres_connection.cursor()
-                set_clause = ', '.join([f"{k}=%s" for k in new_values.keys()])
-                where_clause = ', '.join([f"{k}=%s" for k in query.keys()])
-                sql = f"UPDATE {collection_table} SET {set_clause} WHERE {where_clause}"
-                cursor.execute(sql, list(new_values.values()) + list(query.values()))
-                cursor.connection.commit()
+                statement, params = self._update_statement(db_type, query, new_values, collection_table)
+                with self._connection(db_type) as connection:
+                    cursor = self._execute(connection, db_type, statement, params)
+                    self._commit(db_type, connection)
+                self._invalidate(db_type, collection_table)
         except UpdateError as e:
             logger.error(f"Update failed: {e}")
             raise
 
+    @_instrumented('delete', lambda args, result: (getattr(result, 'deleted_count', 0), payload_size(args['query'])))
+    @_resilient(('mysql', 'postgres'))
     def delete(self, db_type, query, collection_table):
         """
         Deletes a document or a row from the specified collection or table based on the query.
@@ -129,14 +934,275 @@ class DatabaseOperations:
         """
         try:
             if db_type == 'mongo':
-                collection = self.db_client.mongo_client['your_database'][collection_table]
-                return collection.delete_one(query)
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                result = collection.delete_one(query, **self._session(db_type))
+                self._invalidate(db_type, collection_table)
+                return result
+            elif db_type in ['mysql', 'postgres']:
+                statement, params = self._delete_statement(db_type, query, collection_table)
+                with self._connection(db_type) as connection:
+                    cursor = self._execute(connection, db_type, statement, params)
+                    self._commit(db_type, connection)
+                self._invalidate(db_type, collection_table)
+        except DeletionError as e:
+            logger.error(f"Delete failed: {e}")
+            raise
+
+    @_instrumented('update_many', lambda args, result: (_affected(result, 'modified_count'),
+                                                        payload_size(args['query']) + payload_size(args['new_values'])))
+    @_resilient(True)
+    def update_many(self, db_type, query, new_values, collection_table):
+        """
+        Updates every document or row in the specified collection or table that matches the query.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            query (dict): Query that identifies the documents or rows to update.
+            new_values (dict): Values to update in the documents or rows.
+            collection_table (str): The collection or table where the update will occur.
+
+        Returns:
+            The UpdateResult for MongoDB, or the number of affected rows for SQL databases.
+
+        Raises:
+            UpdateError: If the update operation fails.
+        """
+        try:
+            if db_type == 'mongo':
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                result = collection.update_many(query, {'$set': new_values}, **self._session(db_type))
+                self._invalidate(db_type, collection_table)
+                return result
+            elif db_type in ['mysql', 'postgres']:
+                statement, params = self._update_statement(db_type, query, new_values, collection_table)
+                with self._connection(db_type) as connection:
+                    cursor = self._execute(connection, db_type, statement, params)
+                    self._commit(db_type, connection)
+                self._invalidate(db_type, collection_table)
+                return cursor.rowcount
+        except UpdateError as e:
+            logger.error(f"Update failed: {e}")
+            raise
+
+    @_instrumented('delete_many', lambda args, result: (_affected(result, 'deleted_count'), payload_size(args['query'])))
+    @_resilient(True)
+    def delete_many(self, db_type, query, collection_table):
+        """
+        Deletes every document or row in the specified collection or table that matches the query.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            query (dict): Query that identifies the documents or rows to delete.
+            collection_table (str): The collection or table from which the documents or rows will be deleted.
+
+        Returns:
+            The DeleteResult for MongoDB, or the number of deleted rows for SQL databases.
+
+        Raises:
+            DeletionError: If the delete operation fails.
+        """
+        try:
+            if db_type == 'mongo':
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                result = collection.delete_many(query, **self._session(db_type))
+                self._invalidate(db_type, collection_table)
+                return result
             elif db_type in ['mysql', 'postgres']:
-                cursor = self.db_client.mysql_connection.cursor() if db_type == 'mysql' else self.db_client.postgres_connection.cursor()
-                where_clause = ' AND '.join([f"{k}=%s" for k in query.keys()])
-                sql = f"DELETE FROM {collection_table} WHERE {where_clause}"
-                cursor.execute(sql, tuple(query.values()))
-                cursor.connection.commit()
+                statement, params = self._delete_statement(db_type, query, collection_table)
+                with self._connection(db_type) as connection:
+                    cursor = self._execute(connection, db_type, statement, params)
+                    self._commit(db_type, connection)
+                self._invalidate(db_type, collection_table)
+                return cursor.rowcount
         except DeletionError as e:
             logger.error(f"Delete failed: {e}")
             raise
+
+    @_instrumented('upsert', lambda args, result: (1, payload_size(args['query']) + payload_size(args['new_values'])))
+    @_resilient(True)
+    def upsert(self, db_type, query, new_values, collection_table):
+        """
+        Updates the document or row matching the query, or inserts it if there is none, in a single round-trip.
+
+        On MySQL this is INSERT ... ON DUPLICATE KEY UPDATE and on PostgreSQL INSERT ... ON CONFLICT (query columns)
+        DO UPDATE, so the query columns must be covered by a primary key or unique index. The inserted row combines
+        the query and new_values.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            query (dict): Key of the document or row, with exact-match values.
+            new_values (dict): Values to set on the existing or new document or row.
+            collection_table (str): The collection or table to write to.
+
+        Returns:
+            The UpdateResult for MongoDB, or the number of affected rows for SQL databases.
+
+        Raises:
+            UpdateError: If the query is empty on a SQL database.
+        """
+        try:
+            if db_type == 'mongo':
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                result = collection.update_one(query, {'$set': new_values}, upsert=True, **self._session(db_type))
+                self._invalidate(db_type, collection_table)
+                return result
+            elif db_type in ['mysql', 'postgres']:
+                statement, params = self._upsert_statement(db_type, query, new_values, collection_table)
+                with self._connection(db_type) as connection:
+                    cursor = self._execute(connection, db_type, statement, params)
+                    self._commit(db_type, connection)
+                self._invalidate(db_type, collection_table)
+                return cursor.rowcount
+        except UpdateError as e:
+            logger.error(f"Upsert failed: {e}")
+            raise
+
+    def _upsert_statement(self, db_type, query, new_values, collection_table):
+        """
+        Returns the cached upsert Statement and its parameters. Columns present in the query are not updated.
+        """
+        if not query:
+            raise UpdateError(f"Upsert into {collection_table} needs a query identifying the row")
+        values = {name: value for name, value in new_values.items() if name not in query}
+        keys, key_params = self._layout(db_type, collection_table, query)
+        columns, value_params = self._layout(db_type, collection_table, values)
+        statement = self._statement(db_type, 'upsert', collection_table, keys, columns)
+        return statement, key_params + value_params
+
+    def _update_statement(self, db_type, query, new_values, collection_table):
+        """
+        Returns the cached update Statement and its parameters.
+        """
+        columns, value_params = self._layout(db_type, collection_table, new_values)
+        keys, key_params = self._layout(db_type, collection_table, query)
+        return self._statement(db_type, 'update', collection_table, columns, keys), value_params + key_params
+
+    def _delete_statement(self, db_type, query, collection_table):
+        """
+        Returns the cached delete Statement and its parameters.
+        """
+        keys, params = self._layout(db_type, collection_table, query)
+        return self._statement(db_type, 'delete', collection_table, keys), params
+
+    @_instrumented('bulk_write', lambda args, result: _bulk_measure(args['operations'], result))
+    @_resilient(False)
+    def bulk_write(self, db_type, operations, collection_table):
+        """
+        Applies a mixed list of writes to one collection or table as a single batch.
+
+        Each operation is a tuple whose first item names it:
+            ('insert', data)
+            ('update', query, new_values) and ('update_many', query, new_values)
+            ('upsert', query, new_values)
+            ('delete', query) and ('delete_many', query)
+
+        MongoDB receives the batch as one ordered bulk_write request. On SQL databases the batch runs in one
+        transaction (a savepoint inside an open transaction()), and consecutive operations sharing a statement are sent
+        together through executemany (MySQL) or execute_batch (PostgreSQL). As with update() and delete(), SQL
+        'update' and 'delete' affect every matching row.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            operations (list of tuple): The writes, applied in order.
+            collection_table (str): The collection or table to write to.
+
+        Returns:
+            The BulkWriteResult for MongoDB, or for SQL databases a dict counting the operations applied per kind.
+
+        Raises:
+            UpdateError: If an operation is malformed or of an unknown kind.
+        """
+        operations = list(operations)
+        try:
+            if db_type == 'mongo':
+                collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+                requests = [_mongo_request(operation) for operation in operations]
+                if not requests:
+                    return None
+                result = collection.bulk_write(requests, ordered=True, **self._session(db_type))
+                self._invalidate(db_type, collection_table)
+                return result
+            elif db_type in ['mysql', 'postgres']:
+                groups = []
+                counts = {}
+                for operation in operations:
+                    statement, params = self._bulk_statement(db_type, operation, collection_table)
+                    if groups and groups[-1][0] is statement:
+                        groups[-1][1].append(params)
+                    else:
+                        groups.append((statement, [params]))
+                    counts[operation[0]] = counts.get(operation[0], 0) + 1
+                if groups:
+                    with self.transaction(db_type) as transaction:
+                        cursor = transaction.connection.cursor()
+                        try:
+                            for statement, params in groups:
+                                if db_type == 'mysql':
+                                    cursor.executemany(statement.sql, params)
+                                else:
+                                    execute_batch(cursor, statement.sql, params)
+                        finally:
+                            cursor.close()
+                        self._invalidate(db_type, collection_table)
+                return counts
+        except UpdateError as e:
+            logger.error(f"Bulk write failed: {e}")
+            raise
+
+    def _bulk_statement(self, db_type, operation, collection_table):
+        """
+        Returns the cached Statement and parameters of one SQL bulk_write operation.
+        """
+        kind, args = _bulk_operation(operation)
+        if kind == 'insert':
+            columns, params = self._layout(db_type, collection_table, args[0])
+            return self._statement(db_type, 'insert', collection_table, columns), params
+        if kind in ('update', 'update_many'):
+            return self._update_statement(db_type, args[0], args[1], collection_table)
+        if kind == 'upsert':
+            return self._upsert_statement(db_type, args[0], args[1], collection_table)
+        return self._delete_statement(db_type, args[0], collection_table)
+
+def _affected(result, attribute):
+    """
+    Returns the number of documents or rows a write affected, from a pymongo result or a SQL rowcount.
+    """
+    return result if isinstance(result, int) else getattr(result, attribute, 0)
+
+def _bulk_measure(operations, result):
+    """
+    Returns the (rows, bytes) of a bulk_write call. An iterator of operations is used up by the call, so only the SQL
+    result, which counts the operations applied per kind, tells how many there were.
+    """
+    if isinstance(operations, list):
+        return len(operations), payload_size(operations)
+    return (sum(result.values()) if isinstance(result, dict) else 0), 0
+
+# Number of arguments following the kind in each bulk_write operation tuple.
+_BULK_ARITY = {'insert': 1, 'update': 2, 'update_many': 2, 'upsert': 2, 'delete': 1, 'delete_many': 1}
+
+def _bulk_operation(operation):
+    """
+    Validates a bulk_write operation tuple and splits it into its kind and arguments.
+    """
+    kind, args = operation[0], tuple(operation[1:])
+    if _BULK_ARITY.get(kind) != len(args):
+        raise UpdateError(f"Invalid bulk write operation: {operation!r}")
+    return kind, args
+
+def _mongo_request(operation):
+    """
+    Converts a bulk_write operation tuple into the matching pymongo write model.
+    """
+    kind, args = _bulk_operation(operation)
+    if kind == 'insert':
+        return InsertOne(args[0])
+    if kind == 'update':
+        return UpdateOne(args[0], {'$set': args[1]})
+    if kind == 'update_many':
+        return UpdateMany(args[0], {'$set': args[1]})
+    if kind == 'upsert':
+        return UpdateOne(args[0], {'$set': args[1]}, upsert=True)
+    if kind == 'delete':
+        return DeleteOne(args[0])
+    return DeleteMany(args[0])
@@ -96,3 +96,93 @@ class DeletionError(Error):
         """
         self.message = message
         super().__init__(self.message)
+
+class PoolTimeoutError(DatabaseConnectionError):
+    """
+    Exception raised when no pooled connection becomes available within the checkout timeout.
+
+    Attributes:
+        message (str): Explanation of the error
+    """
+    def __init__(self, message="Timed out waiting for a pooled database connection"):
+        """
+        Initialize the exception with a message that describes the error.
+
+        Args:
+            message (str): Custom message describing the error. Default message is used
+                           if none is provided.
+        """
+        self.message = message
+        super().__init__(self.message)
+
+class TransactionError(Error):
+    """
+    Exception raised for errors that occur while managing a transaction or savepoint.
+
+    Attributes:
+        message (str): Explanation of the error
+    """
+    def __init__(self, message="Transaction operation failed"):
+        """
+        Initialize the exception with a message that describes the error.
+
+        Args:
+            message (str): Custom message describing the error. Default message is used
+                           if none is provided.
+        """
+        self.message = message
+        super().__init__(self.message)
+
+class CircuitOpenError(DatabaseConnectionError):
+    """
+    Exception raised when a call is rejected because the circuit breaker of its database is open.
+
+    Attributes:
+        message (str): Explanation of the error
+    """
+    def __init__(self, message="Database is unavailable; circuit breaker is open"):
+        """
+        Initialize the exception with a message that describes the error.
+
+        Args:
+            message (str): Custom message describing the error. Default message is used
+                           if none is provided.
+        """
+        self.message = message
+        super().__init__(self.message)
+
+class BufferFullError(InsertionError):
+    """
+    Exception raised when a write-behind buffer is full and the insert cannot wait for room.
+
+    Attributes:
+        message (str): Explanation of the error
+    """
+    def __init__(self, message="Write-behind buffer is full"):
+        """
+        Initialize the exception with a message that describes the error.
+
+        Args:
+            message (str): Custom message describing the error. Default message is used
+                           if none is provided.
+        """
+        self.message = message
+        super().__init__(self.message)
+
+class SchemaValidationError(Error):
+    """
+    Exception raised when a table, collection or column name is invalid or not part of the database schema.
+
+    Attributes:
+        message (str): Explanation of the error
+    """
+    def __init__(self, message="Schema validation failed"):
+        """
+        Initialize the exception with a message that describes the error.
+
+        Args:
+            message (str): Custom message describing the error. Default message is used
+                           if none is provided.
+        """
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+class FanOutResult:
+    """
+    Outcome of a fan-out call.
+
+    Attributes:
+        results (dict): Return values of the calls that succeeded, keyed by backend (or call key).
+        errors (dict): Exceptions of the calls that failed or timed out, keyed the same way.
+        pending (set): Keys of calls still running when the fan-out returned early.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.pending = set()
+
+    @property
+    def ok(self):
+        """bool: True if no call failed or timed out."""
+        return not self.errors
+
+    def first(self):
+        """
+        Returns one successful result, or None if every call failed.
+        """
+        return next(iter(self.results.values()), None)
+
+    def __repr__(self):
+        return f"FanOutResult(results={self.results!r}, errors={self.errors!r}, pending={self.pending!r})"
+
+
+class FanOutExecutor:
+    """
+    Runs operations against several databases concurrently on a thread pool.
+
+    The latency of a fan-out is that of the slowest backend it waits for, instead of the sum of all of them.
+    Calls that exceed their timeout are reported as errors; they cannot be interrupted and finish in the background.
+
+    Attributes:
+        db_ops (DatabaseOperations): The operations used to run calls given by name.
+        executor (ThreadPoolExecutor): Thread pool the calls run on.
+        timeout (float, dict or None): Default timeout in seconds, either for every call or keyed by backend.
+    """
+
+    def __init__(self, db_ops, max_workers=None, timeout=None):
+        """
+        Initializes the FanOutExecutor.
+
+        Args:
+            db_ops (DatabaseOperations): The operations used to run calls given by name.
+            max_workers (int, optional): Size of the thread pool. Defaults to the ThreadPoolExecutor default.
+            timeout (float or dict, optional): Default per-call timeout, or a dict keyed by backend.
+        """
+        self.db_ops = db_ops
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='FanOutExecutor')
+        self.timeout = timeout
+
+    def run(self, operation, backends, *args, timeout=None, mode='all', quorum=None, **kwargs):
+        """
+        Runs the same DatabaseOperations method against several databases at once.
+
+        Example:
+            executor.run('insert', ['mongo', 'mysql', 'postgres'], {'id': 1}, 'users')
+
+        Args:
+            operation (str): Name of the DatabaseOperations method, e.g. 'insert' or 'find'.
+            backends (iterable of str): Database types to run it against.
+            *args: Arguments following db_type in the method signature.
+            timeout (float or dict, optional): Per-backend timeout overriding the executor default.
+            mode (str): 'all' waits for every backend, 'first' returns on the first success and 'quorum'
+                returns once quorum backends have succeeded.
+            quorum (int, optional): Number of successes required in 'quorum' mode. Defaults to a majority.
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            FanOutResult: Results and errors keyed by database type.
+        """
+        method = getattr(self.db_ops, operation)
+        calls = {db_type: (lambda db_type=db_type: method(db_type, *args, **kwargs)) for db_type in backends}
+        return self.run_many(calls, timeout=timeout, mode=mode, quorum=quorum)
+
+    def run_many(self, calls, timeout=None, mode='all', quorum=None):
+        """
+        Runs heterogeneous calls concurrently.
+
+        Example:
+            executor.run_many({
+                'mongo': lambda: ops.find('mongo', {'id': 1}, 'users'),
+                'mysql': lambda: ops.update('mysql', {'id': 1}, {'name': 'x'}, 'users'),
+            })
+
+        Args:
+            calls (dict): Zero-argument callables keyed by a name, usually the database type.
+            timeout (float or dict, optional): Per-call timeout overriding the executor default.
+            mode (str): 'all', 'first' or 'quorum', see run().
+            quorum (int, optional): Number of successes required in 'quorum' mode. Defaults to a majority.
+
+        Returns:
+            FanOutResult: Results and errors keyed like calls.
+
+        Raises:
+            ValueError: If mode is unknown.
+        """
+        if mode not in ('all', 'first', 'quorum'):
+            raise ValueError(f"Unknown fan-out mode: {mode}")
+        needed = {'all': len(calls), 'first': 1, 'quorum': quorum or len(calls) // 2 + 1}[mode]
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        futures = {}
+        deadlines = {}
+        for key, call in calls.items():
+            futures[self.executor.submit(call)] = key
+            key_timeout = timeout.get(key) if isinstance(timeout, dict) else timeout
+            deadlines[key] = None if key_timeout is None else started + key_timeout
+
+        outcome = FanOutResult()
+        pending = set(futures)
+        while pending and len(outcome.results) < needed:
+            # Stop early once the required number of successes can no longer be reached.
+            if len(outcome.results) + len(pending) < needed:
+                break
+            open_deadlines = [deadlines[futures[f]] for f in pending if deadlines[futures[f]] is not None]
+            wait_for = None if not open_deadlines else max(0, min(open_deadlines) - time.monotonic())
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = futures[future]
+                try:
+                    outcome.results[key] = future.result()
+                except Exception as e:
+                    outcome.errors[key] = e
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines[futures[f]] is not None and deadlines[futures[f]] <= now]:
+                pending.discard(future)
+                future.cancel()
+                key = futures[future]
+                outcome.errors[key] = TimeoutError(f"{key} did not finish within {deadlines[key] - started:.3f} seconds")
+        for future in pending:
+            future.cancel()
+            outcome.pending.add(futures[future])
+        return outcome
+
+    def close(self):
+        """
+        Shuts the thread pool down without waiting for running calls.
+        """
+        self.executor.shutdown(wait=False)
@@ -1,21 +1,188 @@
+import json
 import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 
-# Create and configure a logger
+# Create the package logger. Nothing is attached until configure_logging() is called, so importing the package
+# never opens a file; the NullHandler keeps Python from printing records when the application configured nothing.
 logger = logging.getLogger('DatabaseLogger')
-# Set the minimum logging level. DEBUG level means that all messages at this level and more severe will be logged.
-logger.setLevel(logging.DEBUG)
+logger.addHandler(logging.NullHandler())
 
-# Create a file handler that logs even debug messages
-# This handler directs the log messages to a file named 'database.log'.
-fh = logging.FileHandler('database.log')
-fh.setLevel(logging.DEBUG)  # Set the minimum log level for the file handler
+# Fields that DatabaseOperations attaches to its records through the logging 'extra' argument.
+STRUCTURED_FIELDS = ('operation', 'db_type', 'table', 'duration', 'rows', 'error')
 
-# Define how the log messages should be formatted.
-# This formatter specifies that each message should include the timestamp, logger name, log level, and the log message.
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Format used for plain-text sinks: the timestamp, logger name, log level, and the log message.
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-# Add the formatter to the file handler so it knows how to format the messages
-fh.setFormatter(formatter)
+_listener = None
+_queue_handler = None
+_propagate = None
+_configure_lock = threading.Lock()
 
-# Add the file handler to the logger so that it can process log messages.
-logger.addHandler(fh)
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as a single JSON object, including the structured operation fields when present.
+    """
+
+    def format(self, record):
+        document = {
+            'time': self.formatTime(record),
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                document[field] = value
+        if record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a random fraction of the records at or below a level; more severe records always pass.
+
+    Attributes:
+        rate (float): Fraction of the sampled records that are kept, between 0 and 1.
+        level (int): Highest level that is sampled.
+    """
+
+    def __init__(self, rate, level=logging.DEBUG):
+        super().__init__()
+        self.rate = rate
+        self.level = level
+
+    def filter(self, record):
+        return record.levelno > self.level or random.random() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket limiting how many records at or below a level pass per second; more severe records always pass.
+
+    Attributes:
+        per_second (float): Sustained number of records allowed per second.
+        burst (int): Number of records that may pass at once after a quiet period.
+        level (int): Highest level that is rate limited.
+        dropped (int): Number of records rejected so far.
+    """
+
+    def __init__(self, per_second, burst=None, level=logging.DEBUG):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst if burst is not None else max(1, int(per_second))
+        self.level = level
+        self.dropped = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.level:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.per_second)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.dropped += 1
+            return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    A QueueHandler that never blocks the logging thread: records are dropped and counted when the queue is full.
+
+    Attributes:
+        dropped (int): Number of records dropped because the queue was full.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(handlers=None, level=logging.INFO, json_format=False, filename=None,
+                      debug_sample_rate=None, debug_rate_limit=None, queue_size=10000):
+    """
+    Configures the package logger to hand records to a background thread that writes them to the sinks.
+
+    Logging calls on request threads only put the record on a bounded queue; formatting and I/O happen on the
+    QueueListener thread. Records no longer propagate to the root logger's handlers, whose I/O would happen on the
+    request thread again, until shutdown_logging(). Calling configure_logging() again replaces the previous
+    configuration.
+
+    Args:
+        handlers (list of logging.Handler, optional): Sinks to write to. Handlers without a formatter get the
+            JSON or text formatter. Defaults to a file handler for filename, or a stream handler on stderr.
+        level (int): Minimum level passed to the sinks.
+        json_format (bool): Format records as JSON objects carrying operation, db_type, table and duration.
+        filename (str, optional): File to log to when no handlers are given, e.g. 'database.log'.
+        debug_sample_rate (float, optional): Fraction of DEBUG records kept.
+        debug_rate_limit (float, optional): Maximum number of DEBUG records per second.
+        queue_size (int): Capacity of the queue; records are dropped rather than blocking when it is full.
+
+    Returns:
+        DroppingQueueHandler: The handler attached to the logger, whose dropped attribute counts lost records.
+    """
+    global _listener, _queue_handler, _propagate
+    with _configure_lock:
+        _shutdown()
+        if handlers is None:
+            handlers = [logging.FileHandler(filename) if filename else logging.StreamHandler()]
+        formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+        for handler in handlers:
+            if handler.formatter is None:
+                handler.setFormatter(formatter)
+
+        _queue_handler = DroppingQueueHandler(queue.Queue(queue_size))
+        _queue_handler.setLevel(level)
+        if debug_sample_rate is not None:
+            _queue_handler.addFilter(SamplingFilter(debug_sample_rate))
+        if debug_rate_limit is not None:
+            _queue_handler.addFilter(RateLimitFilter(debug_rate_limit))
+        _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        logger.addHandler(_queue_handler)
+        logger.setLevel(level)
+        _propagate, logger.propagate = logger.propagate, False
+        return _queue_handler
+
+
+def _shutdown():
+    global _listener, _queue_handler, _propagate
+    if _queue_handler is not None:
+        logger.removeHandler(_queue_handler)
+        _queue_handler = None
+    if _propagate is not None:
+        logger.propagate = _propagate
+        _propagate = None
+    if _listener is not None:
+        # stop() drains the queue before returning, so nothing logged before shutdown is lost.
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    logger.setLevel(logging.NOTSET)
+
+
+def shutdown_logging():
+    """
+    Flushes pending records, stops the background thread and closes the sinks.
+    """
+    with _configure_lock:
+        _shutdown()
@@ -0,0 +1,236 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Latency histogram bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Observation:
+    """
+    A single timed call, as passed to metrics sinks.
+
+    Attributes:
+        db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+        operation (str): Operation name, e.g. 'insert', 'find', 'connect' or 'checkout'.
+        table (str): Collection or table name, or '' for connection-level events.
+        duration (float): Wall-clock duration in seconds.
+        rows (int): Number of documents or rows written or returned.
+        bytes (int): Estimated payload size in bytes.
+        error (bool): Whether the call raised.
+    """
+    __slots__ = ('db_type', 'operation', 'table', 'duration', 'rows', 'bytes', 'error')
+
+    def __init__(self, db_type, operation, table, duration=0.0, rows=0, bytes=0, error=False):
+        self.db_type = db_type
+        self.operation = operation
+        self.table = table
+        self.duration = duration
+        self.rows = rows
+        self.bytes = bytes
+        self.error = error
+
+
+class MetricsSink(ABC):
+    """
+    Interface for the destinations of Metrics observations. Subclasses without record() cannot be instantiated.
+    """
+
+    @abstractmethod
+    def record(self, observation):
+        """
+        Receives one Observation. Called on the thread that ran the operation, so it must be fast and thread-safe.
+        """
+        raise NotImplementedError
+
+
+class CallbackSink(MetricsSink):
+    """
+    A sink that forwards every Observation to a callable, e.g. to push it to StatsD.
+    """
+
+    def __init__(self, callback):
+        """
+        Args:
+            callback (callable): Called with each Observation.
+        """
+        self.callback = callback
+
+    def record(self, observation):
+        self.callback(observation)
+
+
+class _Series:
+    __slots__ = ('buckets', 'counts', 'calls', 'errors', 'rows', 'bytes', 'total_seconds')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.total_seconds = 0.0
+
+    def add(self, observation):
+        self.counts[bisect_left(self.buckets, observation.duration)] += 1
+        self.calls += 1
+        self.errors += observation.error
+        self.rows += observation.rows
+        self.bytes += observation.bytes
+        self.total_seconds += observation.duration
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation; inf if it fell past the last bucket.
+        rank = q * self.calls
+        seen = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += bucket_count
+            if seen >= rank and seen:
+                return bound
+        return 0.0
+
+
+class InMemorySink(MetricsSink):
+    """
+    A sink aggregating observations into per-(db_type, operation, table) latency histograms and counters.
+
+    Attributes:
+        buckets (tuple of float): Histogram bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (tuple of float): Histogram bucket upper bounds in seconds, in increasing order.
+        """
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, observation):
+        key = (observation.db_type, observation.operation, observation.table)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.buckets)
+            series.add(observation)
+
+    def snapshot(self):
+        """
+        Returns a point-in-time copy of the aggregated metrics.
+
+        Returns:
+            dict: Keyed by (db_type, operation, table); each value holds 'calls', 'errors', 'rows', 'bytes',
+            'total_seconds', 'p50', 'p99' (bucket upper bounds in seconds) and 'buckets' (bound -> cumulative count).
+        """
+        with self._lock:
+            snapshot = {}
+            for key, series in self._series.items():
+                cumulative, running = {}, 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), series.counts):
+                    running += bucket_count
+                    cumulative[bound] = running
+                snapshot[key] = {'calls': series.calls, 'errors': series.errors, 'rows': series.rows,
+                                 'bytes': series.bytes, 'total_seconds': series.total_seconds,
+                                 'p50': series.quantile(0.5), 'p99': series.quantile(0.99), 'buckets': cumulative}
+            return snapshot
+
+    def to_prometheus(self, prefix='multipledb'):
+        """
+        Renders the aggregated metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = [f"# TYPE {prefix}_operation_duration_seconds histogram"]
+        counters = {'errors': [], 'rows': [], 'bytes': []}
+        for (db_type, operation, table), values in sorted(self.snapshot().items()):
+            labels = f'db_type="{db_type}",operation="{operation}",table="{_escape(table)}"'
+            for bound, cumulative in values['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_operation_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_operation_duration_seconds_sum{{{labels}}} {values["total_seconds"]}')
+            lines.append(f'{prefix}_operation_duration_seconds_count{{{labels}}} {values["calls"]}')
+            for name in counters:
+                counters[name].append(f'{prefix}_operation_{name}_total{{{labels}}} {values[name]}')
+        for name, samples in counters.items():
+            lines.append(f"# TYPE {prefix}_operation_{name}_total counter")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """
+    Records timings of database calls and forwards them to one or more sinks.
+
+    Attributes:
+        sinks (list of MetricsSink): Destinations of every observation.
+    """
+
+    def __init__(self, sinks=None):
+        """
+        Args:
+            sinks (list of MetricsSink, optional): Destinations. Defaults to a single InMemorySink.
+        """
+        self.sinks = list(sinks) if sinks is not None else [InMemorySink()]
+
+    def record(self, observation):
+        """
+        Forwards an Observation to every sink.
+        """
+        for sink in self.sinks:
+            sink.record(observation)
+
+    @contextmanager
+    def timer(self, db_type, operation, table=''):
+        """
+        Times a with block and records it, flagging it as an error if the block raises.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            operation (str): Operation name.
+            table (str): Collection or table name.
+
+        Yields:
+            Observation: Set its rows and bytes attributes inside the block to record them.
+        """
+        observation = Observation(db_type, operation, table)
+        started = time.perf_counter()
+        try:
+            yield observation
+        except BaseException:
+            observation.error = True
+            raise
+        finally:
+            observation.duration = time.perf_counter() - started
+            self.record(observation)
+
+
+def payload_size(value):
+    """
+    Estimates the number of bytes a value occupies on the wire, without serializing it.
+
+    Args:
+        value: A document, row, query or scalar.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(key)) + payload_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    return 8
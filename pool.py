@@ -0,0 +1,259 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from .exceptions import *
+
+class _PooledConnection:
+    """
+    Bookkeeping record for a connection owned by a ConnectionPool.
+
+    Attributes:
+        connection: The underlying driver connection object.
+        created_at (float): Monotonic timestamp of when the connection was opened.
+        last_used (float): Monotonic timestamp of when the connection was last returned to the pool.
+    """
+    __slots__ = ('connection', 'created_at', 'last_used')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+def _rollback(connection):
+    connection.rollback()
+
+
+class ConnectionPool:
+    """
+    A thread-safe, bounded pool of DB-API connections.
+
+    Connections are created through a user supplied factory, so the pool works with any driver
+    (mysql.connector, psycopg2, or a fake used in tests). Idle connections are validated before
+    they are handed out again and are recycled once they exceed their maximum lifetime.
+
+    Attributes:
+        factory (callable): Zero-argument callable returning a new connection.
+        min_size (int): Number of connections opened eagerly and kept around when idle.
+        max_size (int): Upper bound on the number of connections open at the same time.
+        timeout (float or None): Default number of seconds to wait for a free connection on checkout.
+        max_lifetime (float or None): Connections older than this many seconds are closed instead of reused.
+        validate (callable or None): Called with an idle connection before reuse; must return True if it is usable.
+        on_acquire (callable or None): Called after every checkout attempt with its duration in seconds and whether it failed.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=10, timeout=30.0, max_lifetime=None, validate=None, on_acquire=None,
+                 discard_on=None, reset=None):
+        """
+        Initializes the pool and opens the first min_size connections.
+
+        Args:
+            factory (callable): Zero-argument callable returning a new connection.
+            min_size (int): Number of connections opened eagerly.
+            max_size (int): Maximum number of connections open at the same time.
+            timeout (float, optional): Default checkout timeout in seconds. None waits forever.
+            max_lifetime (float, optional): Maximum age of a connection in seconds. None disables recycling.
+            validate (callable, optional): Health check run on idle connections before reuse.
+            on_acquire (callable, optional): Checkout observer, e.g. for latency metrics.
+            discard_on (callable, optional): Called with an error raised inside connection(); returns True if the
+                error means the connection is broken. Other errors roll the connection back and keep it.
+            reset (callable, optional): Ends the open transaction of a connection returned by connection(), so no
+                snapshot or lock outlives the with block. Defaults to calling its rollback().
+
+        Raises:
+            ValueError: If the size bounds are inconsistent.
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds: min_size={min_size}, max_size={max_size}")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.validate = validate
+        self.on_acquire = on_acquire
+        self.discard_on = discard_on
+        self.reset = reset if reset is not None else _rollback
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+
+        for _ in range(min_size):
+            self._idle.append(self._open())
+
+    @property
+    def size(self):
+        """int: Number of connections currently owned by the pool, idle or checked out."""
+        return self._size
+
+    @property
+    def available(self):
+        """int: Number of idle connections ready for checkout."""
+        return len(self._idle)
+
+    def _open(self):
+        record = _PooledConnection(self.factory())
+        self._size += 1
+        return record
+
+    def _expired(self, record, now):
+        return self.max_lifetime is not None and now - record.created_at >= self.max_lifetime
+
+    def _is_usable(self, record):
+        if self._expired(record, time.monotonic()):
+            return False
+        if self.validate is None:
+            return True
+        try:
+            return bool(self.validate(record.connection))
+        except Exception:
+            return False
+
+    def _discard(self, record):
+        # Called without the lock held, so a slow close() does not hold up other checkouts.
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        try:
+            record.connection.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout=None):
+        """
+        Checks a connection out of the pool, opening a new one if the pool has not reached max_size.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free connection. Defaults to the pool timeout.
+
+        Returns:
+            A driver connection that must be handed back with release().
+
+        Raises:
+            PoolTimeoutError: If no connection becomes available before the timeout expires.
+            DatabaseConnectionError: If the pool has been closed.
+        """
+        if self.on_acquire is None:
+            return self._acquire(timeout)
+        started = time.perf_counter()
+        try:
+            connection = self._acquire(timeout)
+        except Exception:
+            self.on_acquire(time.perf_counter() - started, True)
+            raise
+        self.on_acquire(time.perf_counter() - started, False)
+        return connection
+
+    def _acquire(self, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            record = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise DatabaseConnectionError("Connection pool is closed")
+                    if self._idle:
+                        record = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reserve the slot before releasing the lock so concurrent callers cannot overshoot max_size.
+                        self._size += 1
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise PoolTimeoutError(f"No connection available within {timeout} seconds (max_size={self.max_size})")
+                    self._condition.wait(remaining)
+            if record is None:
+                break
+            # The health check (a server ping for MySQL) runs without the lock, as it may take a round-trip.
+            if self._is_usable(record):
+                with self._condition:
+                    self._in_use[id(record.connection)] = record
+                return record.connection
+            self._discard(record)
+
+        try:
+            record = _PooledConnection(self.factory())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._in_use[id(record.connection)] = record
+        return record.connection
+
+    def release(self, connection, discard=False):
+        """
+        Returns a connection to the pool.
+
+        Args:
+            connection: A connection previously obtained from acquire().
+            discard (bool): Close the connection instead of keeping it, e.g. after a connection error.
+
+        Raises:
+            ValueError: If the connection was not checked out from this pool.
+        """
+        with self._condition:
+            record = self._in_use.pop(id(connection), None)
+            if record is None:
+                raise ValueError("Connection does not belong to this pool")
+            discard = discard or self._closed or self._expired(record, time.monotonic())
+            if not discard:
+                record.last_used = time.monotonic()
+                self._idle.append(record)
+                self._condition.notify()
+        if discard:
+            self._discard(record)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager that checks a connection out and always returns it to the pool.
+
+        The transaction the body left open is ended with reset (a rollback by default) before the connection is
+        reused, as reads never commit: an idle connection would otherwise keep its read snapshot and locks. Work the
+        body wants to keep must be committed inside it. If the body raises an error that discard_on says broke the
+        connection, or the reset fails, the connection is closed instead.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free connection. Defaults to the pool timeout.
+
+        Yields:
+            A driver connection.
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except BaseException as e:
+            broken = self.discard_on is not None and self.discard_on(e)
+            self.release(conn, discard=broken or not self._reset(conn))
+            raise
+        else:
+            self.release(conn, discard=not self._reset(conn))
+
+    def _reset(self, connection):
+        """
+        Ends the open transaction of a connection. Returns False if it should be discarded instead.
+        """
+        try:
+            self.reset(connection)
+        except Exception:
+            return False
+        return True
+
+    def close(self):
+        """
+        Closes every idle connection and marks the pool closed. Checked-out connections are closed when released.
+        """
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for record in idle:
+            self._discard(record)
@@ -0,0 +1,236 @@
+import re
+
+# Column and field names are interpolated into SQL, so they are restricted to plain (optionally dotted) identifiers.
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$')
+
+# SQL comparison operator for each supported Mongo-style filter operator.
+OPERATORS = {'$eq': '=', '$ne': '<>', '$gt': '>', '$gte': '>=', '$lt': '<', '$lte': '<=', '$in': 'IN'}
+
+ASCENDING = 1
+DESCENDING = -1
+
+def _check_identifier(name):
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid field name: {name!r}")
+    return name
+
+class Query:
+    """
+    A portable description of a read, compiled to SQL for MySQL and PostgreSQL or to find() arguments for MongoDB.
+
+    Filters use the MongoDB syntax: {'age': 30} matches equality and {'age': {'$gte': 18, '$lt': 65}} combines
+    operators, with $eq, $ne, $gt, $gte, $lt, $lte and $in supported. Projection, sort and limit are pushed down to
+    the database, so only the requested fields and rows cross the wire.
+
+    Keyset pagination: sort on a unique combination of fields, then pass the sort values of the last row of a page as
+    after (see next_page()) to fetch the rows that follow it. Unlike OFFSET this stays fast on deep pages.
+
+    Example:
+        query = Query({'status': 'active'}, projection=['id', 'name'], sort=[('id', ASCENDING)], limit=100)
+        page = ops.find_many('postgres', query, 'users')
+        next_page = ops.find_many('postgres', query.next_page(page[-1]), 'users')
+
+    Attributes:
+        filter (dict): Field conditions, all of which must hold.
+        projection (tuple of str or None): Fields or columns to return. None returns all of them.
+        sort (tuple of (str, int)): (field, ASCENDING or DESCENDING) pairs, most significant first.
+        limit (int or None): Maximum number of results.
+        after (dict or None): Sort values of the last row already seen, keyed by field.
+    """
+
+    def __init__(self, filter=None, projection=None, sort=None, limit=None, after=None):
+        """
+        Initializes the Query.
+
+        Args:
+            filter (dict, optional): Field conditions. Defaults to matching everything.
+            projection (list of str, optional): Fields or columns to return.
+            sort (str or list, optional): A field name, or a list of field names or (field, direction) pairs.
+            limit (int, optional): Maximum number of results.
+            after (dict, optional): Sort values of the last row already seen, keyed by sort field.
+
+        Raises:
+            ValueError: If a field name, operator, direction, limit or after is invalid.
+        """
+        self.filter = dict(filter or {})
+        for field, condition in self.filter.items():
+            _check_identifier(field)
+            if isinstance(condition, dict):
+                for operator in condition:
+                    if operator not in OPERATORS:
+                        raise ValueError(f"Unsupported operator {operator!r} on {field}")
+        self.projection = tuple(_check_identifier(field) for field in projection) if projection else None
+        if isinstance(sort, str):
+            sort = [sort]
+        self.sort = tuple((_check_identifier(item), ASCENDING) if isinstance(item, str) else
+                          (_check_identifier(item[0]), item[1]) for item in sort or ())
+        if any(direction not in (ASCENDING, DESCENDING) for _, direction in self.sort):
+            raise ValueError(f"Sort directions must be ASCENDING (1) or DESCENDING (-1): {self.sort}")
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        self.limit = limit
+        if after is not None and set(after) != {field for field, _ in self.sort}:
+            raise ValueError("after must give a value for exactly the sort fields")
+        self.after = dict(after) if after is not None else None
+
+    @classmethod
+    def coerce(cls, query, projection=None):
+        """
+        Returns query unchanged if it already is a Query, otherwise wraps a filter dict into one.
+        """
+        if isinstance(query, cls):
+            return query
+        return cls(query, projection=projection)
+
+    def with_limit(self, limit):
+        """
+        Returns a copy of this Query with a different limit.
+        """
+        return Query(self.filter, self.projection, self.sort, limit, self.after)
+
+    def next_page(self, last_row, columns=None):
+        """
+        Returns the Query for the page following the one that ended with last_row.
+
+        Args:
+            last_row (dict or tuple): The last document or row of the current page.
+            columns (list of str, optional): Column names of a tuple row. Defaults to the projection.
+
+        Returns:
+            Query: A copy of this Query whose after holds the sort values of last_row.
+
+        Raises:
+            ValueError: If the Query is not sorted, or the sort values cannot be read from last_row.
+        """
+        if not self.sort:
+            raise ValueError("Keyset pagination needs a sort order")
+        if not isinstance(last_row, dict):
+            columns = columns or self.projection
+            if columns is None:
+                raise ValueError("Column names are needed to paginate on tuple rows")
+            last_row = dict(zip(columns, last_row))
+        try:
+            after = {field: last_row[field] for field, _ in self.sort}
+        except KeyError as e:
+            raise ValueError(f"Sort field {e} is missing from the row; include it in the projection") from None
+        return Query(self.filter, self.projection, self.sort, self.limit, after)
+
+    def fields(self):
+        """
+        Returns every field the Query refers to: filtered, projected and sorted fields, in that order without repeats.
+        """
+        names = list(self.filter) + list(self.projection or ()) + [field for field, _ in self.sort]
+        return tuple(dict.fromkeys(names))
+
+    def _conditions(self):
+        # Flattens the filter into (field, operator, value) triples.
+        for field, condition in self.filter.items():
+            if isinstance(condition, dict):
+                for operator, value in condition.items():
+                    yield field, operator, value
+            else:
+                yield field, '$eq', condition
+
+    def to_sql(self, collection_table, quote=None):
+        """
+        Compiles the Query into a SELECT statement with %s placeholders.
+
+        Args:
+            collection_table (str): The table to select from.
+            quote (callable, optional): Quotes the table and field names, e.g. SchemaCache.quote for one database.
+                Defaults to leaving them unquoted.
+
+        Returns:
+            tuple: (sql, params)
+        """
+        if quote is not None:
+            return self._quoted(quote).to_sql(quote(collection_table))
+        params = []
+        clauses = []
+        for field, operator, value in self._conditions():
+            if operator == '$in':
+                values = list(value)
+                if not values:
+                    clauses.append("1=0")
+                    continue
+                clauses.append(f"{field} IN ({', '.join(['%s'] * len(values))})")
+                params.extend(values)
+            elif value is None and operator in ('$eq', '$ne'):
+                clauses.append(f"{field} IS {'NOT ' if operator == '$ne' else ''}NULL")
+            else:
+                clauses.append(f"{field}{OPERATORS[operator]}%s")
+                params.append(value)
+        if self.after is not None:
+            # (a, b) > (x, y) expanded as a>x OR (a=x AND b>y), which also supports mixed directions.
+            alternatives = []
+            for index, (field, direction) in enumerate(self.sort):
+                terms = [f"{previous}=%s" for previous, _ in self.sort[:index]]
+                terms.append(f"{field}{'>' if direction == ASCENDING else '<'}%s")
+                params.extend(self.after[previous] for previous, _ in self.sort[:index + 1])
+                alternatives.append(' AND '.join(terms))
+            clauses.append('(' + ' OR '.join(f'({alternative})' for alternative in alternatives) + ')')
+
+        sql = f"SELECT {', '.join(self.projection) if self.projection else '*'} FROM {collection_table}"
+        if clauses:
+            sql += " WHERE " + ' AND '.join(clauses)
+        if self.sort:
+            sql += " ORDER BY " + ', '.join(f"{field} {'ASC' if direction == ASCENDING else 'DESC'}"
+                                            for field, direction in self.sort)
+        if self.limit is not None:
+            sql += f" LIMIT {int(self.limit)}"
+        return sql, tuple(params)
+
+    def _quoted(self, quote):
+        # A copy whose names are already quoted, built without __init__ since quoted names are not plain identifiers.
+        query = Query.__new__(Query)
+        query.filter = {quote(field): condition for field, condition in self.filter.items()}
+        query.projection = tuple(map(quote, self.projection)) if self.projection else None
+        query.sort = tuple((quote(field), direction) for field, direction in self.sort)
+        query.limit = self.limit
+        query.after = {quote(field): value for field, value in self.after.items()} if self.after is not None else None
+        return query
+
+    def mongo_filter(self):
+        """
+        Returns the MongoDB filter document, including the keyset condition when after is set.
+        """
+        if self.after is None:
+            return dict(self.filter)
+        alternatives = []
+        for index, (field, direction) in enumerate(self.sort):
+            alternative = {previous: self.after[previous] for previous, _ in self.sort[:index]}
+            alternative[field] = {'$gt' if direction == ASCENDING else '$lt': self.after[field]}
+            alternatives.append(alternative)
+        keyset = alternatives[0] if len(alternatives) == 1 else {'$or': alternatives}
+        return {'$and': [self.filter, keyset]} if self.filter else keyset
+
+    def mongo_projection(self):
+        """
+        Returns the MongoDB projection document, or None for whole documents. _id is only returned when projected.
+        """
+        if self.projection is None:
+            return None
+        projection = {field: 1 for field in self.projection}
+        projection.setdefault('_id', 0)
+        return projection
+
+    def mongo_options(self):
+        """
+        Returns the sort and limit keyword arguments for pymongo's find().
+        """
+        options = {}
+        if self.sort:
+            options['sort'] = list(self.sort)
+        if self.limit is not None:
+            options['limit'] = self.limit
+        return options
+
+    def __eq__(self, other):
+        return isinstance(other, Query) and repr(self) == repr(other)
+
+    def __hash__(self):
+        return hash(repr(self))
+
+    def __repr__(self):
+        return (f"Query(filter={self.filter!r}, projection={self.projection!r}, sort={self.sort!r}, "
+                f"limit={self.limit!r}, after={self.after!r})")
@@ -0,0 +1,114 @@
+import threading
+import time
+from itertools import count
+
+# Latency in seconds charged to a replica that failed, so least-latency routing steers away from it for a while.
+FAILURE_PENALTY = 1.0
+
+class ReplicaRouter:
+    """
+    Chooses the read replica that serves the next read of one database.
+
+    Strategies:
+        round_robin    Cycles through the replicas in order.
+        least_latency  Picks the replica with the lowest exponentially weighted moving average (EWMA) of the time
+                       taken to obtain a connection from it. Replicas without samples are tried first.
+
+    With either strategy a failed replica is skipped, except for one probe read every probe_interval seconds; the
+    first success returns it to the rotation. least_latency also charges it FAILURE_PENALTY until then, which that
+    success replaces with the measured latency. When every replica has failed and none is due a probe, the primary
+    serves the read.
+
+    Attributes:
+        replicas (list of DatabaseClient): One client per replica.
+        strategy (str): 'round_robin' or 'least_latency'.
+        alpha (float): Weight of the newest sample in the moving average, between 0 and 1.
+        probe_interval (float): Seconds between probe reads sent to a failed replica.
+    """
+
+    STRATEGIES = ('round_robin', 'least_latency')
+
+    def __init__(self, replicas, strategy='round_robin', alpha=0.2, probe_interval=5.0, clock=time.monotonic):
+        """
+        Initializes the ReplicaRouter.
+
+        Args:
+            replicas (list of DatabaseClient): One client per replica; must not be empty.
+            strategy (str): 'round_robin' or 'least_latency'.
+            alpha (float): Weight of the newest latency sample.
+            probe_interval (float): Seconds between probe reads sent to a failed replica.
+            clock (callable): Monotonic clock, replaceable in tests.
+
+        Raises:
+            ValueError: If there are no replicas or the strategy is unknown.
+        """
+        if not replicas:
+            raise ValueError("ReplicaRouter needs at least one replica")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica routing strategy: {strategy}")
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.alpha = alpha
+        self.probe_interval = probe_interval
+        self.clock = clock
+        self._turns = count()
+        self._latencies = [None] * len(self.replicas)
+        # Time of the last failure or probe of each failed replica, None while it is healthy.
+        self._failed_at = [None] * len(self.replicas)
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """
+        Returns the index of the replica that should serve the next read.
+
+        Returns:
+            int or None: The replica index, or None if every replica has failed and none is due a probe.
+        """
+        with self._lock:
+            if self.strategy == 'least_latency':
+                untried = [index for index, latency in enumerate(self._latencies) if latency is None]
+                if untried:
+                    return untried[0]
+            now = self.clock()
+            for index, failed_at in enumerate(self._failed_at):
+                if failed_at is not None and now - failed_at >= self.probe_interval:
+                    # Only this read probes the replica; the others keep avoiding it until the probe reports back.
+                    self._failed_at[index] = now
+                    return index
+            healthy = [index for index, failed_at in enumerate(self._failed_at) if failed_at is None]
+            if not healthy:
+                return None
+            if self.strategy == 'round_robin':
+                return healthy[next(self._turns) % len(healthy)]
+            return min(healthy, key=self._latencies.__getitem__)
+
+    def record(self, index, duration):
+        """
+        Adds a latency sample, in seconds, for a replica. The first sample after a failure replaces the penalty.
+        """
+        with self._lock:
+            previous = None if self._failed_at[index] is not None else self._latencies[index]
+            self._failed_at[index] = None
+            self._latencies[index] = duration if previous is None else self.alpha * duration + (1 - self.alpha) * previous
+
+    def record_failure(self, index):
+        """
+        Charges a failed read or connection attempt to a replica.
+        """
+        with self._lock:
+            self._latencies[index] = max(FAILURE_PENALTY, 2 * (self._latencies[index] or 0))
+            self._failed_at[index] = self.clock()
+
+    def latencies(self):
+        """
+        Returns the current moving average latency of each replica, or None for replicas without samples.
+        """
+        with self._lock:
+            return list(self._latencies)
+
+    def close(self):
+        """
+        Closes the connections of every replica.
+        """
+        for replica in self.replicas:
+            replica.close()
@@ -0,0 +1,242 @@
+import random
+import threading
+import time
+import mysql.connector
+import psycopg2
+from pymongo.errors import ConnectionFailure
+from .exceptions import *
+
+# MySQL client errors for a server that cannot be reached or a connection that was lost: can't connect (2002, 2003),
+# server has gone away (2006) and lost connection (2013, 2055).
+_MYSQL_DISCONNECTS = frozenset((2002, 2003, 2006, 2013, 2055))
+
+# SQLSTATEs of a failed transaction that succeeds when run again: serialization failure and deadlock.
+_RETRYABLE_SQLSTATES = frozenset(('40001', '40P01'))
+
+# PostgreSQL SQLSTATEs of a server shutting down or not yet accepting connections.
+_POSTGRES_SHUTDOWNS = frozenset(('57P01', '57P02', '57P03'))
+
+def is_disconnect(error):
+    """
+    Tells whether an error means the connection was lost or the server could not be reached, so the connection it
+    was raised on must not be used again.
+
+    Errors are classified by their driver error code or SQLSTATE (connection exceptions are class 08) rather than
+    by exception class, since both drivers raise the same classes for errors such as a cancelled statement.
+
+    Args:
+        error (BaseException): The error raised by a database call.
+
+    Returns:
+        bool: True if the connection is broken.
+    """
+    if isinstance(error, (PoolTimeoutError, CircuitOpenError)):
+        return False
+    if isinstance(error, (DatabaseConnectionError, ConnectionFailure, ConnectionError)):
+        return True
+    if isinstance(error, psycopg2.Error):
+        if error.pgcode is None:
+            # libpq reports broken connections as the base classes, without a SQLSTATE from the server.
+            return type(error) in (psycopg2.OperationalError, psycopg2.InterfaceError)
+        return error.pgcode.startswith('08') or error.pgcode in _POSTGRES_SHUTDOWNS
+    if isinstance(error, mysql.connector.Error):
+        return error.errno in _MYSQL_DISCONNECTS or (error.sqlstate or '').startswith('08')
+    return False
+
+def is_transient(error):
+    """
+    Tells whether an error may not happen again when the call is repeated: the database could not be reached
+    (see is_disconnect()), or the transaction was chosen as a deadlock or serialization failure victim. Errors in
+    the request itself, such as a statement timeout or a syntax error, are not transient.
+
+    Pool timeouts and open circuits are not transient either: retrying them would only add load to a saturated or
+    failing database.
+
+    Args:
+        error (BaseException): The error raised by a database call.
+
+    Returns:
+        bool: True if the call may succeed when retried.
+    """
+    if is_disconnect(error):
+        return True
+    if isinstance(error, psycopg2.Error):
+        return error.pgcode in _RETRYABLE_SQLSTATES
+    if isinstance(error, mysql.connector.Error):
+        return error.errno == 1213 or error.sqlstate in _RETRYABLE_SQLSTATES
+    return False
+
+
+class RetryPolicy:
+    """
+    Retries calls that fail with transient errors, waiting an exponentially growing, jittered delay between attempts.
+
+    The delay before retry n (starting at 0) is drawn uniformly from [0, min(max_delay, base_delay * 2 ** n)]
+    ("full jitter"), which spreads the retries of many clients instead of having them hit a recovering server at once.
+
+    Attributes:
+        max_attempts (int): Total number of attempts, including the first one.
+        base_delay (float): Upper bound of the first delay in seconds.
+        max_delay (float): Upper bound of every delay in seconds.
+        jitter (bool): Randomize delays; when False the upper bound is used.
+        retry_on (callable): Called with an error, returns True if it should be retried.
+        sleep (callable): Function used to wait, replaceable in tests.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.05, max_delay=2.0, jitter=True, retry_on=is_transient, sleep=time.sleep):
+        """
+        Initializes the RetryPolicy.
+
+        Args:
+            max_attempts (int): Total number of attempts, including the first one.
+            base_delay (float): Upper bound of the first delay in seconds.
+            max_delay (float): Upper bound of every delay in seconds.
+            jitter (bool): Randomize delays.
+            retry_on (callable): Predicate selecting the errors to retry. Defaults to is_transient().
+            sleep (callable): Function used to wait between attempts.
+
+        Raises:
+            ValueError: If max_attempts is less than 1.
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.sleep = sleep
+
+    def delay(self, retry):
+        """
+        Returns the number of seconds to wait before the given retry (0 for the first retry).
+        """
+        bound = min(self.max_delay, self.base_delay * 2 ** retry)
+        return random.uniform(0, bound) if self.jitter else bound
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls func until it succeeds, raises a non-retryable error or runs out of attempts.
+
+        Returns:
+            The return value of func.
+
+        Raises:
+            The error of the last attempt.
+        """
+        for retry in range(self.max_attempts):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if retry + 1 >= self.max_attempts or not self.retry_on(e):
+                    raise
+            self.sleep(self.delay(retry))
+
+
+class CircuitBreaker:
+    """
+    Fails calls to a database fast while it is down, instead of letting every caller wait for a timeout.
+
+    The breaker is closed while calls succeed. After failure_threshold consecutive transient failures it opens and
+    rejects calls with CircuitOpenError. Once reset_timeout seconds have passed it lets a single trial call through
+    (half-open): success closes the breaker again, failure re-opens it for another reset_timeout.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open before a trial call is allowed.
+        state (str): 'closed', 'open' or 'half_open'.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, name='database', clock=time.monotonic):
+        """
+        Initializes the CircuitBreaker in the closed state.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds to stay open before allowing a trial call.
+            name (str): Name used in error messages, usually the database type.
+            clock (callable): Monotonic clock, replaceable in tests.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.clock = clock
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Admits or rejects a call.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a trial call already running.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - self.clock()
+                if remaining > 0:
+                    raise CircuitOpenError(f"{self.name} is unavailable; retrying in {remaining:.1f} seconds")
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._trial_running:
+                    raise CircuitOpenError(f"{self.name} is unavailable; a trial call is in progress")
+                self._trial_running = True
+
+    def record_success(self):
+        """
+        Records a call that reached the database, closing the breaker.
+        """
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        """
+        Records a transient failure, opening the breaker once the threshold is reached or a trial call failed.
+        """
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = self.clock()
+            self._trial_running = False
+
+    def record_interrupted(self):
+        """
+        Records a call interrupted (e.g. by KeyboardInterrupt) before learning anything about the database.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls func through the breaker. Only transient errors count as failures; other errors mean the database
+        answered and count as successes.
+
+        Returns:
+            The return value of func.
+
+        Raises:
+            CircuitOpenError: If the breaker rejects the call.
+        """
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_transient(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            self.record_interrupted()
+            raise
+        self.record_success()
+        return result
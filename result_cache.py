@@ -0,0 +1,224 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+class CacheBackend(ABC):
+    """
+    Interface for the storage behind a ResultCache.
+
+    Implementations only need to store opaque values under hashable keys and be able to drop every key belonging
+    to a (db_type, table) namespace, which is enough to back the cache with a shared store instead of process memory.
+    Subclasses that leave a method out cannot be instantiated.
+    """
+
+    @abstractmethod
+    def get(self, key, default=None):
+        """
+        Returns the value stored under key, or default if it is missing or expired.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key, value, namespace, ttl=None):
+        """
+        Stores value under key, tagged with namespace, for at most ttl seconds (None keeps it until evicted).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self, namespace):
+        """
+        Drops every key stored with the given namespace.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        """
+        Drops every key.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self):
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    A thread-safe in-process CacheBackend with per-entry TTL and LRU eviction.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept before the least recently used one is evicted.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Initializes an empty backend.
+
+        Args:
+            maxsize (int): Maximum number of cached entries.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._namespaces = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        _, namespace, _ = self._entries.pop(key)
+        keys = self._namespaces[namespace]
+        keys.discard(key)
+        if not keys:
+            del self._namespaces[namespace]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                return default
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, namespace, ttl=None):
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, namespace, value)
+            self._namespaces.setdefault(namespace, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, namespace):
+        with self._lock:
+            for key in list(self._namespaces.get(namespace, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_MISSING = object()
+
+class ResultCache:
+    """
+    A read-through cache for find() results, invalidated by writes to the same table.
+
+    Entries are keyed by (db_type, table, normalized query). Every write to a table bumps a per-table generation
+    counter, and results read before a write are not stored afterwards, so a slow read cannot reinsert stale data
+    once the write has invalidated the table. Cached results are shared between callers and must not be mutated.
+
+    Attributes:
+        backend (CacheBackend): Storage for the cached results.
+        ttl (float or None): Seconds a result stays cached. None keeps it until it is evicted or invalidated.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to query the database.
+        invalidations (int): Number of table invalidations caused by writes.
+    """
+
+    def __init__(self, backend=None, ttl=60.0, maxsize=1024):
+        """
+        Initializes the cache.
+
+        Args:
+            backend (CacheBackend, optional): Storage to use. Defaults to an InMemoryCacheBackend of maxsize entries.
+            ttl (float, optional): Seconds a result stays cached.
+            maxsize (int): Size of the default in-memory backend.
+        """
+        self.backend = backend if backend is not None else InMemoryCacheBackend(maxsize)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(db_type, collection_table, query):
+        """
+        Builds the cache key for a query, independent of the order of its keys.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The collection or table queried.
+            query (dict): The query.
+
+        Returns:
+            tuple: The cache key.
+        """
+        return (db_type, collection_table, json.dumps(query, sort_keys=True, default=repr))
+
+    def lookup(self, db_type, collection_table, query):
+        """
+        Looks a query up in the cache.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The collection or table queried.
+            query (dict): The query.
+
+        Returns:
+            tuple: (hit, value, generation). Pass generation to store() once the database has been queried on a miss.
+        """
+        namespace = (db_type, collection_table)
+        generation = self._generations.get(namespace, 0)
+        value = self.backend.get(self.key(db_type, collection_table, query), _MISSING)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return False, None, generation
+            self.hits += 1
+        return True, value, generation
+
+    def store(self, db_type, collection_table, query, value, generation):
+        """
+        Caches a result unless the table has been written to since the lookup that returned generation.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The collection or table queried.
+            query (dict): The query.
+            value: The result returned by the database.
+            generation (int): The generation returned by lookup().
+        """
+        namespace = (db_type, collection_table)
+        key = self.key(db_type, collection_table, query)
+        with self._lock:
+            if self._generations.get(namespace, 0) == generation:
+                self.backend.set(key, value, namespace, self.ttl)
+
+    def invalidate(self, db_type, collection_table):
+        """
+        Drops every cached result for a table. Called after each write to it.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The collection or table written to.
+        """
+        namespace = (db_type, collection_table)
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self.invalidations += 1
+            self.backend.invalidate(namespace)
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Returns:
+            dict: The keys 'size', 'hits', 'misses', 'hit_rate' and 'invalidations'.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'size': len(self.backend), 'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': self.hits / lookups if lookups else 0.0, 'invalidations': self.invalidations}
@@ -0,0 +1,221 @@
+import threading
+import time
+from .exceptions import *
+from .query import _IDENTIFIER
+
+# Columns of a table in definition order. A schema-qualified name ('sales.orders') is looked up in that schema,
+# anything else in the connection's current database (MySQL) or schema (PostgreSQL).
+_COLUMNS_SQL = {
+    'mysql': "SELECT column_name FROM information_schema.columns "
+             "WHERE table_schema = COALESCE(%s, DATABASE()) AND table_name = %s ORDER BY ordinal_position",
+    'postgres': "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = COALESCE(%s, current_schema()) AND table_name = %s ORDER BY ordinal_position",
+}
+
+# Identifier quote character of each SQL dialect.
+_QUOTES = {'mysql': '`', 'postgres': '"'}
+
+def _fold(db_type, name):
+    # PostgreSQL folds unquoted identifiers to lower case, so 'Users' names the table users. Names are folded before
+    # they are looked up or quoted, keeping the meaning they had unquoted.
+    return name.lower() if db_type == 'postgres' and isinstance(name, str) else name
+
+class TableSchema:
+    """
+    The cached columns of one table or collection.
+
+    Attributes:
+        columns (tuple of str): Column names in table order (first-seen order for sampled MongoDB fields).
+        positions (dict): Position of each column in columns.
+        loaded_at (float): Clock time the columns were read at.
+    """
+    __slots__ = ('columns', 'positions', 'loaded_at', '_orderings')
+
+    def __init__(self, columns, loaded_at):
+        self.columns = tuple(columns)
+        self.positions = {column: index for index, column in enumerate(self.columns)}
+        self.loaded_at = loaded_at
+        self._orderings = {}
+
+
+class SchemaCache:
+    """
+    Caches table columns so SQL operations can validate and order their columns without asking the server.
+
+    Columns are read lazily from information_schema the first time a table is used and re-read once they are older
+    than ttl seconds, or after invalidate(). With the cache, a misspelled table or column fails locally with
+    SchemaValidationError instead of after a round-trip, every identifier is quoted, and the columns of each statement
+    are put in table order, so dicts with the same keys in a different order share one cached statement.
+
+    MongoDB collections have no fixed schema: their fields are sampled from up to sample_size documents for
+    columns(), and only the syntax of MongoDB names is validated.
+
+    Attributes:
+        db_client (DatabaseClient): Client whose connections the metadata is read through.
+        ttl (float or None): Seconds before cached columns are re-read; None keeps them until invalidate().
+        sample_size (int): Number of MongoDB documents sampled per collection.
+        loads (int): Number of times metadata was read from a database.
+    """
+
+    def __init__(self, db_client, ttl=300.0, sample_size=100, clock=time.monotonic):
+        """
+        Initializes an empty SchemaCache.
+
+        Args:
+            db_client (DatabaseClient): Client whose connections the metadata is read through.
+            ttl (float, optional): Seconds before cached columns are re-read. None never expires them.
+            sample_size (int): Number of MongoDB documents sampled per collection.
+            clock (callable): Monotonic clock, replaceable in tests.
+        """
+        self.db_client = db_client
+        self.ttl = ttl
+        self.sample_size = sample_size
+        self.clock = clock
+        self.loads = 0
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def columns(self, db_type, collection_table, connection=None):
+        """
+        Returns the columns of a table, or the sampled fields of a collection.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The table or collection, optionally qualified by its schema.
+            connection (Connection, optional): SQL connection the caller already holds, e.g. that of an open
+                transaction. Missing columns are read through it instead of borrowing a second connection.
+
+        Returns:
+            tuple of str: The column names in table order.
+
+        Raises:
+            SchemaValidationError: If the name is invalid, or the SQL table does not exist.
+        """
+        return self._schema(db_type, collection_table, connection).columns
+
+    def validate(self, db_type, collection_table, columns, connection=None):
+        """
+        Checks that a table exists and has every given column.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The table or collection.
+            columns (iterable of str): Column or field names used by an operation.
+            connection (Connection, optional): SQL connection the caller already holds, see columns().
+
+        Raises:
+            SchemaValidationError: If a name is invalid, the table does not exist or a column is not part of it.
+        """
+        self.order(db_type, collection_table, columns, connection)
+
+    def order(self, db_type, collection_table, columns, connection=None):
+        """
+        Validates columns as validate() does and returns them in table order. MongoDB fields keep their order.
+
+        The ordering of each set of columns is computed once per table and reused until the columns are re-read.
+
+        Returns:
+            tuple of str: The columns in table order.
+
+        Raises:
+            SchemaValidationError: As validate().
+        """
+        schema = self._schema(db_type, collection_table, connection)
+        columns = tuple(columns)
+        ordered = schema._orderings.get(columns)
+        if ordered is not None:
+            return ordered
+        if db_type == 'mongo':
+            for field in columns:
+                if not isinstance(field, str) or not field or field.startswith('$') or '\0' in field:
+                    raise SchemaValidationError(f"Invalid field name for {collection_table}: {field!r}")
+            ordered = columns
+        else:
+            unknown = [column for column in columns if _fold(db_type, column) not in schema.positions]
+            if unknown:
+                raise SchemaValidationError(f"Unknown columns for {collection_table}: {', '.join(map(str, unknown))}")
+            ordered = tuple(sorted(columns, key=lambda column: schema.positions[_fold(db_type, column)]))
+        schema._orderings[columns] = ordered
+        return ordered
+
+    def quote(self, db_type, name):
+        """
+        Quotes a table or column name for a SQL dialect; each part of a dotted name is quoted separately.
+        PostgreSQL names are folded to lower case first, as the server does with unquoted names.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres'). MongoDB names are returned unchanged.
+            name (str): The name to quote.
+
+        Returns:
+            str: The quoted name, e.g. `users` on MySQL and "users" on PostgreSQL.
+        """
+        quote = _QUOTES.get(db_type)
+        if quote is None:
+            return name
+        return '.'.join(quote + part.replace(quote, quote * 2) + quote for part in _fold(db_type, name).split('.'))
+
+    def invalidate(self, db_type=None, collection_table=None):
+        """
+        Forgets cached columns, so they are re-read on next use, e.g. after an ALTER TABLE.
+
+        Args:
+            db_type (str, optional): Only forget tables of this database.
+            collection_table (str, optional): Only forget this table.
+        """
+        collection_table = _fold(db_type, collection_table)
+        with self._lock:
+            for key in list(self._tables):
+                if db_type in (None, key[0]) and collection_table in (None, key[1]):
+                    del self._tables[key]
+
+    def _schema(self, db_type, collection_table, connection=None):
+        """
+        Returns the cached TableSchema of a table, reading its columns when missing or expired.
+        """
+        collection_table = _fold(db_type, collection_table)
+        key = (db_type, collection_table)
+        schema = self._tables.get(key)
+        if schema is not None and (self.ttl is None or self.clock() - schema.loaded_at < self.ttl):
+            return schema
+        if db_type == 'mongo':
+            if not isinstance(collection_table, str) or not collection_table or '$' in collection_table:
+                raise SchemaValidationError(f"Invalid collection name: {collection_table!r}")
+        elif db_type in _QUOTES:
+            if not isinstance(collection_table, str) or not _IDENTIFIER.match(collection_table):
+                raise SchemaValidationError(f"Invalid table name: {collection_table!r}")
+        else:
+            raise SchemaValidationError(f"Unsupported database type: {db_type}")
+        columns = self._load(db_type, collection_table, connection)
+        if not columns and db_type != 'mongo':
+            # Not cached, so a table created later is found without waiting for the ttl.
+            raise SchemaValidationError(f"Unknown table: {collection_table}")
+        schema = TableSchema(columns, self.clock())
+        with self._lock:
+            self._tables[key] = schema
+            self.loads += 1
+        return schema
+
+    def _load(self, db_type, collection_table, connection=None):
+        """
+        Reads the columns of a table from information_schema, or samples the fields of a collection.
+        """
+        if db_type == 'mongo':
+            collection = self.db_client.get_mongo_client()['your_database'][collection_table]
+            fields = {}
+            for document in collection.find({}, limit=self.sample_size):
+                fields.update(dict.fromkeys(document))
+            return tuple(fields)
+        schema, _, table = collection_table.rpartition('.')
+        if connection is not None:
+            return self._read_columns(connection, db_type, schema, table)
+        with self.db_client.connection(db_type) as connection:
+            return self._read_columns(connection, db_type, schema, table)
+
+    def _read_columns(self, connection, db_type, schema, table):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(_COLUMNS_SQL[db_type], (schema or None, table))
+            return tuple(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.close()
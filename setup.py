@@ -14,7 +14,10 @@ setup(
         'twine>=3.4.1',
         'pydantic>=2.7.1'
     ],
-    python_requires='>=3.6',
+    extras_require={
+        'columnar': ['numpy', 'pyarrow>=14']
+    },
+    python_requires='>=3.7',
     author='Shriharran',
     author_email='shriharran.radhakrishnan@digit7.ai',
     description='Unified database client for MongoDB, MySQL, and PostgreSQL'
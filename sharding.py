@@ -0,0 +1,370 @@
+import hashlib
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from .exceptions import *
+from .fanout import FanOutExecutor
+from .query import DESCENDING, Query
+
+def _hash(value):
+    # A stable hash (unlike hash()), so every process maps a key to the same shard.
+    return int.from_bytes(hashlib.md5(str(value).encode()).digest()[:8], 'big')
+
+class HashRing:
+    """
+    Consistent-hash ring mapping shard keys to shard names.
+
+    Each shard is placed on the ring at vnodes pseudo-random points and a key belongs to the first point at or after
+    its own hash. Adding or removing a shard therefore only moves the keys between its points and their neighbours,
+    about 1/N of the keyspace, instead of rehashing everything.
+
+    Attributes:
+        vnodes (int): Number of points per shard; more points spread the keys more evenly.
+    """
+
+    def __init__(self, shards=(), vnodes=100):
+        """
+        Initializes the HashRing.
+
+        Args:
+            shards (iterable of str): Initial shard names.
+            vnodes (int): Number of points per shard.
+        """
+        self.vnodes = vnodes
+        self._points = []
+        self._owners = {}
+        for shard in shards:
+            self.add(shard)
+
+    @property
+    def shards(self):
+        """set of str: Names of the shards on the ring."""
+        return set(self._owners.values())
+
+    def add(self, shard):
+        """
+        Adds a shard to the ring.
+        """
+        for replica in range(self.vnodes):
+            point = _hash(f"{shard}#{replica}")
+            if point not in self._owners:
+                self._owners[point] = shard
+                self._points.insert(bisect_left(self._points, point), point)
+
+    def remove(self, shard):
+        """
+        Removes a shard from the ring; its keys move to the following shards.
+        """
+        self._points = [point for point in self._points if self._owners[point] != shard]
+        self._owners = {point: self._owners[point] for point in self._points}
+
+    def get(self, key):
+        """
+        Returns the name of the shard owning a key.
+
+        Raises:
+            ValueError: If the ring is empty.
+        """
+        if not self._points:
+            raise ValueError("The hash ring has no shards")
+        index = bisect_left(self._points, _hash(key))
+        return self._owners[self._points[index % len(self._points)]]
+
+
+class RangeRouter:
+    """
+    Maps shard keys to shards by ranges of key values, keeping neighbouring keys on the same shard.
+
+    Example:
+        RangeRouter([(1000000, 'users_a'), (2000000, 'users_b'), (None, 'users_c')])
+        sends keys below 1000000 to users_a, keys below 2000000 to users_b and every other key to users_c.
+
+    Attributes:
+        bounds (list): Exclusive upper bounds of the ranges, in increasing order.
+        shards (list of str): Shard of each range; the shard after the last bound takes the remaining keys.
+    """
+
+    def __init__(self, ranges):
+        """
+        Initializes the RangeRouter.
+
+        Args:
+            ranges (list of tuple): (upper_bound, shard) pairs in increasing order. The last upper_bound may be None
+                to make that shard take every remaining key.
+
+        Raises:
+            ValueError: If the bounds are not increasing, or a bound other than the last is None.
+        """
+        self.bounds = [bound for bound, _ in ranges if bound is not None]
+        self.shards = [shard for _, shard in ranges]
+        if any(bound is None for bound, _ in ranges[:-1]) or self.bounds != sorted(self.bounds):
+            raise ValueError("Range bounds must be increasing, and only the last one may be None")
+
+    def get(self, key):
+        """
+        Returns the name of the shard owning a key.
+
+        Raises:
+            ValueError: If the key is above the last bound.
+        """
+        index = bisect_right(self.bounds, key)
+        if index >= len(self.shards):
+            raise ValueError(f"Shard key {key!r} is outside every range")
+        return self.shards[index]
+
+
+class ShardedDatabaseOperations:
+    """
+    Spreads the rows of large tables over several database instances by a shard key.
+
+    Operations whose data or query gives the shard key by equality run on the owning shard only. Reads without it are
+    scattered to every shard in parallel and gathered, with find() and find_many() merging the results by the Query
+    sort order and limit. update_many() and delete_many() without it run on every shard, while single-document writes
+    need it, as each shard would otherwise write one document of its own.
+
+    Attributes:
+        shards (dict): DatabaseOperations per shard name, each over its own DatabaseClient.
+        shard_key (str or callable): Field holding the shard key, or a function returning the key of a document or
+            query (or None if it has none).
+        router: Object whose get(key) returns a shard name, e.g. HashRing or RangeRouter.
+        executor (FanOutExecutor): Runs scatter-gather calls concurrently.
+    """
+
+    def __init__(self, shards, shard_key, router=None, max_workers=None, timeout=None):
+        """
+        Initializes the ShardedDatabaseOperations.
+
+        Args:
+            shards (dict): DatabaseOperations keyed by shard name.
+            shard_key (str or callable): Shard key field, or a function extracting the key from a document or query.
+            router (HashRing, RangeRouter or callable, optional): Maps keys to shard names. A callable is called with
+                the key. Defaults to a HashRing over the shard names.
+            max_workers (int, optional): Threads used for scatter-gather. Defaults to one per shard.
+            timeout (float, optional): Seconds each shard may take during scatter-gather.
+        """
+        self.shards = dict(shards)
+        self.shard_key = shard_key
+        self.router = router if router is not None else HashRing(self.shards)
+        self.executor = FanOutExecutor(None, max_workers=max_workers or len(self.shards), timeout=timeout)
+
+    def _key(self, values):
+        """
+        Returns the shard key given by equality in a document or query, or None.
+        """
+        if isinstance(values, Query):
+            values = values.filter
+        if callable(self.shard_key):
+            return self.shard_key(values)
+        key = values.get(self.shard_key)
+        if isinstance(key, dict):
+            return key.get('$eq') if set(key) == {'$eq'} else None
+        return key
+
+    def shard_for(self, key):
+        """
+        Returns the name of the shard owning a shard key.
+        """
+        return self.router(key) if callable(self.router) else self.router.get(key)
+
+    def _owner(self, values):
+        key = self._key(values)
+        return None if key is None else self.shards[self.shard_for(key)]
+
+    def _scatter(self, method, *args):
+        """
+        Runs a DatabaseOperations method on every shard concurrently.
+
+        Returns:
+            dict: Results keyed by shard name.
+
+        Raises:
+            The error of the first shard that failed, since a partial answer would be silently wrong.
+        """
+        outcome = self.executor.run_many({name: (lambda ops=ops: getattr(ops, method)(*args))
+                                          for name, ops in self.shards.items()})
+        if outcome.errors:
+            raise next(iter(outcome.errors.values()))
+        return outcome.results
+
+    def insert(self, db_type, data, collection_table):
+        """
+        Inserts a document or row into the shard owning its shard key.
+
+        Raises:
+            InsertionError: If data has no shard key.
+        """
+        owner = self._owner(data)
+        if owner is None:
+            raise InsertionError(f"Cannot insert into sharded {collection_table} without a shard key")
+        return owner.insert(db_type, data, collection_table)
+
+    def insert_many(self, db_type, rows, collection_table, batch_size=1000):
+        """
+        Groups rows by shard and inserts each group in batches, all shards in parallel.
+
+        Returns:
+            dict: The insert_many() batch reports of each shard, keyed by shard name.
+
+        Raises:
+            InsertionError: If a row has no shard key.
+        """
+        groups = {}
+        for row in rows:
+            key = self._key(row)
+            if key is None:
+                raise InsertionError(f"Cannot insert into sharded {collection_table} without a shard key")
+            groups.setdefault(self.shard_for(key), []).append(row)
+        outcome = self.executor.run_many({
+            name: (lambda name=name, group=group: self.shards[name].insert_many(db_type, group, collection_table, batch_size))
+            for name, group in groups.items()})
+        if outcome.errors:
+            raise next(iter(outcome.errors.values()))
+        return outcome.results
+
+    def find(self, db_type, query, collection_table):
+        """
+        Finds a document or row, on its shard if the query gives the shard key and on every shard otherwise.
+
+        The matches of the shards are merged by the Query sort order, as in find_many(); with a plain dict query the
+        match of the first shard that has one is returned.
+
+        Returns:
+            The first match, or None.
+
+        Raises:
+            ValueError: If a sorted Query on a SQL database does not project its sort columns.
+        """
+        owner = self._owner(query)
+        if owner is not None:
+            return owner.find(db_type, query, collection_table)
+        merged = self._merge_query(db_type, query)
+        results = self._scatter('find', db_type, query, collection_table)
+        matches = [results[name] for name in self.shards if results.get(name) is not None]
+        if merged is not None:
+            matches = _merge([matches], merged.with_limit(1))
+        return matches[0] if matches else None
+
+    def find_many(self, db_type, query, collection_table):
+        """
+        Finds every match, merging the results of all shards when the query does not give the shard key.
+
+        The merged rows follow the Query sort order, with None before any other value, and are cut to its limit.
+        Plain dict queries, which may be native MongoDB filters, are neither sorted nor limited: the results of the
+        shards are concatenated.
+
+        Returns:
+            list: The matching documents or rows.
+
+        Raises:
+            ValueError: If a sorted Query on a SQL database does not project its sort columns, which the tuple rows
+                of different shards could not be merged on.
+        """
+        owner = self._owner(query)
+        if owner is not None:
+            return owner.find_many(db_type, query, collection_table)
+        merged = self._merge_query(db_type, query)
+        results = self._scatter('find_many', db_type, query, collection_table)
+        return _merge([results[name] for name in self.shards], merged)
+
+    @staticmethod
+    def _merge_query(db_type, query):
+        """
+        Returns the Query the rows of several shards are merged by, or None for a plain dict query.
+
+        Raises:
+            ValueError: If a sorted Query on a SQL database does not project its sort columns, which the tuple rows
+                of different shards could not be merged on.
+        """
+        if not isinstance(query, Query):
+            return None
+        if db_type != 'mongo' and query.sort and (
+                query.projection is None or any(field not in query.projection for field, _ in query.sort)):
+            raise ValueError("Merging sorted rows from several shards needs the sort columns in the projection")
+        return query
+
+    def update(self, db_type, query, new_values, collection_table):
+        """
+        Updates a matching document or row on the shard owning the query's shard key.
+
+        Raises:
+            UpdateError: If the query has no shard key, since every shard would update a document of its own.
+        """
+        owner = self._owner(query)
+        if owner is None:
+            raise UpdateError(f"Cannot update sharded {collection_table} without a shard key; use update_many()")
+        return owner.update(db_type, query, new_values, collection_table)
+
+    def update_many(self, db_type, query, new_values, collection_table):
+        """
+        Updates every match on the owning shard, or on every shard without a shard key.
+
+        Returns:
+            The shard's result, or a dict of results keyed by shard name after a scatter.
+        """
+        return self._write('update_many', db_type, query, collection_table, new_values)
+
+    def delete(self, db_type, query, collection_table):
+        """
+        Deletes a matching document or row on the shard owning the query's shard key.
+
+        Raises:
+            DeletionError: If the query has no shard key, since every shard would delete a document of its own.
+        """
+        owner = self._owner(query)
+        if owner is None:
+            raise DeletionError(f"Cannot delete from sharded {collection_table} without a shard key; use delete_many()")
+        return owner.delete(db_type, query, collection_table)
+
+    def delete_many(self, db_type, query, collection_table):
+        """
+        Deletes every match on the owning shard, or on every shard without a shard key.
+        """
+        return self._write('delete_many', db_type, query, collection_table)
+
+    def upsert(self, db_type, query, new_values, collection_table):
+        """
+        Upserts on the shard owning the query's shard key.
+
+        Raises:
+            UpdateError: If the query has no shard key, since the shard of a new row would be unknown.
+        """
+        owner = self._owner(query)
+        if owner is None:
+            raise UpdateError(f"Cannot upsert into sharded {collection_table} without a shard key")
+        return owner.upsert(db_type, query, new_values, collection_table)
+
+    def _write(self, method, db_type, query, collection_table, *values):
+        owner = self._owner(query)
+        args = (db_type, query) + values + (collection_table,)
+        if owner is not None:
+            return getattr(owner, method)(*args)
+        return self._scatter(method, *args)
+
+    def close(self):
+        """
+        Shuts the scatter-gather thread pool down. The shards' clients are left to their owners.
+        """
+        self.executor.close()
+
+
+def _merge(results, query):
+    rows = list(chain.from_iterable(results))
+    if query is None:
+        return rows
+    if query.sort and rows:
+        if isinstance(rows[0], dict):
+            def value(field):
+                return lambda row: _none_first(row.get(field))
+        else:
+            def value(field):
+                index = query.projection.index(field)
+                return lambda row: _none_first(row[index])
+        # Stable sorts from the least to the most significant field handle mixed directions.
+        for field, direction in reversed(query.sort):
+            rows.sort(key=value(field), reverse=direction == DESCENDING)
+    if query.limit is not None:
+        rows = rows[:query.limit]
+    return rows
+
+def _none_first(value):
+    # Sort key putting missing and None values before all others, as MongoDB does, instead of failing to compare.
+    return (value is not None, value)
@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+from itertools import count
+
+# Prepared statement names must be unique per server session; a process-wide counter keeps them distinct.
+_statement_ids = count()
+
+class Statement:
+    """
+    A generated SQL statement together with its server-side prepared form.
+
+    The same Statement object is returned for every call with the same shape, so drivers that detect repeated
+    statements by identity (such as MySQL prepared cursors) skip re-preparing it.
+
+    Attributes:
+        sql (str): The statement with %s placeholders, ready for cursor.execute().
+        name (str or None): Name of the PostgreSQL prepared statement, if one is used.
+        prepare_sql (str or None): PREPARE command creating the prepared statement on a PostgreSQL session.
+        execute_sql (str or None): EXECUTE command running the prepared statement with %s placeholders.
+    """
+    __slots__ = ('sql', 'name', 'prepare_sql', 'execute_sql')
+
+    def __init__(self, sql, name=None, prepare_sql=None, execute_sql=None):
+        self.sql = sql
+        self.name = name
+        self.prepare_sql = prepare_sql
+        self.execute_sql = execute_sql
+
+    @classmethod
+    def for_postgres(cls, sql, numbered_sql, param_count):
+        """
+        Builds a Statement that can also run as a PostgreSQL prepared statement.
+
+        Args:
+            sql (str): The statement with %s placeholders.
+            numbered_sql (str): The same statement with $1, $2, ... placeholders, as PREPARE requires.
+            param_count (int): Number of parameters the statement takes.
+
+        Returns:
+            Statement: The statement with name, prepare_sql and execute_sql filled in.
+        """
+        name = f"multipledb_stmt_{next(_statement_ids)}"
+        execute_sql = f"EXECUTE {name}"
+        if param_count:
+            execute_sql += f" ({', '.join(['%s'] * param_count)})"
+        return cls(sql, name, f"PREPARE {name} AS {numbered_sql}", execute_sql)
+
+
+class StatementCache:
+    """
+    A thread-safe LRU cache of generated statements keyed by (db_type, operation, table, columns).
+
+    Attributes:
+        maxsize (int): Maximum number of statements kept before the least recently used one is evicted.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to build a new statement.
+        evictions (int): Number of statements dropped to stay within maxsize.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of cached statements.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._statements = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """
+        Returns the cached statement for key, building and caching it on a miss.
+
+        Args:
+            key (tuple): Hashable description of the statement shape.
+            build (callable): Zero-argument callable returning the statement when it is not cached.
+
+        Returns:
+            The cached or newly built statement.
+        """
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is not None:
+                self._statements.move_to_end(key)
+                self.hits += 1
+                return statement
+            self.misses += 1
+        statement = build()
+        with self._lock:
+            # Another thread may have built the same statement meanwhile; keep the first so identities stay stable.
+            statement = self._statements.setdefault(key, statement)
+            self._statements.move_to_end(key)
+            while len(self._statements) > self.maxsize:
+                self._statements.popitem(last=False)
+                self.evictions += 1
+        return statement
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The keys 'size', 'maxsize', 'hits', 'misses' and 'evictions'.
+        """
+        with self._lock:
+            return {'size': len(self._statements), 'maxsize': self.maxsize, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+    def clear(self):
+        """
+        Drops every cached statement. The counters are left untouched.
+        """
+        with self._lock:
+            self._statements.clear()
+
+
+class PreparedRegistry:
+    """
+    Remembers which PostgreSQL connections already hold which prepared statements, in the order they were prepared.
+
+    psycopg2 connections cannot be weakly referenced, so entries are keyed by id() and keep the connection alive;
+    entries for closed connections are pruned whenever a new connection is registered.
+    """
+
+    def __init__(self):
+        self._prepared = {}
+        self._lock = threading.Lock()
+
+    def names(self, connection):
+        """
+        Returns the mutable, insertion-ordered dict whose keys name the statements prepared on connection.
+
+        Args:
+            connection: A PostgreSQL connection.
+
+        Returns:
+            dict: Names of the statements prepared on that connection, oldest first; the values are unused.
+        """
+        with self._lock:
+            entry = self._prepared.get(id(connection))
+            if entry is None or entry[0] is not connection:
+                for key in [key for key, (conn, _) in self._prepared.items() if getattr(conn, 'closed', 0)]:
+                    del self._prepared[key]
+                entry = self._prepared[id(connection)] = (connection, {})
+            return entry[1]
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from src.async_db_client import AsyncDatabaseClient
+from src.async_db_operations import AsyncDatabaseOperations
+
+# In-process fake MySQL driver whose statements block for a fixed time, like a network round-trip
+class FakeConnection:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, **config):
+        self.rows = [(i,) for i in range(5)]
+        self.unread_result = False
+
+    def cursor(self, **kwargs):
+        cursor = MagicMock()
+        del cursor.connection
+        cursor.execute.side_effect = self._execute
+        cursor.description = [("key",)]
+        cursor.fetchmany.side_effect = [self.rows[:3], self.rows[3:], []]
+        cursor.fetchone.return_value = self.rows[0]
+        return cursor
+
+    def _execute(self, sql, params=None):
+        with FakeConnection.lock:
+            FakeConnection.active += 1
+            FakeConnection.peak = max(FakeConnection.peak, FakeConnection.active)
+        time.sleep(0.05)
+        with FakeConnection.lock:
+            FakeConnection.active -= 1
+
+    def is_connected(self):
+        return True
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def async_ops():
+    with patch('src.db_client.MongoClient'), \
+         patch('src.db_client.mysql.connector.connect', side_effect=FakeConnection), \
+         patch('src.db_client.psycopg2.connect'):
+        FakeConnection.peak = 0
+        client = AsyncDatabaseClient("mongodb://localhost:27017", {}, {}, pool_config={"min_size": 0, "max_size": 4})
+        yield AsyncDatabaseOperations(client)
+
+# Test that concurrent operations never block the event loop and share a bounded number of connections
+def test_event_loop_not_blocked(async_ops):
+    async def scenario():
+        await async_ops.db_client.connect()
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*[async_ops.find('mysql', {"key": i}, "test_table") for i in range(40)])
+        done.set()
+        await ticker_task
+        await async_ops.db_client.close()
+        return results, ticks
+
+    started = time.monotonic()
+    results, ticks = asyncio.run(scenario())
+    elapsed = time.monotonic() - started
+
+    assert results == [(0,)] * 40
+    assert FakeConnection.peak == 4
+    # 40 calls of 50ms on 4 connections take about 0.5s; the ticker must have kept running throughout.
+    assert elapsed < 1.5
+    assert ticks >= 40
+
+# Test the async streaming generator yields every row
+def test_async_find_iter(async_ops):
+    async def scenario():
+        await async_ops.db_client.connect()
+        rows = [row async for row in async_ops.find_iter('mysql', {}, "test_table", batch_size=3)]
+        await async_ops.db_client.close()
+        return rows
+
+    assert asyncio.run(scenario()) == [(i,) for i in range(5)]
+
+# Test open streams keep being served while every pooled connection is held and more calls wait for one
+def test_open_streams_do_not_starve_executor():
+    from src.metrics import Metrics
+    with patch('src.db_client.MongoClient'), \
+         patch('src.db_client.mysql.connector.connect', side_effect=FakeConnection), \
+         patch('src.db_client.psycopg2.connect'):
+        client = AsyncDatabaseClient("mongodb://localhost:27017", {}, {},
+                                     pool_config={"min_size": 0, "max_size": 2, "timeout": 2})
+        metrics = Metrics()
+        ops = AsyncDatabaseOperations(client, statement_cache_size=8, prepared_statements=True, metrics=metrics)
+        assert ops.operations.statement_cache.maxsize == 8
+        assert ops.operations.prepared_statements and ops.operations.metrics is metrics
+
+        async def drain(stream, first):
+            return [first] + [row async for row in stream]
+
+        async def scenario():
+            streams = [ops.find_iter('mysql', {}, "test_table", batch_size=3) for _ in range(3)]
+            firsts = [await stream.__anext__() for stream in streams[:2]]
+            # Both connections are held by open streams: these calls, and the third stream, wait for one.
+            waiting = [asyncio.create_task(ops.find('mysql', {"key": i}, "test_table")) for i in range(4)]
+            third = asyncio.create_task(streams[2].__anext__())
+            await asyncio.sleep(0.1)
+            rows = await asyncio.gather(*[drain(stream, first) for stream, first in zip(streams, firsts)])
+            rows.append(await drain(streams[2], await third))
+            results = await asyncio.gather(*waiting)
+            await client.close()
+            return rows, results
+
+        rows, results = asyncio.run(scenario())
+    assert rows == [[(i,) for i in range(5)]] * 3
+    assert results == [(0,)] * 4
+    assert metrics.sinks[0].snapshot()[('mysql', 'find_iter', 'test_table')]['rows'] == 15
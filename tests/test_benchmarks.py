@@ -0,0 +1,31 @@
+import pytest
+from src.benchmarks import crud
+
+# Test the CRUD suite runs end to end against the in-process fakes and SQLite
+@pytest.mark.parametrize("mode, backends", [("fake", {"mongo", "mysql", "postgres"}), ("sqlite", {"mongo", "mysql"})])
+def test_crud_run(mode, backends):
+    report = crud.run(mode, widths=(2,), batch_sizes=(5,), iterations=10)
+    assert report['meta']['mode'] == mode
+    assert {result['backend'] for result in report['results']} == backends
+    for result in report['results']:
+        assert result['ops_per_sec'] > 0
+        assert result['p50_ms'] <= result['p99_ms']
+    batch = [r for r in report['results'] if r['operation'] == 'insert_many']
+    assert all(r['batch_size'] == 5 and r['iterations'] == 2 for r in batch)
+
+# Test only drops beyond the threshold are reported as regressions
+def test_compare_reports_regressions():
+    def report(ops):
+        return {'results': [{'backend': 'mysql', 'operation': 'find', 'width': 4, 'batch_size': None, 'ops_per_sec': ops}]}
+
+    assert crud.compare(report(1000), report(950), threshold=0.1) == []
+    regressions = crud.compare(report(1000), report(800), threshold=0.1)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("mysql/find/4/None")
+
+# Test the columnar benchmark measures every read path, skipping formats whose library is missing
+def test_columnar_run():
+    from src.benchmarks import columnar
+    results = columnar.run(rows=50, batch_size=20)
+    assert set(results) == {"rows", "numpy", "arrow"}
+    assert results["rows"]["result_bytes"] > 0
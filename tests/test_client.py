@@ -51,4 +51,79 @@ def test_close():
         db_client.connect()
         db_client.close()
         mysql_instance.close.assert_called_once()
-        postgres_instance.close.assert_called_once()
\ No newline at end of file
+        postgres_instance.close.assert_called_once()
+
+# Test that pooled mode borrows connections from the pools
+def test_pooled_connection():
+    with patch('src.db_client.MongoClient'), \
+         patch('src.db_client.mysql.connector.connect') as mock_mysql, \
+         patch('src.db_client.psycopg2.connect') as mock_postgres:
+
+        mysql_instance = MagicMock()
+        mock_mysql.return_value = mysql_instance
+        mock_postgres.return_value = MagicMock(closed=0)
+
+        db_client = DatabaseClient("mongodb://localhost:27017",
+                                   {"host": "localhost", "user": "root", "password": "password", "database": "test"},
+                                   {"host": "localhost", "user": "root", "password": "password", "dbname": "test"},
+                                   pool_config={"min_size": 0, "max_size": 2})
+        db_client.connect()
+
+        with db_client.connection('mysql') as conn:
+            assert conn is mysql_instance
+        assert db_client.get_database()['mysql'] is db_client.mysql_pool
+        assert db_client.mysql_pool.available == 1
+
+        db_client.close()
+        mysql_instance.close.assert_called_once()
+
+
+# Test that databases are connected lazily on first use
+def test_lazy_connect():
+    with patch('src.db_client.MongoClient') as mock_mongo, \
+         patch('src.db_client.mysql.connector.connect') as mock_mysql, \
+         patch('src.db_client.psycopg2.connect') as mock_postgres:
+
+        db_client = DatabaseClient("mongodb://localhost:27017", {"host": "localhost"}, {"host": "localhost"},
+                                   connect_timeout={"mysql": 2.5})
+        with db_client.connection('mysql') as conn:
+            assert conn is mock_mysql.return_value
+        # The driver takes whole seconds, so 2.5 is rounded up rather than truncated
+        mock_mysql.assert_called_once_with(host="localhost", connection_timeout=3)
+        mock_mongo.assert_not_called()
+        mock_postgres.assert_not_called()
+
+        assert db_client.get_mongo_client() is mock_mongo.return_value
+
+# Test that one failing database does not prevent the others from connecting
+def test_connect_isolates_failures():
+    with patch('src.db_client.MongoClient') as mock_mongo, \
+         patch('src.db_client.mysql.connector.connect', side_effect=OSError("unreachable")), \
+         patch('src.db_client.psycopg2.connect') as mock_postgres:
+
+        db_client = DatabaseClient("mongodb://localhost:27017", {"host": "localhost"}, {"host": "localhost"})
+        with pytest.raises(DatabaseConnectionError, match="mysql: Failed to connect to mysql: unreachable"):
+            db_client.connect()
+        assert db_client.is_connected('mongo')
+        assert db_client.is_connected('postgres')
+        assert not db_client.is_connected('mysql')
+
+# Test that connect() stops waiting for a database after its connect timeout
+def test_connect_timeout():
+    from src.benchmarks.fakes import FakeDriverClient
+    db_client = FakeDriverClient(connect_delays={'postgres': 0.5}, connect_timeout={'postgres': 0.05})
+    with pytest.raises(DatabaseConnectionError, match="postgres: timed out"):
+        db_client.connect()
+    assert db_client.is_connected('mysql')
+
+# Test connect and pool checkout latencies are recorded
+def test_client_metrics():
+    from src.benchmarks.fakes import FakeDriverClient
+    from src.metrics import Metrics
+    metrics = Metrics()
+    db_client = FakeDriverClient(pool_config={"min_size": 0, "max_size": 1}, metrics=metrics)
+    with db_client.connection('mysql'):
+        pass
+    snapshot = metrics.sinks[0].snapshot()
+    assert snapshot[('mysql', 'connect', '')]['calls'] == 1
+    assert snapshot[('mysql', 'checkout', '')]['calls'] == 1
@@ -0,0 +1,40 @@
+import pytest
+from bson import ObjectId
+from src.columnar import ColumnarBuilder
+
+np = pytest.importorskip("numpy")
+
+# Test SQL batches are converted column by column into typed numpy arrays
+def test_numpy_rows():
+    builder = ColumnarBuilder('numpy')
+    builder.add_rows(("id", "score"), [(1, 0.5), (2, 1.5)])
+    builder.add_rows(("id", "score"), [(3, 2.5)])
+    result = builder.finish()
+    assert result["id"].dtype == np.int64 and result["id"].tolist() == [1, 2, 3]
+    assert result["score"].tolist() == [0.5, 1.5, 2.5]
+
+# Test fields appearing in later documents are back-filled, and incompatible batches fall back to objects
+def test_numpy_documents():
+    builder = ColumnarBuilder('numpy')
+    builder.add_documents([{"a": 1}, {"a": 2}])
+    builder.add_documents([{"a": "x", "b": True}])
+    result = builder.finish()
+    assert result["a"].tolist() == [1, 2, "x"]
+    assert result["b"].tolist() == [None, None, True]
+
+# Test Arrow output keeps one record batch per fetched batch and stores ObjectIds as strings
+def test_arrow_documents():
+    pa = pytest.importorskip("pyarrow")
+    object_id = ObjectId()
+    builder = ColumnarBuilder('arrow')
+    builder.add_documents([{"_id": object_id, "n": None}])
+    builder.add_documents([{"_id": object_id, "n": 2}], fields=["_id", "n"])
+    table = builder.finish()
+    assert table.num_rows == 2 and len(table.to_batches()) == 2
+    assert table.column("_id").to_pylist() == [str(object_id)] * 2
+    assert table.column("n").type == pa.int64()
+
+# Test unknown formats are rejected
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        ColumnarBuilder('pandas')
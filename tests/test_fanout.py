@@ -0,0 +1,54 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+from src.fanout import FanOutExecutor
+
+# Fake operations whose latency and failures are chosen per backend
+def make_ops(delays, failing=()):
+    ops = MagicMock()
+
+    def find(db_type, query, collection_table):
+        time.sleep(delays[db_type])
+        if db_type in failing:
+            raise RuntimeError(f"{db_type} failed")
+        return {"db": db_type, **query}
+
+    ops.find.side_effect = find
+    return ops
+
+# Test all backends run concurrently and report results and errors per backend
+def test_fan_out_all():
+    executor = FanOutExecutor(make_ops({'mongo': 0.1, 'mysql': 0.1, 'postgres': 0.1}, failing={'postgres'}))
+    started = time.monotonic()
+    outcome = executor.run('find', ['mongo', 'mysql', 'postgres'], {"id": 1}, "users")
+    assert time.monotonic() - started < 0.25
+    assert outcome.results == {'mongo': {"db": "mongo", "id": 1}, 'mysql': {"db": "mysql", "id": 1}}
+    assert str(outcome.errors['postgres']) == "postgres failed"
+    assert not outcome.ok
+
+# Test the first-result mode returns without waiting for slow backends
+def test_fan_out_first():
+    executor = FanOutExecutor(make_ops({'mongo': 0.01, 'mysql': 0.5}))
+    started = time.monotonic()
+    outcome = executor.run('find', ['mongo', 'mysql'], {"id": 1}, "users", mode='first')
+    assert time.monotonic() - started < 0.3
+    assert outcome.first() == {"db": "mongo", "id": 1}
+    assert outcome.pending == {'mysql'}
+
+# Test quorum mode and per-backend timeouts
+def test_fan_out_quorum_and_timeout():
+    executor = FanOutExecutor(make_ops({'mongo': 0.01, 'mysql': 0.02, 'postgres': 0.5}))
+    outcome = executor.run('find', ['mongo', 'mysql', 'postgres'], {}, "users", mode='quorum')
+    assert set(outcome.results) == {'mongo', 'mysql'}
+
+    outcome = executor.run('find', ['mongo', 'postgres'], {}, "users", timeout={'postgres': 0.05})
+    assert set(outcome.results) == {'mongo'}
+    assert isinstance(outcome.errors['postgres'], TimeoutError)
+
+# Test heterogeneous calls
+def test_fan_out_run_many():
+    executor = FanOutExecutor(MagicMock())
+    outcome = executor.run_many({'a': lambda: 1, 'b': lambda: 2})
+    assert outcome.results == {'a': 1, 'b': 2}
+    with pytest.raises(ValueError):
+        executor.run_many({}, mode='unknown')
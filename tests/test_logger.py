@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from unittest.mock import MagicMock
+from src.logger import configure_logging, shutdown_logging, logger, RateLimitFilter, SamplingFilter
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(self.format(record))
+
+@pytest.fixture
+def sink():
+    handler = ListHandler()
+    yield handler
+    shutdown_logging()
+
+# Test importing the package does not open database.log
+def test_import_opens_no_file(tmp_path):
+    package_parent = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, "-c", "import src.logger"], cwd=tmp_path, check=True,
+                   env={**os.environ, "PYTHONPATH": os.pathsep.join([package_parent] + sys.path)})
+    assert not (tmp_path / "database.log").exists()
+
+# Test records are written by the listener thread as JSON with the structured fields
+def test_json_records_written_in_background(sink):
+    configure_logging(handlers=[sink], level=logging.DEBUG, json_format=True)
+    logger.debug("find took 1 ms", extra={'operation': 'find', 'db_type': 'mysql', 'table': 'users', 'duration': 0.001})
+    shutdown_logging()
+
+    record = json.loads(sink.lines[0])
+    assert record['message'] == "find took 1 ms"
+    assert (record['operation'], record['db_type'], record['table'], record['duration']) == ('find', 'mysql', 'users', 0.001)
+    assert threading.current_thread().name not in sink.threads
+
+# Test operations emit structured debug records
+def test_operations_log_structured_records(sink):
+    from src.db_client import DatabaseClient
+    from src.db_operations import DatabaseOperations
+    client = DatabaseClient("mongodb://localhost:27017", {}, {})
+    client.mongo_client = MagicMock()
+    configure_logging(handlers=[sink], level=logging.DEBUG, json_format=True)
+    DatabaseOperations(client).find('mongo', {"key": "value"}, "users")
+    shutdown_logging()
+
+    record = json.loads(sink.lines[0])
+    assert (record['operation'], record['db_type'], record['table']) == ('find', 'mongo', 'users')
+    assert record['duration'] >= 0
+
+# Test records stop reaching the root handlers while the queue handler is installed, and do again after shutdown
+def test_no_propagation_while_configured(sink):
+    root = ListHandler()
+    logging.getLogger().addHandler(root)
+    try:
+        configure_logging(handlers=[sink])
+        configure_logging(handlers=[sink])
+        logger.warning("queued")
+        assert logger.propagate is False
+        shutdown_logging()
+        assert logger.propagate is True
+        logger.warning("propagated")
+    finally:
+        logging.getLogger().removeHandler(root)
+    assert [line.endswith("queued") for line in sink.lines] == [True]
+    assert root.lines == ["propagated"]
+
+# Test debug sampling and rate limiting leave more severe records alone
+def test_sampling_and_rate_limit():
+    debug = logging.LogRecord('DatabaseLogger', logging.DEBUG, __file__, 1, "debug", None, None)
+    error = logging.LogRecord('DatabaseLogger', logging.ERROR, __file__, 1, "error", None, None)
+
+    assert not SamplingFilter(0.0).filter(debug)
+    assert SamplingFilter(0.0).filter(error)
+
+    limit = RateLimitFilter(per_second=0.001, burst=2)
+    assert [limit.filter(debug) for _ in range(4)] == [True, True, False, False]
+    assert limit.filter(error)
+    assert limit.dropped == 2
@@ -0,0 +1,52 @@
+import pytest
+from src.metrics import CallbackSink, InMemorySink, Metrics, MetricsSink, Observation, payload_size
+
+# Test histograms, counters and quantiles of the in-memory sink
+def test_in_memory_sink_snapshot():
+    sink = InMemorySink(buckets=(0.01, 0.1))
+    for duration in (0.005, 0.005, 0.05, 0.5):
+        sink.record(Observation('mysql', 'find', 'users', duration, rows=1, bytes=10))
+    sink.record(Observation('mysql', 'find', 'users', 0.001, error=True))
+
+    values = sink.snapshot()[('mysql', 'find', 'users')]
+    assert values['calls'] == 5 and values['errors'] == 1
+    assert values['rows'] == 4 and values['bytes'] == 40
+    assert values['buckets'] == {0.01: 3, 0.1: 4, float('inf'): 5}
+    assert values['p50'] == 0.01
+    assert values['p99'] == float('inf')
+
+# Test the Prometheus text export
+def test_prometheus_export():
+    sink = InMemorySink(buckets=(0.1,))
+    sink.record(Observation('postgres', 'insert', 'orders', 0.05, rows=1, bytes=12))
+    text = sink.to_prometheus()
+    labels = 'db_type="postgres",operation="insert",table="orders"'
+    assert f'multipledb_operation_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'multipledb_operation_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f'multipledb_operation_duration_seconds_count{{{labels}}} 1' in text
+    assert f'multipledb_operation_bytes_total{{{labels}}} 12' in text
+
+# Test the timer records errors and forwards observations to every sink
+def test_metrics_timer_and_callback():
+    received = []
+    metrics = Metrics([InMemorySink(), CallbackSink(received.append)])
+    with metrics.timer('mongo', 'find', 'users') as observation:
+        observation.rows = 3
+    with pytest.raises(RuntimeError):
+        with metrics.timer('mongo', 'find', 'users'):
+            raise RuntimeError("boom")
+    assert [(o.rows, o.error) for o in received] == [(3, False), (0, True)]
+    assert metrics.sinks[0].snapshot()[('mongo', 'find', 'users')]['errors'] == 1
+
+# Test the payload size estimate
+def test_payload_size():
+    assert payload_size({"name": "abc", "age": 3}) == 4 + 3 + 3 + 8
+    assert payload_size([("ab", None)]) == 2
+
+# Test a sink without record() fails when it is created
+def test_incomplete_sink_rejected():
+    class SilentSink(MetricsSink):
+        pass
+
+    with pytest.raises(TypeError):
+        SilentSink()
@@ -2,25 +2,36 @@ import pytest
 from unittest.mock import MagicMock, patch
 from src.db_operations import DatabaseOperations
 from src.db_client import DatabaseClient
+from src.result_cache import ResultCache
+from src.metrics import Metrics
+from src.query import Query
+from src.exceptions import DeletionError, UpdateError
 
 # Setup a fixture for DatabaseOperations with mocked DatabaseClient
 @pytest.fixture
 def db_ops():
-    with patch('src.db_client.DatabaseClient') as mock_db_client:
-        # Create instance of DatabaseClient
-        client = mock_db_client.return_value
-        client.mongo_client = MagicMock()
-        client.mysql_connection = MagicMock()
-        client.postgres_connection = MagicMock()
-
-        # Mock cursor for SQL databases
-        mock_cursor = MagicMock()
-        client.mysql_connection.cursor.return_value = mock_cursor
-        client.postgres_connection.cursor.return_value = mock_cursor
-
-        # Instantiate DatabaseOperations with mocked DatabaseClient
-        db_ops = DatabaseOperations(client)
-        return db_ops, mock_cursor
+    # Create a DatabaseClient whose connections are mocks, so operations borrow them through DatabaseClient.connection()
+    client = DatabaseClient("mongodb://localhost:27017", {}, {})
+    client.mongo_client = MagicMock()
+    client.mysql_connection = MagicMock()
+    client.postgres_connection = MagicMock()
+    # psycopg2 reports an open connection with closed == 0
+    client.postgres_connection.closed = 0
+
+    # Mock cursor for SQL databases, without the connection attribute mysql.connector cursors lack
+    mock_cursor = MagicMock()
+    del mock_cursor.connection
+    client.mysql_connection.cursor.return_value = mock_cursor
+    client.postgres_connection.cursor.return_value = mock_cursor
+
+    # Instantiate DatabaseOperations with the mocked connections
+    db_ops = DatabaseOperations(client)
+    return db_ops, mock_cursor
+
+# The mocked connection of a SQL database, which operations must commit on
+def sql_connection(db_operations, db_type):
+    client = db_operations.db_client
+    return client.mysql_connection if db_type == "mysql" else client.postgres_connection
 
 # Test insert operations for all databases
 @pytest.mark.parametrize("db_type", [("mongo"), ("mysql"), ("postgres")])
@@ -33,7 +44,7 @@ def test_insert(db_ops, db_type):
         db_operations.db_client.mongo_client['your_database'][collection_table].insert_one.assert_called_with(data)
     else:
         mock_cursor.execute.assert_called()
-        assert mock_cursor.connection.commit.called
+        assert sql_connection(db_operations, db_type).commit.called
 
 # Test find operations for all databases
 @pytest.mark.parametrize("db_type", [("mongo"), ("mysql"), ("postgres")])
@@ -60,7 +71,7 @@ def test_update(db_ops, db_type):
         db_operations.db_client.mongo_client['your_database'][collection_table].update_one.assert_called_with(query, {'$set': new_values})
     else:
         mock_cursor.execute.assert_called()
-        assert mock_cursor.connection.commit.called
+        assert sql_connection(db_operations, db_type).commit.called
 
 # Test delete operations for all databases
 @pytest.mark.parametrize("db_type", [("mongo"), ("mysql"), ("postgres")])
@@ -73,4 +84,351 @@ def test_delete(db_ops, db_type):
         db_operations.db_client.mongo_client['your_database'][collection_table].delete_one.assert_called_with(query)
     else:
         mock_cursor.execute.assert_called()
-        assert mock_cursor.connection.commit.called
+        assert sql_connection(db_operations, db_type).commit.called
+
+# Test bulk inserts are split into batches with one commit per SQL batch
+@pytest.mark.parametrize("db_type", [("mongo"), ("mysql"), ("postgres")])
+def test_insert_many(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    collection_table = "test_collection" if db_type == "mongo" else "test_table"
+    rows = [{"key": i, "value": str(i)} for i in range(5)]
+    collection = db_operations.db_client.mongo_client['your_database'][collection_table]
+    collection.insert_many.side_effect = lambda batch, ordered: MagicMock(inserted_ids=list(range(len(batch))))
+    with patch('src.db_operations.execute_values') as mock_execute_values:
+        reports = db_operations.insert_many(db_type, rows, collection_table, batch_size=2)
+
+    assert [report['rows'] for report in reports] == [2, 2, 1]
+    assert all(report['inserted'] == report['rows'] and report['error'] is None for report in reports)
+    if db_type == "mongo":
+        collection.insert_many.assert_called_with([rows[4]], ordered=False)
+    elif db_type == "mysql":
+        assert mock_cursor.executemany.call_count == 3
+        mock_cursor.executemany.assert_called_with("INSERT INTO test_table (key, value) VALUES (%s, %s)", [(4, '4')])
+    else:
+        assert mock_execute_values.call_count == 3
+        assert mock_execute_values.call_args[0][1] == "INSERT INTO test_table (key, value) VALUES %s"
+    if db_type != "mongo":
+        connection = db_operations.db_client.mysql_connection if db_type == "mysql" else db_operations.db_client.postgres_connection
+        assert connection.commit.call_count == 3
+
+# Test a failing SQL batch is rolled back and reported while the others are written
+def test_insert_many_reports_failed_batch(db_ops):
+    db_operations, mock_cursor = db_ops
+    mock_cursor.executemany.side_effect = [None, Exception("duplicate key")]
+    reports = db_operations.insert_many("mysql", [{"key": i} for i in range(4)], "test_table", batch_size=2)
+    assert reports[0]['error'] is None and reports[0]['inserted'] == 2
+    assert reports[1]['error'] == "duplicate key" and reports[1]['inserted'] == 0
+    db_operations.db_client.mysql_connection.rollback.assert_called_once()
+
+# Test find_iter streams batches through server-side/unbuffered cursors
+@pytest.mark.parametrize("db_type", [("mysql"), ("postgres")])
+def test_find_iter_sql(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    mock_cursor.description = [("key",), ("value",)]
+    mock_cursor.fetchmany.side_effect = [[(1, 'a'), (2, 'b')], [(3, 'c')], []]
+    rows = list(db_operations.find_iter(db_type, {"key": "value"}, "test_table", batch_size=2, projection=["key", "value"]))
+    assert rows == [(1, 'a'), (2, 'b'), (3, 'c')]
+    mock_cursor.execute.assert_called_with("SELECT key, value FROM test_table WHERE key=%s", ("value",))
+    mock_cursor.fetchmany.assert_called_with(2)
+    connection = db_operations.db_client.mysql_connection if db_type == "mysql" else db_operations.db_client.postgres_connection
+    if db_type == "mysql":
+        connection.cursor.assert_called_with(buffered=False)
+    else:
+        assert connection.cursor.call_args[1]['name'].startswith("find_iter_")
+    mock_cursor.close.assert_called_once()
+
+# Test closing find_iter early closes the cursor
+def test_find_iter_early_termination(db_ops):
+    db_operations, mock_cursor = db_ops
+    mock_cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,), (4,)]]
+    rows = db_operations.find_iter("mysql", {}, "test_table", batch_size=2)
+    assert next(rows) == (1,)
+    rows.close()
+    mock_cursor.execute.assert_called_with("SELECT * FROM test_table", ())
+    db_operations.db_client.mysql_connection.consume_results.assert_called_once()
+    mock_cursor.close.assert_called_once()
+
+# Test closing find_iter early in pooled mode rolls the connection back and returns it to the pool
+def test_find_iter_early_termination_pooled():
+    connection = MagicMock(closed=0)
+    connection.cursor.return_value.fetchmany.side_effect = [[(1,), (2,)], [(3,), (4,)]]
+    with patch('src.db_client.psycopg2.connect', return_value=connection):
+        client = DatabaseClient(None, None, {}, pool_config={'min_size': 1, 'max_size': 1})
+        rows = DatabaseOperations(client).find_iter("postgres", {}, "test_table", batch_size=2)
+        assert next(rows) == (1,)
+        rows.close()
+    connection.cursor.return_value.close.assert_called_once()
+    assert connection.rollback.called
+    assert client.postgres_pool.size == 1 and client.postgres_pool.available == 1
+    assert not connection.close.called
+
+# Test find_iter passes the batch size to the Mongo cursor
+def test_find_iter_mongo(db_ops):
+    db_operations, _ = db_ops
+    collection = db_operations.db_client.mongo_client['your_database']['test_collection']
+    cursor = MagicMock()
+    cursor.__iter__.return_value = iter([{"key": 1}, {"key": 2}, {"key": 3}])
+    collection.find.return_value = cursor
+    assert list(db_operations.find_iter("mongo", {}, "test_collection", batch_size=2)) == [{"key": 1}, {"key": 2}, {"key": 3}]
+    collection.find.assert_called_with({}, None, batch_size=2)
+    cursor.close.assert_called_once()
+
+# Test generated SQL is cached per statement shape
+def test_statement_cache_reuse(db_ops):
+    db_operations, mock_cursor = db_ops
+    db_operations.update("mysql", {"id": 1, "name": "a"}, {"value": 2}, "test_table")
+    db_operations.update("mysql", {"id": 2, "name": "b"}, {"value": 3}, "test_table")
+    mock_cursor.execute.assert_called_with("UPDATE test_table SET value=%s WHERE id=%s AND name=%s", (3, 2, "b"))
+    assert db_operations.statement_cache.hits == 1
+    assert db_operations.statement_cache.misses == 1
+
+# Test prepared statements use prepared cursors on MySQL and PREPARE/EXECUTE on PostgreSQL
+@pytest.mark.parametrize("db_type", [("mysql"), ("postgres")])
+def test_prepared_statements(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    db_operations.prepared_statements = True
+    db_operations.find(db_type, {"key": "a"}, "test_table")
+    db_operations.find(db_type, {"key": "b"}, "test_table")
+    connection = db_operations.db_client.mysql_connection if db_type == "mysql" else db_operations.db_client.postgres_connection
+    if db_type == "mysql":
+        connection.cursor.assert_called_once_with(prepared=True)
+        mock_cursor.execute.assert_called_with("SELECT * FROM test_table WHERE key=%s LIMIT 1", ("b",))
+    else:
+        executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert len(executed) == 3
+        assert executed[0].endswith("AS SELECT * FROM test_table WHERE key=$1 LIMIT 1")
+        assert executed[1] == executed[2] and executed[1].startswith("EXECUTE ")
+
+# Test PostgreSQL sessions deallocate their oldest prepared statement once they hold as many as the cache
+def test_prepared_statements_deallocated(db_ops):
+    db_operations, mock_cursor = db_ops
+    db_operations.prepared_statements = True
+    db_operations.statement_cache.maxsize = 2
+    for column in ["a", "b", "c", "a"]:
+        db_operations.find("postgres", {column: 1}, "test_table")
+    executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    prepares = [sql.split()[1] for sql in executed if sql.startswith("PREPARE ")]
+    deallocates = [sql.split()[1] for sql in executed if sql.startswith("DEALLOCATE ")]
+    assert len(prepares) == 4
+    assert deallocates == prepares[:2]
+
+# Test find results are served from the result cache until a write to the table
+@pytest.mark.parametrize("db_type", [("mongo"), ("mysql")])
+def test_find_result_cache(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    db_operations.result_cache = ResultCache()
+    collection = db_operations.db_client.mongo_client['your_database']['test_table']
+    query = {"key": "value"}
+
+    first = db_operations.find(db_type, query, "test_table")
+    assert db_operations.find(db_type, query, "test_table") is first
+    db_operations.update(db_type, query, {"key": "new_value"}, "test_table")
+    db_operations.find(db_type, query, "test_table")
+
+    if db_type == "mongo":
+        assert collection.find_one.call_count == 2
+    else:
+        assert mock_cursor.fetchone.call_count == 2
+    assert db_operations.result_cache.stats()['hits'] == 1
+
+# Test operations inside a transaction share one commit
+@pytest.mark.parametrize("db_type", [("mysql"), ("postgres")])
+def test_transaction_commits_once(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    connection = sql_connection(db_operations, db_type)
+    with db_operations.transaction(db_type) as tx:
+        db_operations.insert(db_type, {"key": "value"}, "test_table")
+        db_operations.update(db_type, {"key": "value"}, {"key": "new_value"}, "test_table")
+        db_operations.delete(db_type, {"key": "new_value"}, "test_table")
+        connection.commit.assert_not_called()
+    connection.commit.assert_called_once()
+    assert tx.tables == {"test_table"}
+
+# Test an exception rolls the transaction back, and a nested transaction uses a savepoint
+def test_transaction_rollback_and_savepoint(db_ops):
+    db_operations, mock_cursor = db_ops
+    connection = db_operations.db_client.postgres_connection
+    with pytest.raises(ValueError):
+        with db_operations.transaction("postgres"):
+            db_operations.insert("postgres", {"key": "value"}, "test_table")
+            with pytest.raises(KeyError):
+                with db_operations.transaction("postgres"):
+                    raise KeyError("inner")
+            raise ValueError("outer")
+    executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert executed[1:] == ["SAVEPOINT sp_0", "ROLLBACK TO SAVEPOINT sp_0", "RELEASE SAVEPOINT sp_0"]
+    connection.rollback.assert_called_once()
+    connection.commit.assert_not_called()
+
+# Test Mongo transactions run operations in a client session
+def test_mongo_transaction(db_ops):
+    db_operations, _ = db_ops
+    mongo_client = db_operations.db_client.mongo_client
+    session = mongo_client.start_session.return_value.__enter__.return_value
+    with db_operations.transaction("mongo"):
+        db_operations.insert("mongo", {"key": "value"}, "test_collection")
+    mongo_client['your_database']['test_collection'].insert_one.assert_called_with({"key": "value"}, session=session)
+    session.start_transaction.assert_called_once()
+    session.commit_transaction.assert_called_once()
+
+# Test operations record latency, rows and errors when metrics are enabled
+def test_operation_metrics(db_ops):
+    db_operations, mock_cursor = db_ops
+    db_operations.metrics = Metrics()
+    mock_cursor.fetchone.return_value = ("value",)
+    mock_cursor.fetchmany.side_effect = [[(1,), (2,)], []]
+    db_operations.insert("mysql", {"key": "value"}, "test_table")
+    db_operations.find("mysql", {"key": "value"}, "test_table")
+    assert list(db_operations.find_iter("mysql", {}, "test_table")) == [(1,), (2,)]
+    mock_cursor.execute.side_effect = DeletionError()
+    with pytest.raises(DeletionError):
+        db_operations.delete("mysql", {"key": "value"}, "test_table")
+
+    snapshot = db_operations.metrics.sinks[0].snapshot()
+    assert snapshot[("mysql", "insert", "test_table")]['bytes'] == 8
+    assert snapshot[("mysql", "find", "test_table")]['rows'] == 1
+    assert snapshot[("mysql", "find_iter", "test_table")]['rows'] == 2
+    assert snapshot[("mysql", "delete", "test_table")]['errors'] == 1
+
+# Test metrics read the arguments of keyword calls too, without binding the method signature on each call
+def test_operation_metrics_keyword_arguments(db_ops):
+    db_operations, mock_cursor = db_ops
+    db_operations.metrics = Metrics()
+    with patch('inspect.Signature.bind', side_effect=AssertionError("signature bound per call")):
+        db_operations.insert(db_type="postgres", data={"key": "value"}, collection_table="test_table")
+        db_operations.insert("postgres", {"key": "value"}, collection_table="test_table")
+    snapshot = db_operations.metrics.sinks[0].snapshot()
+    assert snapshot[("postgres", "insert", "test_table")]['calls'] == 2
+    assert snapshot[("postgres", "insert", "test_table")]['bytes'] == 16
+
+# Test update_many and delete_many map to the multi-document Mongo calls and return SQL row counts
+@pytest.mark.parametrize("db_type", [("mongo"), ("mysql"), ("postgres")])
+def test_update_and_delete_many(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    mock_cursor.rowcount = 3
+    updated = db_operations.update_many(db_type, {"key": "value"}, {"key": "new_value"}, "test_table")
+    deleted = db_operations.delete_many(db_type, {"key": "new_value"}, "test_table")
+    if db_type == "mongo":
+        collection = db_operations.db_client.mongo_client['your_database']['test_table']
+        collection.update_many.assert_called_with({"key": "value"}, {'$set': {"key": "new_value"}})
+        collection.delete_many.assert_called_with({"key": "new_value"})
+    else:
+        assert (updated, deleted) == (3, 3)
+        assert sql_connection(db_operations, db_type).commit.call_count == 2
+        executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert executed == ["UPDATE test_table SET key=%s WHERE key=%s", "DELETE FROM test_table WHERE key=%s"]
+
+# Test upsert renders the dialect specific conflict clause and never updates the key columns
+@pytest.mark.parametrize("db_type, sql", [
+    ("mysql", "INSERT INTO test_table (id, name) VALUES (%s, %s) ON DUPLICATE KEY UPDATE name=VALUES(name)"),
+    ("postgres", "INSERT INTO test_table (id, name) VALUES (%s, %s) ON CONFLICT (id) DO UPDATE SET name=EXCLUDED.name"),
+])
+def test_upsert_sql(db_ops, db_type, sql):
+    db_operations, mock_cursor = db_ops
+    db_operations.upsert(db_type, {"id": 1}, {"id": 1, "name": "a"}, "test_table")
+    mock_cursor.execute.assert_called_with(sql, (1, "a"))
+    assert sql_connection(db_operations, db_type).commit.called
+    with pytest.raises(UpdateError):
+        db_operations.upsert(db_type, {}, {"name": "a"}, "test_table")
+
+# Test Mongo upserts use update_one with upsert=True
+def test_upsert_mongo(db_ops):
+    db_operations, _ = db_ops
+    db_operations.upsert("mongo", {"id": 1}, {"name": "a"}, "test_collection")
+    collection = db_operations.db_client.mongo_client['your_database']['test_collection']
+    collection.update_one.assert_called_with({"id": 1}, {'$set': {"name": "a"}}, upsert=True)
+
+# Test a SQL bulk write groups consecutive statements and commits once
+@pytest.mark.parametrize("db_type", [("mysql"), ("postgres")])
+def test_bulk_write_sql(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    connection = db_operations.db_client.mysql_connection if db_type == "mysql" else db_operations.db_client.postgres_connection
+    operations = [("insert", {"id": 1}), ("insert", {"id": 2}), ("upsert", {"id": 3}, {"name": "c"}), ("delete", {"id": 1})]
+    with patch('src.db_operations.execute_batch') as execute_batch:
+        counts = db_operations.bulk_write(db_type, operations, "test_table")
+    assert counts == {"insert": 2, "upsert": 1, "delete": 1}
+    if db_type == "mysql":
+        batches = [call[0] for call in mock_cursor.executemany.call_args_list]
+    else:
+        batches = [call[0][1:] for call in execute_batch.call_args_list]
+    assert batches[0] == ("INSERT INTO test_table (id) VALUES (%s)", [(1,), (2,)])
+    assert [params for _, params in batches[1:]] == [[(3, "c")], [(1,)]]
+    connection.commit.assert_called_once()
+
+# Test a Mongo bulk write is sent as one ordered request, and malformed operations are rejected
+def test_bulk_write_mongo(db_ops):
+    db_operations, _ = db_ops
+    collection = db_operations.db_client.mongo_client['your_database']['test_collection']
+    db_operations.bulk_write("mongo", [("insert", {"id": 1}), ("update_many", {"id": 1}, {"x": 2}), ("delete", {"id": 1})],
+                             "test_collection")
+    requests = collection.bulk_write.call_args[0][0]
+    assert [type(request).__name__ for request in requests] == ["InsertOne", "UpdateMany", "DeleteOne"]
+    assert collection.bulk_write.call_args[1] == {"ordered": True}
+    with pytest.raises(UpdateError):
+        db_operations.bulk_write("mongo", [("update", {"id": 1})], "test_collection")
+
+# Test bulk writes given a generator are measured without calling len() on it once metrics are enabled
+@pytest.mark.parametrize("db_type", [("mongo"), ("mysql")])
+def test_bulk_write_generator_metrics(db_ops, db_type):
+    db_operations, _ = db_ops
+    db_operations.metrics = Metrics()
+    collection = db_operations.db_client.mongo_client['your_database']['test_table']
+    db_operations.bulk_write(db_type, (("insert", {"id": i}) for i in range(3)), "test_table")
+    if db_type == "mongo":
+        collection.bulk_write.assert_called_once()
+    snapshot = db_operations.metrics.sinks[0].snapshot()[(db_type, "bulk_write", "test_table")]
+    assert snapshot['errors'] == 0
+    assert snapshot['rows'] == (0 if db_type == "mongo" else 3)
+
+# Test find_many pushes the Query down to SQL and to the Mongo cursor
+@pytest.mark.parametrize("db_type", [("mongo"), ("mysql"), ("postgres")])
+def test_find_many(db_ops, db_type):
+    db_operations, mock_cursor = db_ops
+    query = Query({"age": {"$gt": 18}}, projection=["id"], sort="id", limit=5)
+    if db_type == "mongo":
+        collection = db_operations.db_client.mongo_client['your_database']['test_collection']
+        collection.find.return_value.__iter__.return_value = iter([{"id": 1}])
+        assert db_operations.find_many(db_type, query, "test_collection") == [{"id": 1}]
+        collection.find.assert_called_with({"age": {"$gt": 18}}, {"id": 1, "_id": 0}, sort=[("id", 1)], limit=5)
+    else:
+        mock_cursor.fetchall.return_value = [(1,)]
+        assert db_operations.find_many(db_type, query, "test_table") == [(1,)]
+        mock_cursor.execute.assert_called_with("SELECT id FROM test_table WHERE age>%s ORDER BY id ASC LIMIT 5", (18,))
+
+# Test find_many passes native Mongo filters to pymongo unchanged
+def test_find_many_native_mongo_filter(db_ops):
+    db_operations, mock_cursor = db_ops
+    collection = db_operations.db_client.mongo_client['your_database']['test_collection']
+    collection.find.return_value.__iter__.return_value = iter([{"id": 1}])
+    query = {"$or": [{"name": {"$regex": "^a"}}, {"age": {"$exists": False}}]}
+    assert db_operations.find_many("mongo", query, "test_collection") == [{"id": 1}]
+    collection.find.assert_called_with(query)
+
+# Test find with a Query returns the first row in sort order
+def test_find_with_query(db_ops):
+    db_operations, mock_cursor = db_ops
+    mock_cursor.fetchone.return_value = (3,)
+    assert db_operations.find("mysql", Query(projection=["id"], sort=[("id", -1)]), "test_table") == (3,)
+    mock_cursor.execute.assert_called_with("SELECT id FROM test_table ORDER BY id DESC LIMIT 1", ())
+
+# Test find_columnar converts the streamed batches into numpy columns
+def test_find_columnar(db_ops):
+    pytest.importorskip("numpy")
+    db_operations, mock_cursor = db_ops
+    mock_cursor.description = [("id",), ("name",)]
+    mock_cursor.fetchmany.side_effect = [[(1, 'a'), (2, 'b')], [(3, 'c')], []]
+    columns = db_operations.find_columnar("postgres", {}, "test_table", batch_size=2)
+    assert columns["id"].tolist() == [1, 2, 3]
+    assert columns["name"].tolist() == ['a', 'b', 'c']
+    mock_cursor.fetchall.assert_not_called()
+
+# Test find_columnar accepts native Mongo filters and takes the fields of a dict query from projection
+def test_find_columnar_native_mongo_filter(db_ops):
+    pytest.importorskip("numpy")
+    db_operations, mock_cursor = db_ops
+    collection = db_operations.db_client.mongo_client['your_database']['test_collection']
+    collection.find.return_value.__iter__.return_value = iter([{"id": 1, "name": "a"}, {"id": 2}])
+    query = {"name": {"$regex": "^a"}}
+    columns = db_operations.find_columnar("mongo", query, "test_collection", projection=["id", "name"])
+    collection.find.assert_called_with(query, ["id", "name"], batch_size=1000)
+    assert columns["id"].tolist() == [1, 2] and columns["name"].tolist() == ["a", None]
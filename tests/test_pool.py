@@ -0,0 +1,162 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from src.pool import ConnectionPool
+from src.exceptions import PoolTimeoutError, DatabaseConnectionError
+
+# Fake connection factory that records every connection it creates
+class FakeFactory:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        conn = MagicMock()
+        self.created.append(conn)
+        return conn
+
+# Test that min_size connections are opened eagerly and reused
+def test_pool_reuses_connections():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=2, max_size=4)
+    assert len(factory.created) == 2
+
+    with pool.connection() as conn:
+        assert conn in factory.created
+    with pool.connection() as conn2:
+        assert conn2 in factory.created
+    assert len(factory.created) == 2
+    assert pool.available == 2
+
+# Test that checkout blocks at max_size and times out
+def test_pool_checkout_timeout():
+    pool = ConnectionPool(FakeFactory(), min_size=0, max_size=1, timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+# Test that a waiting thread receives a connection released by another thread
+def test_pool_checkin_wakes_waiter():
+    pool = ConnectionPool(FakeFactory(), min_size=0, max_size=1, timeout=2)
+    conn = pool.acquire()
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+    waiter.start()
+    pool.release(conn)
+    waiter.join(2)
+    assert received == [conn]
+
+# Test that idle connections failing validation are replaced
+def test_pool_validates_idle_connections():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=2, validate=lambda c: not c.dead)
+    stale = factory.created[0]
+    stale.dead = True
+    conn = pool.acquire()
+    assert conn is not stale
+    stale.close.assert_called_once()
+    assert pool.size == 1
+
+# Test that connections older than max_lifetime are recycled
+def test_pool_max_lifetime():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=0, max_size=1, max_lifetime=0)
+    first = pool.acquire()
+    pool.release(first)
+    first.close.assert_called_once()
+    assert pool.acquire() is not first
+
+# Test that an error in the with block rolls the connection back and keeps it, unless it broke the connection
+def test_pool_rollback_and_discard():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=0, max_size=1, discard_on=lambda e: isinstance(e, ConnectionError))
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            raise ValueError("duplicate key")
+    conn.rollback.assert_called_once()
+    assert pool.size == 1 and pool.available == 1 and not conn.close.called
+    with pytest.raises(ConnectionError):
+        with pool.connection() as conn:
+            raise ConnectionError("server closed the connection")
+    conn.close.assert_called_once()
+    assert pool.size == 0
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            conn.rollback.side_effect = OSError("connection reset")
+            raise ValueError("boom")
+    conn.close.assert_called_once()
+    assert pool.size == 0
+
+# Fake connection whose statements open a transaction, as with autocommit off, until it commits or rolls back
+class TransactionalConnection:
+    def __init__(self):
+        self.in_transaction = False
+
+    def cursor(self):
+        cursor = MagicMock()
+        cursor.execute.side_effect = lambda *args: setattr(self, 'in_transaction', True)
+        return cursor
+
+    def commit(self):
+        self.in_transaction = False
+
+    def rollback(self):
+        self.in_transaction = False
+
+# Test that a connection is checked in without an open transaction after a read that never committed
+def test_pool_ends_transaction_on_release():
+    pool = ConnectionPool(TransactionalConnection, min_size=0, max_size=1)
+    with pool.connection() as conn:
+        conn.cursor().execute("SELECT 1")
+        assert conn.in_transaction
+    assert not conn.in_transaction and pool.available == 1
+
+# Test that pooled MySQL reads leave no transaction open, and idle connections are not rolled back again
+def test_pooled_mysql_read_ends_transaction():
+    from unittest.mock import patch
+    from src.db_client import DatabaseClient
+    from src.db_operations import DatabaseOperations
+    connections = []
+
+    def connect(**config):
+        conn = MagicMock(in_transaction=False)
+        cursor = conn.cursor.return_value
+        del cursor.connection
+        cursor.execute.side_effect = lambda *args: setattr(conn, 'in_transaction', True)
+        conn.rollback.side_effect = lambda: setattr(conn, 'in_transaction', False)
+        connections.append(conn)
+        return conn
+
+    with patch('src.db_client.mysql.connector.connect', side_effect=connect):
+        client = DatabaseClient(None, {"host": "localhost"}, None, pool_config={"min_size": 0, "max_size": 1})
+        ops = DatabaseOperations(client)
+        ops.find("mysql", {"id": 1}, "users")
+        assert connections[0].in_transaction is False
+        with client.connection("mysql"):
+            pass
+        assert connections[0].rollback.call_count == 1
+
+# Test that a slow health check does not hold up checkouts in other threads, and that a closed pool refuses checkouts
+def test_pool_validates_outside_lock_and_close():
+    factory = FakeFactory()
+    pinging = threading.Event()
+
+    def slow_validate(conn):
+        pinging.set()
+        time.sleep(0.3)
+        return True
+
+    pool = ConnectionPool(factory, min_size=1, max_size=2, validate=slow_validate)
+    pinged = threading.Thread(target=pool.acquire)
+    pinged.start()
+    pinging.wait(1)
+    started = time.monotonic()
+    assert pool.acquire() is factory.created[1]
+    assert time.monotonic() - started < 0.2
+    pinged.join()
+
+    pool.close()
+    with pytest.raises(DatabaseConnectionError):
+        pool.acquire()
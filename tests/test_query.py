@@ -0,0 +1,52 @@
+import pytest
+from src.query import Query, ASCENDING, DESCENDING
+
+# Test filters, projection, sort and limit compile to a single SELECT
+def test_to_sql():
+    query = Query({'status': 'active', 'age': {'$gte': 18, '$lt': 65}, 'role': {'$in': ['a', 'b']}, 'deleted_at': None},
+                  projection=['id', 'name'], sort=[('age', DESCENDING), 'id'], limit=10)
+    sql, params = query.to_sql('users')
+    assert sql == ("SELECT id, name FROM users WHERE status=%s AND age>=%s AND age<%s AND role IN (%s, %s) "
+                   "AND deleted_at IS NULL ORDER BY age DESC, id ASC LIMIT 10")
+    assert params == ('active', 18, 65, 'a', 'b')
+
+# Test keyset pagination continues after the last row in sort order
+def test_next_page():
+    query = Query({'status': 'active'}, projection=['id', 'age'], sort=[('age', DESCENDING), ('id', ASCENDING)], limit=2)
+    page = query.next_page((7, 30))
+    sql, params = page.to_sql('users')
+    assert sql == ("SELECT id, age FROM users WHERE status=%s AND ((age<%s) OR (age=%s AND id>%s)) "
+                   "ORDER BY age DESC, id ASC LIMIT 2")
+    assert params == ('active', 30, 30, 7)
+    assert page.mongo_filter() == {'$and': [{'status': 'active'},
+                                            {'$or': [{'age': {'$lt': 30}}, {'age': 30, 'id': {'$gt': 7}}]}]}
+    with pytest.raises(ValueError):
+        Query().next_page({'id': 1})
+
+# Test the MongoDB projection and find() options
+def test_mongo_arguments():
+    query = Query({'id': {'$gt': 5}}, projection=['id'], sort='id', limit=3)
+    assert query.mongo_filter() == {'id': {'$gt': 5}}
+    assert query.mongo_projection() == {'id': 1, '_id': 0}
+    assert query.mongo_options() == {'sort': [('id', ASCENDING)], 'limit': 3}
+    assert Query().mongo_projection() is None
+
+# Test names that could inject SQL and unsupported operators are rejected
+@pytest.mark.parametrize("kwargs", [
+    {'filter': {'id; DROP TABLE users': 1}},
+    {'filter': {'id': {'$regex': 'a'}}},
+    {'projection': ['id', 'name FROM secrets --']},
+    {'sort': [('id', 2)]},
+    {'limit': 0},
+])
+def test_invalid_queries(kwargs):
+    with pytest.raises(ValueError):
+        Query(**kwargs)
+
+# Test fields() lists every referenced field once and to_sql() applies a quoting function to every name
+def test_fields_and_quoting():
+    query = Query({"age": {"$gte": 18}}, projection=["id", "age"], sort=[("id", ASCENDING)], after={"id": 5})
+    assert query.fields() == ("age", "id")
+    sql, params = query.to_sql("users", lambda name: f'"{name}"')
+    assert sql == 'SELECT "id", "age" FROM "users" WHERE "age">=%s AND (("id">%s)) ORDER BY "id" ASC'
+    assert params == (18, 5)
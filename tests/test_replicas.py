@@ -0,0 +1,135 @@
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from pymongo import ReadPreference
+from src.db_client import DatabaseClient
+from src.db_operations import DatabaseOperations
+from src.replicas import ReplicaRouter
+
+# Fake MySQL connection recording the statements run on each host
+class HostConnection:
+    executed = []
+
+    def __init__(self, host, **config):
+        if host == "down":
+            raise OSError("unreachable")
+        self.host = host
+
+    def cursor(self, *args, **kwargs):
+        cursor = MagicMock()
+        del cursor.connection
+        cursor.execute.side_effect = lambda sql, params=None: HostConnection.executed.append(self.host)
+        cursor.fetchone.return_value = (self.host,)
+        return cursor
+
+    def commit(self):
+        pass
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def make_ops():
+    HostConnection.executed = []
+    with patch('src.db_client.mysql.connector.connect', side_effect=HostConnection):
+        def make(replicas=("replica1", "replica2"), **kwargs):
+            client = DatabaseClient(None, {"host": "primary"}, None,
+                                    mysql_replicas=[{"host": host} for host in replicas], **kwargs)
+            return DatabaseOperations(client)
+        yield make
+
+# Test round robin cycles through the replicas and least latency prefers the fastest one
+def test_router_strategies():
+    router = ReplicaRouter(["a", "b", "c"])
+    assert [router.choose() for _ in range(4)] == [0, 1, 2, 0]
+    router = ReplicaRouter(["a", "b"], strategy="least_latency", alpha=0.5)
+    assert router.choose() == 0
+    router.record(0, 0.2)
+    assert router.choose() == 1
+    router.record(1, 0.1)
+    assert router.choose() == 1
+    router.record_failure(1)
+    assert router.choose() == 0
+    with pytest.raises(ValueError):
+        ReplicaRouter([], strategy="round_robin")
+
+# Test a failed replica is probed again after probe_interval and rejoins once a probe succeeds
+def test_failed_replica_is_probed():
+    now = [0.0]
+    router = ReplicaRouter(["a", "b"], strategy="least_latency", probe_interval=5, clock=lambda: now[0])
+    router.record(0, 0.2)
+    router.record(1, 0.1)
+    router.record_failure(1)
+    assert [router.choose() for _ in range(3)] == [0, 0, 0]
+    now[0] = 5
+    assert [router.choose() for _ in range(3)] == [1, 0, 0]
+    router.record(1, 0.05)
+    assert router.latencies()[1] == 0.05
+    assert router.choose() == 1
+
+# Test round robin skips a failed replica between probes, and the primary serves reads while every replica is down
+def test_round_robin_skips_failed_replica(make_ops):
+    now = [0.0]
+    router = ReplicaRouter(["a", "b", "c"], probe_interval=5, clock=lambda: now[0])
+    router.record_failure(1)
+    assert 1 not in [router.choose() for _ in range(6)]
+    now[0] = 5
+    assert router.choose() == 1
+    assert 1 not in [router.choose() for _ in range(6)]
+    router.record(1, 0.01)
+    assert 1 in [router.choose() for _ in range(3)]
+
+    ops = make_ops(replicas=["down"])
+    assert ops.find("mysql", {"id": 1}, "users") == ("primary",)
+    assert ops.find("mysql", {"id": 1}, "users") == ("primary",)
+    assert HostConnection.executed == ["primary", "primary"]
+    assert ops.db_client.replica_routers["mysql"].choose() is None
+
+# Test the replica latency covers obtaining the connection, not how long the caller holds it
+def test_replica_latency_ignores_hold_time(make_ops):
+    ops = make_ops(replicas=["replica1"], replica_strategy="least_latency")
+    with ops.db_client.connection("mysql", read_only=True):
+        time.sleep(0.2)
+    assert ops.db_client.replica_routers["mysql"].latencies()[0] < 0.1
+
+# Test reads go to the replicas in turn and writes go to the primary
+def test_reads_use_replicas(make_ops):
+    ops = make_ops()
+    assert ops.find("mysql", {"id": 1}, "users") == ("replica1",)
+    assert ops.find("mysql", {"id": 1}, "users") == ("replica2",)
+    ops.insert("mysql", {"id": 1}, "users")
+    assert HostConnection.executed == ["replica1", "replica2", "primary"]
+
+# Test reads after a write in a session, and reads in a transaction, are served by the primary
+def test_read_your_writes(make_ops):
+    ops = make_ops()
+    with ops.session():
+        assert ops.find("mysql", {"id": 1}, "users") == ("replica1",)
+        ops.update("mysql", {"id": 1}, {"name": "x"}, "users")
+        assert ops.find("mysql", {"id": 1}, "users") == ("primary",)
+    assert ops.find("mysql", {"id": 1}, "users") == ("replica2",)
+    with ops.transaction("mysql"):
+        assert ops.find("mysql", {"id": 1}, "users") == ("primary",)
+
+# Test an unreachable replica falls back to the primary and is penalized
+def test_replica_failure_falls_back(make_ops):
+    ops = make_ops(replicas=["down"], replica_strategy="least_latency")
+    assert ops.find("mysql", {"id": 1}, "users") == ("primary",)
+    assert ops.db_client.replica_routers["mysql"].latencies()[0] >= 1.0
+
+# Test MongoDB reads use the configured read preference except inside a session after a write
+def test_mongo_read_preference():
+    client = DatabaseClient("mongodb://localhost:27017", None, None, mongo_read_preference=ReadPreference.SECONDARY_PREFERRED)
+    client.mongo_client = MagicMock()
+    ops = DatabaseOperations(client)
+    collection = client.mongo_client['your_database']['users']
+    ops.find("mongo", {"id": 1}, "users")
+    collection.with_options.assert_called_once_with(read_preference=ReadPreference.SECONDARY_PREFERRED)
+    collection.with_options.return_value.find_one.assert_called_once()
+    with ops.session():
+        ops.insert("mongo", {"id": 1}, "users")
+        ops.find("mongo", {"id": 1}, "users")
+    collection.find_one.assert_called_once_with({"id": 1})
@@ -0,0 +1,179 @@
+import mysql.connector
+import psycopg2
+import psycopg2.errors
+import pytest
+from src.db_client import DatabaseClient
+from src.db_operations import DatabaseOperations, _guarded_rows
+from src.exceptions import CircuitOpenError, PoolTimeoutError
+from src.resilience import CircuitBreaker, RetryPolicy, is_disconnect, is_transient
+
+# Fake psycopg2 connection that drops on the statements listed in failures, like a server restart would
+class FlakyConnection:
+    def __init__(self, driver):
+        self.driver = driver
+        self.closed = 0
+
+    def cursor(self, *args, **kwargs):
+        return FlakyCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+class FlakyCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, params=None):
+        driver = self.connection.driver
+        driver.statements += 1
+        if driver.statements in driver.failures:
+            self.connection.closed = 2
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+class FlakyClient(DatabaseClient):
+    def __init__(self, failures=(), **kwargs):
+        super().__init__(None, None, {}, **kwargs)
+        self.failures = set(failures)
+        self.statements = 0
+        self.connections = 0
+
+    def _open_postgres(self):
+        self.connections += 1
+        return FlakyConnection(self)
+
+def no_sleep(seconds):
+    pass
+
+# Test retries back off exponentially, stop at max_attempts and skip non-transient errors
+def test_retry_policy():
+    delays = []
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, jitter=False, sleep=delays.append)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise ConnectionResetError("reset")
+
+    with pytest.raises(ConnectionResetError):
+        policy.call(flaky)
+    assert len(calls) == 3 and delays == [0.1, 0.2]
+    with pytest.raises(ValueError):
+        policy.call(lambda: (calls.append(1), int("x")))
+    assert len(calls) == 4
+    assert 0 <= RetryPolicy(base_delay=1.0, max_delay=1.5).delay(5) <= 1.5
+
+# Test the breaker opens after consecutive failures, fails fast, and closes after a successful trial call
+def test_circuit_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    def down():
+        raise ConnectionRefusedError("refused")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionRefusedError):
+            breaker.call(down)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "never called")
+
+    now[0] = 11
+    with pytest.raises(ConnectionRefusedError):
+        breaker.call(down)
+    assert breaker.state == CircuitBreaker.OPEN
+    now[0] = 22
+    assert breaker.call(lambda: "up") == "up"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+# Test interrupted calls and streams propagate the interrupt and free the half-open trial for the next call
+def test_circuit_breaker_interrupted():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    def interrupted_rows():
+        yield 1
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(interrupted)
+    assert breaker.state == CircuitBreaker.CLOSED
+    with pytest.raises(ConnectionRefusedError):
+        breaker.call(lambda: (_ for _ in ()).throw(ConnectionRefusedError("refused")))
+    now[0] = 11
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        list(_guarded_rows(breaker, interrupted_rows()))
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert list(_guarded_rows(breaker, iter([1, 2]))) == [1, 2]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+# Test pool timeouts and open circuits are not retried
+def test_is_transient():
+    assert is_transient(psycopg2.InterfaceError("connection already closed"))
+    assert not is_transient(PoolTimeoutError())
+    assert not is_transient(CircuitOpenError())
+    assert not is_transient(psycopg2.IntegrityError("duplicate key"))
+
+# Server errors carrying a SQLSTATE, as psycopg2 only sets pgcode on errors it receives
+def pg_error(cls, sqlstate):
+    return type(cls.__name__, (cls,), {'pgcode': sqlstate})("error")
+
+# Test errors are classified by SQLSTATE and error number, not by their driver exception class
+def test_transient_by_error_code():
+    deadlock = pg_error(psycopg2.errors.DeadlockDetected, '40P01')
+    assert is_transient(deadlock) and not is_disconnect(deadlock)
+    canceled = pg_error(psycopg2.errors.QueryCanceled, '57014')
+    assert not is_transient(canceled) and not is_disconnect(canceled)
+    assert is_disconnect(pg_error(psycopg2.OperationalError, '08006'))
+    assert is_disconnect(pg_error(psycopg2.errors.AdminShutdown, '57P01'))
+    assert is_disconnect(mysql.connector.errors.OperationalError(msg="gone away", errno=2006))
+    assert is_disconnect(mysql.connector.errors.OperationalError(msg="lost", errno=2013))
+    mysql_deadlock = mysql.connector.errors.InternalError(msg="deadlock", errno=1213, sqlstate='40001')
+    assert is_transient(mysql_deadlock) and not is_disconnect(mysql_deadlock)
+    assert not is_transient(mysql.connector.errors.InterfaceError(msg="No result set to fetch from"))
+    assert not is_transient(mysql.connector.errors.OperationalError(msg="timeout", errno=3024, sqlstate='HY000'))
+
+# Test a dropped shared connection is replaced and the idempotent read retried on the new one
+def test_reconnect_and_retry():
+    client = FlakyClient(failures={1})
+    ops = DatabaseOperations(client, retry_policy=RetryPolicy(sleep=no_sleep))
+    assert ops.find("postgres", {"id": 1}, "test_table") == (1,)
+    assert client.connections == 2 and client.statements == 2
+    assert client.get_database()['postgres'] is client.postgres_connection
+
+# Test inserts are not retried, but the next call still gets a fresh connection
+def test_insert_not_retried():
+    client = FlakyClient(failures={1})
+    ops = DatabaseOperations(client, retry_policy=RetryPolicy(sleep=no_sleep))
+    with pytest.raises(psycopg2.OperationalError):
+        ops.insert("postgres", {"id": 1}, "test_table")
+    assert client.statements == 1 and client.postgres_connection is None
+    ops.insert("postgres", {"id": 1}, "test_table")
+    assert client.connections == 2
+
+# Test operations on a database that keeps failing are rejected without reaching the driver
+def test_circuit_breaker_fails_fast():
+    client = FlakyClient(failures=set(range(1, 100)), circuit_breaker={'failure_threshold': 3, 'reset_timeout': 60})
+    ops = DatabaseOperations(client, retry_policy=RetryPolicy(max_attempts=2, sleep=no_sleep))
+    with pytest.raises(psycopg2.OperationalError):
+        ops.find("postgres", {"id": 1}, "test_table")
+    # The third failure opens the breaker, so the retry is rejected
+    with pytest.raises(CircuitOpenError):
+        ops.find("postgres", {"id": 1}, "test_table")
+    assert client.statements == 3
+    with pytest.raises(CircuitOpenError):
+        ops.find("postgres", {"id": 1}, "test_table")
+    assert client.statements == 3
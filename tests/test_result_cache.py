@@ -0,0 +1,47 @@
+import time
+import pytest
+from src.result_cache import CacheBackend, InMemoryCacheBackend, ResultCache
+
+# Test lookups are independent of query key order and counted in the statistics
+def test_result_cache_hit_and_miss():
+    cache = ResultCache(ttl=None)
+    hit, _, generation = cache.lookup('mysql', 'users', {'a': 1, 'b': 2})
+    assert not hit
+    cache.store('mysql', 'users', {'a': 1, 'b': 2}, ('row',), generation)
+    assert cache.lookup('mysql', 'users', {'b': 2, 'a': 1})[:2] == (True, ('row',))
+    assert cache.stats() == {'size': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'invalidations': 0}
+
+# Test a write invalidates the table and prevents storing results read before it
+def test_result_cache_invalidation():
+    cache = ResultCache()
+    _, _, generation = cache.lookup('mongo', 'users', {'a': 1})
+    cache.store('mongo', 'users', {'a': 1}, {'a': 1}, generation)
+    cache.store('mongo', 'orders', {'a': 1}, {'a': 1}, generation)
+    cache.invalidate('mongo', 'users')
+    assert not cache.lookup('mongo', 'users', {'a': 1})[0]
+    assert cache.lookup('mongo', 'orders', {'a': 1})[0]
+
+    cache.store('mongo', 'users', {'a': 1}, {'a': 'stale'}, generation)
+    assert not cache.lookup('mongo', 'users', {'a': 1})[0]
+
+# Test TTL expiry and LRU eviction of the in-memory backend
+def test_in_memory_backend_ttl_and_lru():
+    backend = InMemoryCacheBackend(maxsize=2)
+    backend.set('a', 1, 'ns', ttl=0.01)
+    backend.set('b', 2, 'ns')
+    time.sleep(0.02)
+    assert backend.get('a') is None
+    backend.set('c', 3, 'ns')
+    backend.get('b')
+    backend.set('d', 4, 'ns')
+    assert backend.get('c') is None
+    assert backend.get('b') == 2 and backend.get('d') == 4
+
+# Test a backend missing part of the interface fails when it is created, not on first use
+def test_incomplete_backend_rejected():
+    class GetOnlyBackend(CacheBackend):
+        def get(self, key, default=None):
+            return default
+
+    with pytest.raises(TypeError):
+        GetOnlyBackend()
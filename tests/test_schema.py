@@ -0,0 +1,148 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.db_client import DatabaseClient
+from src.db_operations import DatabaseOperations
+from src.exceptions import SchemaValidationError
+from src.query import Query, DESCENDING
+from src.schema import SchemaCache
+
+TABLES = {"users": ["id", "name", "email"]}
+
+# Fake cursor answering information_schema lookups from TABLES and recording every other statement
+class SchemaCursor:
+    def __init__(self, log):
+        self.log = log
+        self.rows = []
+        self.rowcount = 1
+
+    def execute(self, sql, params=None):
+        if "information_schema" in sql:
+            self.log.append("lookup")
+            self.rows = [(column,) for column in TABLES.get(params[1], [])]
+        else:
+            self.log.append((sql, params))
+            self.rows = []
+
+    def executemany(self, sql, rows):
+        self.log.append((sql, rows))
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+# Fake MySQL connection whose cursors answer like SchemaCursor
+class SchemaConnection:
+    def __init__(self, log):
+        self.log = log
+
+    def cursor(self, *args, **kwargs):
+        return SchemaCursor(self.log)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def schema_ops():
+    client = DatabaseClient(None, {}, {})
+    client.mysql_connection = MagicMock()
+    client.postgres_connection = MagicMock()
+    client.postgres_connection.closed = 0
+    log = []
+    client.mysql_connection.cursor.side_effect = lambda *args, **kwargs: SchemaCursor(log)
+    client.postgres_connection.cursor.side_effect = lambda *args, **kwargs: SchemaCursor(log)
+    now = [0.0]
+    cache = SchemaCache(client, ttl=60, clock=lambda: now[0])
+    return DatabaseOperations(client, schema_cache=cache), log, now
+
+# Test columns are read once, kept until the ttl expires and re-read afterwards
+def test_columns_cached_with_ttl(schema_ops):
+    ops, log, now = schema_ops
+    assert ops.schema_cache.columns("mysql", "users") == ("id", "name", "email")
+    assert ops.schema_cache.columns("mysql", "users") == ("id", "name", "email")
+    assert log == ["lookup"]
+    now[0] = 61
+    ops.schema_cache.columns("mysql", "users")
+    ops.schema_cache.invalidate("mysql", "users")
+    ops.schema_cache.columns("mysql", "users")
+    assert log == ["lookup"] * 3
+
+# Test unknown tables and columns and invalid names fail before any statement is sent
+def test_validation_fails_locally(schema_ops):
+    ops, log, now = schema_ops
+    with pytest.raises(SchemaValidationError):
+        ops.insert("mysql", {"id": 1, "nmae": "x"}, "users")
+    with pytest.raises(SchemaValidationError):
+        ops.find("postgres", {"id": 1}, "user")
+    with pytest.raises(SchemaValidationError):
+        ops.find_many("mysql", Query({"id": 1}, sort=[("created", DESCENDING)]), "users")
+    with pytest.raises(SchemaValidationError):
+        ops.delete("mysql", {"id": 1}, "users; DROP TABLE users")
+    assert all(entry == "lookup" for entry in log)
+
+# Test identifiers are quoted per dialect and columns put in table order, so key order does not change the statement
+def test_quoting_and_column_order(schema_ops):
+    ops, log, now = schema_ops
+    ops.insert("mysql", {"email": "a@b.c", "id": 1}, "users")
+    ops.insert("mysql", {"id": 2, "email": "d@e.f"}, "users")
+    ops.update("postgres", {"id": 1}, {"email": "x", "name": "y"}, "users")
+    ops.find_many("postgres", Query({"name": "y"}, projection=["id"]), "users")
+    statements = [entry for entry in log if entry != "lookup"]
+    assert statements[0] == ("INSERT INTO `users` (`id`, `email`) VALUES (%s, %s)", (1, "a@b.c"))
+    assert statements[1] == ("INSERT INTO `users` (`id`, `email`) VALUES (%s, %s)", (2, "d@e.f"))
+    assert statements[2] == ('UPDATE "users" SET "name"=%s, "email"=%s WHERE "id"=%s', ("y", "x", 1))
+    assert statements[3] == ('SELECT "id" FROM "users" WHERE "name"=%s', ("y",))
+    assert ops.statement_cache.hits == 1
+
+# Test MongoDB fields are sampled from documents and only their syntax is validated
+def test_mongo_sampling():
+    client = MagicMock()
+    client.get_mongo_client.return_value['your_database']['events'].find.return_value = [
+        {"_id": 1, "type": "click"}, {"_id": 2, "type": "view", "page": "/"}]
+    cache = SchemaCache(client, sample_size=2)
+    assert cache.columns("mongo", "events") == ("_id", "type", "page")
+    assert cache.order("mongo", "events", ["page", "new_field"]) == ("page", "new_field")
+    with pytest.raises(SchemaValidationError):
+        cache.validate("mongo", "events", ["$where"])
+    assert cache.quote("mongo", "events") == "events"
+    assert cache.quote("postgres", "sales.orders") == '"sales"."orders"'
+
+# Test a cold cache reads the columns without borrowing a second pooled connection, also inside a transaction
+def test_cold_cache_with_one_pooled_connection():
+    log = []
+    with patch('src.db_client.mysql.connector.connect', side_effect=lambda **config: SchemaConnection(log)):
+        client = DatabaseClient(None, {}, None, pool_config={'min_size': 0, 'max_size': 1, 'timeout': 0.2})
+        ops = DatabaseOperations(client, schema_cache=SchemaCache(client))
+        reports = ops.insert_many("mysql", [{"name": "a", "id": 1}], "users")
+        ops.schema_cache.invalidate()
+        with ops.transaction("mysql"):
+            ops.insert("mysql", {"name": "b", "id": 2}, "users")
+            ops.find_many("mysql", Query({"id": 2}), "users")
+        client.close()
+    assert reports[0]['error'] is None and log.count("lookup") == 2
+    assert ("INSERT INTO `users` (`id`, `name`) VALUES (%s, %s)", [(1, "a")]) in log
+
+# Test PostgreSQL names are folded to lower case like unquoted identifiers, for the lookup and the quoted SQL
+def test_postgres_case_folding(schema_ops):
+    ops, log, now = schema_ops
+    ops.insert("postgres", {"Email": "a@b.c", "ID": 1}, "Users")
+    assert ops.schema_cache.columns("postgres", "users") == ("id", "name", "email")
+    assert log == ["lookup", ('INSERT INTO "users" ("id", "email") VALUES (%s, %s)', (1, "a@b.c"))]
+    assert ops.schema_cache.quote("postgres", "Sales.Orders") == '"sales"."orders"'
+    assert ops.schema_cache.quote("mysql", "Users") == "`Users`"
@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import MagicMock
+from src.exceptions import DeletionError, InsertionError, UpdateError
+from src.query import Query, DESCENDING
+from src.sharding import HashRing, RangeRouter, ShardedDatabaseOperations
+
+def make_sharded(names=("a", "b", "c"), **kwargs):
+    shards = {name: MagicMock(name=name) for name in names}
+    return ShardedDatabaseOperations(shards, "user_id", **kwargs), shards
+
+# Test adding a shard to the ring only moves about 1/N of the keys, all of them to the new shard
+def test_hash_ring_rebalance():
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.get(key) for key in range(10000)}
+    assert set(before.values()) == {"a", "b", "c"}
+    ring.add("d")
+    moved = [key for key in before if ring.get(key) != before[key]]
+    assert 0.15 < len(moved) / 10000 < 0.35
+    assert {ring.get(key) for key in moved} == {"d"}
+    ring.remove("d")
+    assert all(ring.get(key) == shard for key, shard in before.items())
+
+# Test range routing and its validation
+def test_range_router():
+    router = RangeRouter([(100, "a"), (200, "b"), (None, "c")])
+    assert [router.get(key) for key in (0, 99, 100, 199, 5000)] == ["a", "a", "b", "b", "c"]
+    with pytest.raises(ValueError):
+        RangeRouter([(100, "a"), (200, "b")]).get(300)
+    with pytest.raises(ValueError):
+        RangeRouter([(None, "a"), (100, "b")])
+
+# Test operations with a shard key run on the owning shard only
+def test_routed_operations():
+    sharded, shards = make_sharded(router=RangeRouter([(100, "a"), (200, "b"), (None, "c")]))
+    sharded.insert("mysql", {"user_id": 150, "name": "x"}, "users")
+    shards["b"].insert.assert_called_once_with("mysql", {"user_id": 150, "name": "x"}, "users")
+    sharded.update("mysql", {"user_id": {"$eq": 5}}, {"name": "y"}, "users")
+    shards["a"].update.assert_called_once_with("mysql", {"user_id": {"$eq": 5}}, {"name": "y"}, "users")
+    sharded.find("mysql", Query({"user_id": 300}), "users")
+    shards["c"].find.assert_called_once()
+    assert not shards["a"].find.called and not shards["b"].find.called
+    with pytest.raises(InsertionError):
+        sharded.insert("mysql", {"name": "no key"}, "users")
+    sharded.close()
+
+# Test bulk inserts are grouped per shard
+def test_insert_many_groups_rows():
+    sharded, shards = make_sharded(router=lambda key: "a" if key % 2 else "b")
+    sharded.insert_many("mongo", [{"user_id": i} for i in range(5)], "users", batch_size=10)
+    shards["a"].insert_many.assert_called_once_with("mongo", [{"user_id": 1}, {"user_id": 3}], "users", 10)
+    shards["b"].insert_many.assert_called_once_with("mongo", [{"user_id": 0}, {"user_id": 2}, {"user_id": 4}], "users", 10)
+    sharded.close()
+
+# Test reads without a shard key scatter to every shard and merge by sort order and limit
+def test_scatter_gather():
+    sharded, shards = make_sharded()
+    shards["a"].find_many.return_value = [(5, "e"), (1, "a")]
+    shards["b"].find_many.return_value = [(4, "d")]
+    shards["c"].find_many.return_value = [(3, "c"), (2, "b")]
+    query = Query({"name": {"$ne": "z"}}, projection=["score", "name"], sort=[("score", DESCENDING)], limit=3)
+    assert sharded.find_many("postgres", query, "users") == [(5, "e"), (4, "d"), (3, "c")]
+    shards["a"].find.return_value = None
+    shards["b"].find.return_value = None
+    shards["c"].find.return_value = {"name": "c"}
+    assert sharded.find("mongo", {"name": "c"}, "users") == {"name": "c"}
+    shards["b"].delete_many.side_effect = RuntimeError("shard b is down")
+    with pytest.raises(RuntimeError):
+        sharded.delete_many("mysql", {"name": "c"}, "users")
+    sharded.close()
+
+# Test merging rejects tuple rows without their sort columns, sorts missing values first and concatenates native filters
+def test_scatter_gather_merge_edge_cases():
+    sharded, shards = make_sharded()
+    unprojected = Query({}, projection=["name"], sort=[("score", DESCENDING)], limit=2)
+    with pytest.raises(ValueError):
+        sharded.find_many("mysql", unprojected, "users")
+    assert not any(shard.find_many.called for shard in shards.values())
+
+    shards["a"].find_many.return_value = [{"name": "a", "score": 2}]
+    shards["b"].find_many.return_value = [{"name": "b"}]
+    shards["c"].find_many.return_value = [{"name": "c", "score": None}, {"name": "d", "score": 1}]
+    query = Query({}, sort=[("score", 1), ("name", 1)])
+    assert [row["name"] for row in sharded.find_many("mongo", query, "users")] == ["b", "c", "d", "a"]
+    native = {"$or": [{"name": "a"}, {"name": "d"}]}
+    assert len(sharded.find_many("mongo", native, "users")) == 4
+    shards["a"].find_many.assert_called_with("mongo", native, "users")
+    sharded.close()
+
+# Test single-document writes need the shard key and find merges the shards' matches by the Query sort
+def test_single_document_operations_without_shard_key():
+    sharded, shards = make_sharded(names=("a", "b"))
+    with pytest.raises(UpdateError):
+        sharded.update("mongo", {"email": "x"}, {"name": "y"}, "users")
+    with pytest.raises(DeletionError):
+        sharded.delete("mongo", {"email": "x"}, "users")
+    assert not any(shard.update.called or shard.delete.called for shard in shards.values())
+
+    shards["a"].find.return_value = {"id": 9}
+    shards["b"].find.return_value = {"id": 1}
+    assert sharded.find("mongo", Query({}, sort=["id"]), "users") == {"id": 1}
+    assert sharded.find("mongo", {}, "users") == {"id": 9}
+    with pytest.raises(ValueError):
+        sharded.find("mysql", Query({}, projection=["name"], sort=["id"]), "users")
+    shards["a"].find.return_value = shards["b"].find.return_value = None
+    assert sharded.find("mongo", Query({}, sort=["id"]), "users") is None
+    sharded.close()
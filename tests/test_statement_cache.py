@@ -0,0 +1,20 @@
+from src.statement_cache import Statement, StatementCache
+
+# Test hits, misses and LRU eviction
+def test_statement_cache_lru():
+    cache = StatementCache(maxsize=2)
+    first = cache.get(('mysql', 'find', 't', ('a',)), lambda: Statement("SELECT a"))
+    assert cache.get(('mysql', 'find', 't', ('a',)), lambda: Statement("other")) is first
+    cache.get(('mysql', 'find', 't', ('b',)), lambda: Statement("SELECT b"))
+    cache.get(('mysql', 'find', 't', ('a',)), lambda: Statement("other"))
+    cache.get(('mysql', 'find', 't', ('c',)), lambda: Statement("SELECT c"))
+
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 2, 'misses': 3, 'evictions': 1}
+    # ('b',) was the least recently used entry and has been evicted
+    assert cache.get(('mysql', 'find', 't', ('b',)), lambda: Statement("rebuilt")).sql == "rebuilt"
+
+# Test the PostgreSQL prepared form of a statement
+def test_statement_for_postgres():
+    statement = Statement.for_postgres("DELETE FROM t WHERE a=%s AND b=%s", "DELETE FROM t WHERE a=$1 AND b=$2", 2)
+    assert statement.prepare_sql == f"PREPARE {statement.name} AS DELETE FROM t WHERE a=$1 AND b=$2"
+    assert statement.execute_sql == f"EXECUTE {statement.name} (%s, %s)"
@@ -0,0 +1,126 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from src.db_operations import DatabaseOperations
+from src.exceptions import BufferFullError, InsertionError
+from src.write_behind import WriteBehindBuffer
+from src.benchmarks.fakes import SqliteClient
+
+def make_table(client):
+    with client.connection('mysql') as connection:
+        cursor = connection.cursor()
+        cursor.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, value REAL)")
+        connection.commit()
+
+def count_rows(client):
+    with client.connection('mysql') as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM readings")
+        return cursor.fetchone()[0]
+
+# Test rows are written in batches of batch_size and flush() writes the remainder
+def test_batches_by_size():
+    ops = MagicMock()
+    ops.insert_many.side_effect = lambda db_type, rows, table, batch_size: [
+        {'batch': 0, 'rows': len(rows), 'inserted': len(rows), 'error': None}]
+    buffer = WriteBehindBuffer(ops, 'mysql', 'readings', batch_size=3, flush_interval=60)
+    for i in range(7):
+        buffer.insert({'id': i})
+    buffer.flush()
+    sizes = [len(call.args[1]) for call in ops.insert_many.call_args_list]
+    assert sizes == [3, 3, 1] and buffer.written == 7 and buffer.pending == 0
+    buffer.close()
+
+# Test a partial batch is written once flush_interval has passed
+def test_batches_by_time():
+    written = threading.Event()
+    ops = MagicMock()
+    ops.insert_many.side_effect = lambda *args: (written.set(), [])[1]
+    buffer = WriteBehindBuffer(ops, 'mysql', 'readings', batch_size=100, flush_interval=0.05)
+    buffer.insert({'id': 1})
+    assert written.wait(2)
+    buffer.close()
+
+# Test a full buffer raises when not blocking, and applies backpressure until room is freed when blocking
+def test_backpressure():
+    release = threading.Event()
+    ops = MagicMock()
+    ops.insert_many.side_effect = lambda *args: (release.wait(2), [])[1]
+    buffer = WriteBehindBuffer(ops, 'mysql', 'readings', max_size=1, batch_size=1, flush_interval=0, block=False)
+    buffer.insert({'id': 1})  # Taken by the flusher, which then waits on release
+    while buffer.pending:
+        pass
+    buffer.insert({'id': 2})
+    with pytest.raises(BufferFullError):
+        buffer.insert({'id': 3})
+    buffer.block, buffer.put_timeout = True, 0.05
+    with pytest.raises(BufferFullError):
+        buffer.insert({'id': 3})
+    release.set()
+    buffer.put_timeout = None
+    buffer.insert({'id': 3})
+    buffer.close()
+    assert ops.insert_many.call_count == 3
+    with pytest.raises(InsertionError):
+        buffer.insert({'id': 4})
+
+# Test failed batches are reported with their rows
+def test_failed_batches():
+    ops = MagicMock()
+    ops.insert_many.side_effect = [InsertionError("rows must share the same columns"),
+                                   [{'batch': 0, 'rows': 1, 'inserted': 0, 'error': "duplicate key"}]]
+    buffer = WriteBehindBuffer(ops, 'mysql', 'readings', batch_size=2, flush_interval=60)
+    buffer.insert({'id': 1})
+    buffer.insert({'id': 2, 'value': 1})
+    buffer.insert({'id': 1})
+    buffer.close()
+    assert buffer.failed_batches == [
+        {'rows': [{'id': 1}, {'id': 2, 'value': 1}], 'error': "rows must share the same columns"},
+        {'rows': [{'id': 1}], 'error': "duplicate key"}]
+    assert buffer.written == 0
+
+# Test the buffers of DatabaseOperations are flushed to the database when the client closes
+def test_flush_on_client_close():
+    client = SqliteClient()
+    make_table(client)
+    ops = DatabaseOperations(client)
+    buffer = ops.write_behind('mysql', 'readings', batch_size=1000, flush_interval=60)
+    assert ops.write_behind('mysql', 'readings') is buffer
+    for i in range(10):
+        buffer.insert({'id': i, 'value': i * 0.5})
+    assert count_rows(client) == 0
+    buffer.flush()
+    assert count_rows(client) == 10
+    buffer.insert({'id': 10, 'value': 5.0})
+    client.close_hooks.append(lambda: rows.append(count_rows(client)))
+    rows = []
+    client.close()
+    assert rows == [11] and buffer.written == 11
+    assert client.close_hooks.count(ops.close_write_behind) == 1
+
+# Test every row accepted while close() runs is written, and flush() returns while producers keep inserting
+def test_close_races_producers():
+    written = []
+    ops = MagicMock()
+    ops.insert_many.side_effect = lambda db_type, rows, table, batch_size: (written.extend(rows), [])[1]
+    buffer = WriteBehindBuffer(ops, 'mysql', 'readings', max_size=4, batch_size=2, flush_interval=0.01)
+    accepted = [[] for _ in range(4)]
+
+    def produce(rows):
+        for i in range(100000):
+            try:
+                buffer.insert({'id': i})
+            except InsertionError:
+                return
+            rows.append(i)
+
+    producers = [threading.Thread(target=produce, args=(rows,)) for rows in accepted]
+    for producer in producers:
+        producer.start()
+    while len(written) < 50:
+        pass
+    buffer.flush()
+    buffer.close()
+    for producer in producers:
+        producer.join()
+    assert len(written) == sum(map(len, accepted)) and not buffer._thread.is_alive()
@@ -0,0 +1,124 @@
+import re
+from contextlib import contextmanager
+from itertools import count
+from .exceptions import *
+
+_SAVEPOINT_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+class Transaction:
+    """
+    A unit of work spanning several operations on one database, committed or rolled back as a whole.
+
+    Transactions are created by DatabaseOperations.transaction(). SQL transactions hold a single connection for
+    their whole duration; MongoDB transactions run inside a client session.
+
+    Attributes:
+        db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+        connection (Connection or None): The SQL connection used by every operation in the transaction.
+        session (ClientSession or None): The MongoDB session used by every operation in the transaction.
+        tables (set): Collections or tables written to during the transaction.
+    """
+
+    def __init__(self, db_type, connection=None, session=None):
+        """
+        Initializes the Transaction.
+
+        Args:
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            connection (Connection, optional): SQL connection the transaction runs on.
+            session (ClientSession, optional): MongoDB session the transaction runs in.
+        """
+        self.db_type = db_type
+        self.connection = connection
+        self.session = session
+        self.tables = set()
+        self._savepoint_ids = count()
+
+    def _execute(self, sql):
+        if self.db_type == 'mongo':
+            raise TransactionError("MongoDB transactions do not support savepoints")
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    def _check_name(self, name):
+        if not _SAVEPOINT_NAME.match(name):
+            raise TransactionError(f"Invalid savepoint name: {name!r}")
+        return name
+
+    def create_savepoint(self, name=None):
+        """
+        Creates a savepoint that part of the transaction can later be rolled back to.
+
+        Args:
+            name (str, optional): Savepoint name. A unique name is generated if omitted.
+
+        Returns:
+            str: The savepoint name.
+
+        Raises:
+            TransactionError: If the name is not a valid identifier or the database does not support savepoints.
+        """
+        name = self._check_name(name or f"sp_{next(self._savepoint_ids)}")
+        self._execute(f"SAVEPOINT {name}")
+        return name
+
+    def rollback_to(self, name):
+        """
+        Undoes everything done since the savepoint was created. The savepoint itself is kept.
+
+        Args:
+            name (str): The savepoint name.
+        """
+        self._execute(f"ROLLBACK TO SAVEPOINT {self._check_name(name)}")
+
+    def release(self, name):
+        """
+        Releases a savepoint, keeping the changes made since it was created.
+
+        Args:
+            name (str): The savepoint name.
+        """
+        self._execute(f"RELEASE SAVEPOINT {self._check_name(name)}")
+
+    @contextmanager
+    def savepoint(self, name=None):
+        """
+        Runs a with block inside a savepoint: the block's changes are rolled back if it raises, without aborting
+        the enclosing transaction. The exception is re-raised.
+
+        Args:
+            name (str, optional): Savepoint name. A unique name is generated if omitted.
+
+        Yields:
+            str: The savepoint name.
+        """
+        name = self.create_savepoint(name)
+        try:
+            yield name
+        except BaseException:
+            self.rollback_to(name)
+            self.release(name)
+            raise
+        else:
+            self.release(name)
+
+    def commit(self):
+        """
+        Commits the transaction.
+        """
+        if self.db_type == 'mongo':
+            self.session.commit_transaction()
+        else:
+            self.connection.commit()
+
+    def rollback(self):
+        """
+        Rolls the transaction back.
+        """
+        if self.db_type == 'mongo':
+            self.session.abort_transaction()
+        else:
+            self.connection.rollback()
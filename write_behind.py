@@ -0,0 +1,196 @@
+import queue
+import threading
+import time
+from .exceptions import *
+from .logger import logger
+
+# Queue marker asking the flusher to write what it holds and stop.
+_STOP = object()
+
+class _Flush:
+    # Queue marker asking the flusher to write what it holds now; done is set once it has.
+    __slots__ = ('done',)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+class WriteBehindBuffer:
+    """
+    Accepts inserts into one table without waiting for the database, writing them in batches from a background thread.
+
+    insert() only puts the row on a bounded in-memory queue. The flusher thread writes the queued rows with
+    DatabaseOperations.insert_many() once batch_size rows are waiting or the oldest waiting row is flush_interval
+    seconds old, whichever comes first. When the queue is full, insert() waits for room (backpressure) or raises
+    BufferFullError, depending on block. Rows of batches that fail are not retried; they are kept in failed_batches.
+
+    Rows accepted but not yet written are lost if the process dies, so the buffer suits data such as telemetry where
+    throughput matters more than a per-row acknowledgement. close() (also run by DatabaseClient.close()) writes them.
+
+    Attributes:
+        db_ops (DatabaseOperations): Operations used to write the batches.
+        db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+        collection_table (str): The collection or table written to.
+        batch_size (int): Rows written per insert_many() call.
+        flush_interval (float): Longest time in seconds a row waits in the buffer before it is written.
+        block (bool): Wait for room when the queue is full instead of raising BufferFullError.
+        put_timeout (float or None): Longest wait for room in seconds when block is True; None waits forever.
+        written (int): Number of rows written so far.
+        failed_batches (list of dict): One entry per failed batch with the keys 'rows' (the rows of the batch; an
+            unordered MongoDB batch may have written some of them) and 'error' (the error message).
+    """
+
+    def __init__(self, db_ops, db_type, collection_table, max_size=10000, batch_size=500, flush_interval=1.0,
+                 block=True, put_timeout=None):
+        """
+        Initializes the WriteBehindBuffer and starts its flusher thread.
+
+        Args:
+            db_ops (DatabaseOperations): Operations used to write the batches.
+            db_type (str): Type of database ('mongo', 'mysql', 'postgres').
+            collection_table (str): The collection or table written to.
+            max_size (int): Capacity of the queue in rows.
+            batch_size (int): Rows written per insert_many() call.
+            flush_interval (float): Longest time in seconds a row waits before it is written.
+            block (bool): Wait for room when the queue is full instead of raising BufferFullError.
+            put_timeout (float, optional): Longest wait for room in seconds when block is True.
+
+        Raises:
+            ValueError: If max_size or batch_size is not positive.
+        """
+        if max_size < 1 or batch_size < 1:
+            raise ValueError(f"max_size and batch_size must be positive, got {max_size} and {batch_size}")
+        self.db_ops = db_ops
+        self.db_type = db_type
+        self.collection_table = collection_table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block = block
+        self.put_timeout = put_timeout
+        self.written = 0
+        self.failed_batches = []
+        self._queue = queue.Queue(max_size)
+        self._closed = False
+        self._putting = 0
+        self._lock = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"WriteBehind-{db_type}-{collection_table}", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self):
+        """int: Approximate number of rows waiting in the queue."""
+        return self._queue.qsize()
+
+    def insert(self, data):
+        """
+        Queues a document or row for writing.
+
+        Args:
+            data (dict): The document or row. SQL rows of one buffer must all have the same keys.
+
+        Raises:
+            BufferFullError: If the queue is full and block is False, or no room was freed within put_timeout.
+            InsertionError: If the buffer is closed.
+        """
+        if not self._put(data, self.block, self.put_timeout):
+            raise InsertionError(f"Write-behind buffer for {self.collection_table} is closed")
+
+    def flush(self):
+        """
+        Writes every row queued so far and waits until they are written (or recorded in failed_batches). Rows queued
+        after the call are not waited for. Once the buffer is closed, flush() returns at once, as close() writes them.
+        """
+        marker = _Flush()
+        if self._put(marker, True, None):
+            marker.done.wait()
+
+    def _put(self, item, block, timeout):
+        """
+        Puts an item on the queue unless the buffer is closed. close() waits for puts in progress, so nothing is
+        queued behind the stop marker.
+
+        Returns:
+            bool: False if the buffer is closed.
+
+        Raises:
+            BufferFullError: If the queue stayed full.
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            self._putting += 1
+        try:
+            self._queue.put(item, block, timeout)
+        except queue.Full:
+            raise BufferFullError(f"Write-behind buffer for {self.collection_table} is full "
+                                  f"({self._queue.maxsize} rows waiting)") from None
+        finally:
+            with self._lock:
+                self._putting -= 1
+                self._lock.notify_all()
+        return True
+
+    def close(self, timeout=None):
+        """
+        Stops accepting rows, writes the queued ones and stops the flusher thread. Closing twice is harmless.
+
+        Args:
+            timeout (float, optional): Longest wait in seconds for the queued rows to be written.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Producers blocked on a full queue get room as the flusher keeps writing.
+            self._lock.wait_for(lambda: self._putting == 0)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch, marker = self._collect()
+            if batch:
+                self._write(batch)
+            if marker is _STOP:
+                return
+            if marker is not None:
+                marker.done.set()
+
+    def _collect(self):
+        """
+        Takes up to batch_size rows off the queue, waiting at most flush_interval after the first one.
+
+        Returns:
+            tuple: The rows, and the marker that ended the batch early (or None).
+        """
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP or isinstance(item, _Flush):
+                return batch, item
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch, None
+
+    def _write(self, batch):
+        try:
+            reports = self.db_ops.insert_many(self.db_type, batch, self.collection_table, self.batch_size)
+        except Exception as e:
+            # insert_many() only raises for the batch as a whole, e.g. rows with different columns.
+            logger.error(f"Write-behind batch into {self.collection_table} failed: {e}")
+            self.failed_batches.append({'rows': batch, 'error': str(e)})
+            return
+        for report in reports:
+            self.written += report['inserted']
+            if report['error'] is not None:
+                start = report['batch'] * self.batch_size
+                self.failed_batches.append({'rows': batch[start:start + report['rows']], 'error': report['error']})